@@ -1,24 +1,132 @@
-from .client import Client
+from importlib import import_module
+from typing import Any, List, TYPE_CHECKING
+
 from .config import get_refresh_token
-from .interfaces import (
-    DataFile,
-    DataFileHeaders,
-    DataRecord,
-    GetDataQuery,
-    GetStationsQuery,
-    PostDataFile,
-    PostDataPayload,
-    RefreshToken,
-    Station,
-    StationDataFile,
-)
-from .make_request import RequestError
+
+if TYPE_CHECKING:
+    from .aggregate import aggregate_data, aggregate_records
+    from .archive import ArchivedFile, DataArchive, to_records
+    from .checkpoints import (
+        CheckpointStore,
+        FileCheckpointStore,
+        MemoryCheckpointStore,
+        SQLiteCheckpointStore,
+    )
+    from .client import Client
+    from .data_frames import (
+        data_file_to_frame,
+        data_files_to_frame,
+        data_files_to_frames,
+        records_to_frame,
+    )
+    from .decoding import decode_records, DecodedRecord
+    from .gaps import backfill_gaps, fetch_gaps, find_gaps, Gap, GapIndex, scan_gaps
+    from .hedging import RequestHedger
+    from .interfaces import (
+        AggregatedDataFile,
+        AggregatedRecord,
+        AggregatedValue,
+        DataFile,
+        DataFileHeaders,
+        DataRecord,
+        GetDataQuery,
+        GetQCQuery,
+        GetStationsQuery,
+        PostDataFile,
+        PostDataPayload,
+        QCRecord,
+        RefreshToken,
+        Station,
+        StationDataFile,
+    )
+    from .make_request import mount_adapter, RequestError
+    from .paginated_iterator import PaginatedIterator
+    from .process_pool import get_data_in_processes
+    from .response_cache import ResponseCache
+    from .sync_planner import SyncPlanner, SyncTask
+    from .transports import RecordingAdapter, ReplayAdapter
+    from .uploader import DataUploader
+    from .validation import validate_payload, ValidationError
+
+# Exports are imported from their modules on first use, so importing the package
+# does not import requests, jwt, numpy or pandas
+_exports = {
+    'aggregate_data': 'aggregate',
+    'aggregate_records': 'aggregate',
+    'ArchivedFile': 'archive',
+    'DataArchive': 'archive',
+    'to_records': 'archive',
+    'CheckpointStore': 'checkpoints',
+    'FileCheckpointStore': 'checkpoints',
+    'MemoryCheckpointStore': 'checkpoints',
+    'SQLiteCheckpointStore': 'checkpoints',
+    'Client': 'client',
+    'data_file_to_frame': 'data_frames',
+    'data_files_to_frame': 'data_frames',
+    'data_files_to_frames': 'data_frames',
+    'records_to_frame': 'data_frames',
+    'decode_records': 'decoding',
+    'DecodedRecord': 'decoding',
+    'backfill_gaps': 'gaps',
+    'fetch_gaps': 'gaps',
+    'find_gaps': 'gaps',
+    'Gap': 'gaps',
+    'GapIndex': 'gaps',
+    'scan_gaps': 'gaps',
+    'RequestHedger': 'hedging',
+    'AggregatedDataFile': 'interfaces',
+    'AggregatedRecord': 'interfaces',
+    'AggregatedValue': 'interfaces',
+    'DataFile': 'interfaces',
+    'DataFileHeaders': 'interfaces',
+    'DataRecord': 'interfaces',
+    'GetDataQuery': 'interfaces',
+    'GetQCQuery': 'interfaces',
+    'GetStationsQuery': 'interfaces',
+    'PostDataFile': 'interfaces',
+    'PostDataPayload': 'interfaces',
+    'QCRecord': 'interfaces',
+    'RefreshToken': 'interfaces',
+    'Station': 'interfaces',
+    'StationDataFile': 'interfaces',
+    'mount_adapter': 'make_request',
+    'RequestError': 'make_request',
+    'PaginatedIterator': 'paginated_iterator',
+    'get_data_in_processes': 'process_pool',
+    'ResponseCache': 'response_cache',
+    'SyncPlanner': 'sync_planner',
+    'SyncTask': 'sync_planner',
+    'RecordingAdapter': 'transports',
+    'ReplayAdapter': 'transports',
+    'DataUploader': 'uploader',
+    'validate_payload': 'validation',
+    'ValidationError': 'validation',
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _exports.get(name)
+
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *_exports])
+
 
 LOGGERNET_PLATFORM = 'loggernet'
 TRACE_PLATFORM = 'trace'
 
 
-def create_client(platform: str = LOGGERNET_PLATFORM) -> Client:
+def create_client(platform: str = LOGGERNET_PLATFORM) -> 'Client':
+    from .client import Client
+
     return Client(
         refresh_token=get_refresh_token(),
         platform=platform,
@@ -30,22 +138,86 @@ __all__ = [
     'create_client',
     'Client',
 
+    # Process pool
+    'get_data_in_processes',
+
+    # Archive
+    'ArchivedFile',
+    'DataArchive',
+    'to_records',
+
+    # Aggregation
+    'aggregate_data',
+    'aggregate_records',
+
+    # Data frames
+    'data_file_to_frame',
+    'data_files_to_frame',
+    'data_files_to_frames',
+    'records_to_frame',
+
+    # Decoding
+    'decode_records',
+    'DecodedRecord',
+
+    # Gaps
+    'backfill_gaps',
+    'fetch_gaps',
+    'find_gaps',
+    'scan_gaps',
+    'Gap',
+    'GapIndex',
+
+    # Uploads
+    'DataUploader',
+    'validate_payload',
+
+    # Sync
+    'SyncPlanner',
+    'SyncTask',
+
+    # Checkpoints
+    'CheckpointStore',
+    'FileCheckpointStore',
+    'MemoryCheckpointStore',
+    'SQLiteCheckpointStore',
+
     # Platform constants
     'LOGGERNET_PLATFORM',
     'TRACE_PLATFORM',
 
     # Interfaces
+    'AggregatedDataFile',
+    'AggregatedRecord',
+    'AggregatedValue',
     'DataFile',
     'DataFileHeaders',
     'DataRecord',
     'GetDataQuery',
+    'GetQCQuery',
     'GetStationsQuery',
     'PostDataFile',
     'PostDataPayload',
+    'QCRecord',
     'RefreshToken',
     'Station',
     'StationDataFile',
 
+    # Responses
+    'PaginatedIterator',
+
+    # Caching
+    'ResponseCache',
+
+    # Hedging
+    'RequestHedger',
+
+    # Transports
+    'mount_adapter',
+    'RecordingAdapter',
+    'ReplayAdapter',
+
     # Errors
     'RequestError',
+    'ValidationError',
 ]
@@ -1,44 +1,83 @@
+from functools import lru_cache
+from threading import Lock
 import time
-from typing import cast, Dict
+from typing import cast, Dict, Optional
 
-import jwt
-
-from .config import TOKENS_URL
+from .config import DEFAULT_API_URL, get_api_url, TOKENS_PATH
 from .interfaces import AccessToken, RefreshToken
 from .make_request import make_request
 
 
+# Cached tokens are read without locking, a lock per cache key is only taken
+# to create a missing or expired token, so concurrent callers create it once
 access_token_cache: Dict[str, str] = {}
+_access_token_locks: Dict[str, Lock] = {}
 
 
 def reset_access_token_cache() -> None:
     global access_token_cache
     access_token_cache = {}
+    _get_expiration.cache_clear()
+
+
+def set_access_token(
+    platform: str,
+    scope: str,
+    access_token: str,
+    *,
+    api_url: Optional[str] = None,
+) -> None:
+    access_token_cache[get_cache_key(platform, scope, api_url)] = access_token
 
 
 def get_access_token(
     refresh_token: RefreshToken,
     platform: str,
     scope: str,
+    *,
+    api_url: Optional[str] = None,
 ) -> str:
-    cache_key = f'{platform}:{scope}'
+    cache_key = get_cache_key(platform, scope, api_url)
 
     access_token = access_token_cache.get(cache_key)
 
-    if not access_token or has_expired(access_token):
-        access_token = create_access_token(refresh_token, platform, scope)
-        access_token_cache[cache_key] = access_token
+    if access_token and not has_expired(access_token):
+        return access_token
+
+    with _access_token_locks.setdefault(cache_key, Lock()):
+        # Another thread may have created the token while waiting for the lock
+        access_token = access_token_cache.get(cache_key)
+
+        if not access_token or has_expired(access_token):
+            access_token = create_access_token(refresh_token, platform, scope, api_url=api_url)
+            access_token_cache[cache_key] = access_token
 
     return access_token
 
 
+def get_cache_key(
+    platform: str,
+    scope: str,
+    api_url: Optional[str] = None,
+) -> str:
+    # Tokens from other api urls are kept apart, the default api url is left out of the key
+    api_url = api_url or get_api_url()
+
+    if api_url == DEFAULT_API_URL:
+        return f'{platform}:{scope}'
+
+    return f'{api_url}:{platform}:{scope}'
+
+
 def create_access_token(
     refresh_token: RefreshToken,
     platform: str,
     scope: str,
+    *,
+    api_url: Optional[str] = None,
 ) -> str:
     result = cast(AccessToken, make_request(
-        url=TOKENS_URL,
+        url=(api_url or get_api_url()) + TOKENS_PATH,
         method='POST',
         token=refresh_token['token'],
         body={
@@ -46,22 +85,31 @@ def create_access_token(
             'platform': platform,
             'scope': scope,
         },
+        coalesce=True,
     )[0])
 
     return result['token']
 
 
 def has_expired(token: str) -> bool:
-    decoded_token = jwt.decode(
-        token,
-        algorithms=['HS256'],
-        options={'verify_signature': False},
-    )
-
-    expiration = int(decoded_token.get('exp', 0))
+    expiration = _get_expiration(token)
     now = int(time.time())
 
     if expiration and now - expiration >= 0:
         return True
 
     return False
+
+
+@lru_cache(maxsize=256)
+def _get_expiration(token: str) -> int:
+    # Tokens are decoded once rather than on every request
+    import jwt
+
+    decoded_token = jwt.decode(
+        token,
+        algorithms=['HS256'],
+        options={'verify_signature': False},
+    )
+
+    return int(decoded_token.get('exp', 0))
@@ -0,0 +1,289 @@
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .interfaces import (
+    AggregatedDataFile,
+    AggregatedRecord,
+    DataFile,
+    DataRecord,
+)
+from .utils import epoch_to_timestamp, timestamp_to_epoch
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+CHUNK_SIZE = 10000
+
+
+class _Accumulator():
+    __slots__ = ('min', 'max', 'total', 'count', 'last_epoch', 'last')
+
+    def __init__(self) -> None:
+        self.min = float('inf')
+        self.max = float('-inf')
+        self.total = 0.0
+        self.count = 0
+        self.last_epoch = -1
+        self.last = 0.0
+
+    def add(self, value: float, epoch: int) -> None:
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.total += value
+        self.count += 1
+
+        if epoch >= self.last_epoch:
+            self.last_epoch = epoch
+            self.last = value
+
+    def merge(
+        self,
+        minimum: float,
+        maximum: float,
+        total: float,
+        count: int,
+        last_epoch: int,
+        last: float,
+    ) -> None:
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+        self.total += total
+        self.count += count
+
+        if last_epoch >= self.last_epoch:
+            self.last_epoch = last_epoch
+            self.last = last
+
+
+class _Bucket():
+    __slots__ = ('count', 'columns')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.columns: Dict[str, _Accumulator] = {}
+
+    def get_column(self, column: str) -> _Accumulator:
+        accumulator = self.columns.get(column)
+
+        if accumulator is None:
+            accumulator = self.columns[column] = _Accumulator()
+
+        return accumulator
+
+
+def aggregate_data(
+    data_files: Iterable[DataFile],
+    *,
+    interval: int,
+    columns: Optional[List[str]] = None,
+    exclude_flagged: bool = False,
+) -> Iterator[AggregatedDataFile]:
+    for data_file in data_files:
+        yield {
+            'source': data_file['source'],
+            'filename': data_file['filename'],
+            'is_stale': data_file['is_stale'],
+            'headers': data_file['headers'],
+            'interval': interval,
+            'records': aggregate_records(
+                data_file.get('records', []),
+                interval=interval,
+                columns=columns or data_file['headers'].get('columns') or None,
+                exclude_flagged=exclude_flagged,
+            ),
+        }
+
+
+def aggregate_records(
+    records: Iterable[DataRecord],
+    *,
+    interval: int,
+    columns: Optional[List[str]] = None,
+    exclude_flagged: bool = False,
+) -> List[AggregatedRecord]:
+    if interval <= 0:
+        raise ValueError('Interval must be greater than 0')
+
+    buckets: Dict[int, _Bucket] = {}
+    iterator = iter(records)
+
+    while True:
+        chunk = list(islice(iterator, CHUNK_SIZE))
+
+        if not chunk:
+            break
+
+        if columns is None:
+            columns = list(chunk[0]['data'])
+
+        if HAS_NUMPY:
+            _aggregate_chunk_numpy(buckets, chunk, interval, columns, exclude_flagged)
+        else:
+            _aggregate_chunk(buckets, chunk, interval, columns, exclude_flagged)
+
+    return [
+        _summarize_bucket(start, buckets[start], columns or [])
+        for start in sorted(buckets, reverse=True)
+    ]
+
+
+def _get_value(
+    record: DataRecord,
+    column: str,
+    exclude_flagged: bool,
+) -> Optional[float]:
+    value = record['data'].get(column)
+
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+
+    if exclude_flagged and record.get('qc_flags', {}).get(column):
+        return None
+
+    return float(value)
+
+
+def _aggregate_chunk(
+    buckets: Dict[int, _Bucket],
+    records: List[DataRecord],
+    interval: int,
+    columns: List[str],
+    exclude_flagged: bool,
+) -> None:
+    for record in records:
+        epoch = timestamp_to_epoch(record['timestamp'])
+        start = epoch - epoch % interval
+
+        bucket = buckets.get(start)
+
+        if bucket is None:
+            bucket = buckets[start] = _Bucket()
+
+        bucket.count += 1
+
+        for column in columns:
+            value = _get_value(record, column, exclude_flagged)
+
+            if value is not None and value == value:
+                bucket.get_column(column).add(value, epoch)
+
+
+def _aggregate_chunk_numpy(
+    buckets: Dict[int, _Bucket],
+    records: List[DataRecord],
+    interval: int,
+    columns: List[str],
+    exclude_flagged: bool,
+) -> None:
+    epochs = np.fromiter(
+        (timestamp_to_epoch(record['timestamp']) for record in records),
+        dtype=np.int64,
+        count=len(records),
+    )
+
+    # Sort by bucket then time, so each bucket is a contiguous run ending at its last record
+    starts = epochs - epochs % interval
+    order = np.lexsort((epochs, starts))
+    epochs = epochs[order]
+    starts = starts[order]
+
+    bucket_starts, first_indexes, counts = np.unique(
+        starts,
+        return_index=True,
+        return_counts=True,
+    )
+
+    for start, count in zip(bucket_starts.tolist(), counts.tolist()):
+        bucket = buckets.get(start)
+
+        if bucket is None:
+            bucket = buckets[start] = _Bucket()
+
+        bucket.count += count
+
+    for column in columns:
+        values = np.fromiter(
+            (_get_nan_value(record, column, exclude_flagged) for record in records),
+            dtype=np.float64,
+            count=len(records),
+        )[order]
+
+        valid = ~np.isnan(values)
+
+        if not valid.any():
+            continue
+
+        filled = np.where(valid, values, 0.0)
+
+        minimums = np.fmin.reduceat(values, first_indexes)
+        maximums = np.fmax.reduceat(values, first_indexes)
+        totals = np.add.reduceat(filled, first_indexes)
+        valid_counts = np.add.reduceat(valid.astype(np.int64), first_indexes)
+
+        # Index of the last valid value in each bucket
+        positions = np.where(valid, np.arange(len(values)), -1)
+        last_indexes = np.maximum.reduceat(positions, first_indexes)
+
+        for index, start in enumerate(bucket_starts.tolist()):
+            valid_count = int(valid_counts[index])
+
+            if not valid_count:
+                continue
+
+            last_index = int(last_indexes[index])
+
+            buckets[start].get_column(column).merge(
+                float(minimums[index]),
+                float(maximums[index]),
+                float(totals[index]),
+                valid_count,
+                int(epochs[last_index]),
+                float(values[last_index]),
+            )
+
+
+def _get_nan_value(
+    record: DataRecord,
+    column: str,
+    exclude_flagged: bool,
+) -> float:
+    value = _get_value(record, column, exclude_flagged)
+
+    return float('nan') if value is None else value
+
+
+def _summarize_bucket(
+    start: int,
+    bucket: _Bucket,
+    columns: List[str],
+) -> AggregatedRecord:
+    data: Dict[str, Any] = {}
+
+    for column in columns:
+        accumulator = bucket.columns.get(column)
+
+        if accumulator and accumulator.count:
+            data[column] = {
+                'min': accumulator.min,
+                'max': accumulator.max,
+                'mean': accumulator.total / accumulator.count,
+                'last': accumulator.last,
+                'count': accumulator.count,
+            }
+        else:
+            data[column] = {
+                'min': None,
+                'max': None,
+                'mean': None,
+                'last': None,
+                'count': 0,
+            }
+
+    return {
+        'timestamp': epoch_to_timestamp(start),
+        'count': bucket.count,
+        'data': data,
+    }
@@ -0,0 +1,295 @@
+import json
+import os
+from threading import get_ident
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import quote, unquote
+
+from .decoding import decode_number
+from .interfaces import DataFile, DataFileHeaders, DataRecord
+from .utils import epoch_to_timestamp, timestamp_to_epoch
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+INDEX_FILENAME = 'index.json'
+
+Segment = Dict[str, Any]
+
+
+class ArchivedFile():
+    def __init__(self, path: str) -> None:
+        if not HAS_NUMPY:
+            raise ImportError('numpy is required, install grndwork-api-client[numpy]')
+
+        with open(os.path.join(path, INDEX_FILENAME)) as f:
+            index = json.loads(f.read())
+
+        self.path = path
+        self.filename: str = index['filename']
+        self.source: str = index['source']
+        self.headers: DataFileHeaders = index['headers']
+        self.columns: List[str] = index['columns']
+        self._segments: List[Segment] = index['segments']
+
+    def __len__(self) -> int:
+        return sum(segment['count'] for segment in self._segments)
+
+    @property
+    def first_timestamp(self) -> Optional[str]:
+        return epoch_to_timestamp(self._segments[0]['first']) if self._segments else None
+
+    @property
+    def last_timestamp(self) -> Optional[str]:
+        return epoch_to_timestamp(self._segments[-1]['last']) if self._segments else None
+
+    def segments(
+        self,
+        *,
+        columns: Optional[List[str]] = None,
+        records_after: Optional[str] = None,
+        records_before: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        # Arrays are memory mapped views of the segment files, nothing is copied
+        after = timestamp_to_epoch(records_after) if records_after else None
+        before = timestamp_to_epoch(records_before) if records_before else None
+
+        for segment in self._segments:
+            if after is not None and segment['last'] < after:
+                continue
+
+            if before is not None and segment['first'] > before:
+                continue
+
+            timestamps = self._load(segment, 'timestamp')
+
+            start = int(np.searchsorted(timestamps, after, 'left')) if after is not None else 0
+            end = int(np.searchsorted(timestamps, before, 'right')) if before is not None else None
+
+            arrays = {
+                'timestamp': timestamps[start:end],
+                'record_num': self._load(segment, 'record_num')[start:end],
+            }
+
+            for column in columns or self.columns:
+                for prefix in ('data', 'qc_flags'):
+                    array = self._load(segment, f'{prefix}.{column}')
+
+                    if array is not None:
+                        arrays[f'{prefix}.{column}'] = array[start:end]
+
+            yield arrays
+
+    def read(
+        self,
+        *,
+        columns: Optional[List[str]] = None,
+        records_after: Optional[str] = None,
+        records_before: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        segments = list(self.segments(
+            columns=columns,
+            records_after=records_after,
+            records_before=records_before,
+        ))
+
+        if not segments:
+            return {
+                'timestamp': np.array([], dtype=np.int64),
+                'record_num': np.array([], dtype=np.int64),
+            }
+
+        if len(segments) == 1:
+            return segments[0]
+
+        arrays = {name: array for segment in segments for (name, array) in segment.items()}
+
+        return {
+            name: np.concatenate([
+                segment[name] if name in segment else _get_missing(array, len(segment['timestamp']))
+                for segment in segments
+            ]) for (name, array) in arrays.items()
+        }
+
+    def _load(self, segment: Segment, name: str) -> Any:
+        path = os.path.join(self.path, f'{segment["id"]:06d}.{quote(name, safe="")}.npy')
+
+        if not os.path.exists(path):
+            return None
+
+        return np.load(path, mmap_mode='r')
+
+
+class DataArchive():
+    def __init__(self, path: str) -> None:
+        if not HAS_NUMPY:
+            raise ImportError('numpy is required, install grndwork-api-client[numpy]')
+
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def filenames(self) -> List[str]:
+        return sorted(
+            unquote(name) for name in os.listdir(self.path)
+            if os.path.exists(os.path.join(self.path, name, INDEX_FILENAME))
+        )
+
+    def open(self, filename: str) -> ArchivedFile:  # noqa: A003
+        return ArchivedFile(self._get_file_path(filename))
+
+    def append(self, data_file: DataFile) -> int:
+        # Only records newer than the last archived record are appended
+        path = self._get_file_path(data_file['filename'])
+        index = self._read_index(path, data_file)
+
+        last = index['segments'][-1]['last'] if index['segments'] else None
+
+        records = sorted(
+            (
+                (timestamp_to_epoch(record['timestamp']), record)
+                for record in data_file.get('records', [])
+            ),
+            key=lambda item: item[0],
+        )
+
+        records = [item for item in records if last is None or item[0] > last]
+
+        index['source'] = data_file['source']
+        index['headers'] = data_file['headers']
+
+        columns = data_file['headers'].get('columns') or list(dict.fromkeys(
+            column for (_, record) in records for column in record['data']
+        ))
+
+        for column in columns:
+            if column not in index['columns']:
+                index['columns'].append(column)
+
+        if records:
+            segment_id = index['segments'][-1]['id'] + 1 if index['segments'] else 0
+
+            self._write_segment(path, segment_id, index['columns'], records)
+
+            index['segments'].append({
+                'id': segment_id,
+                'count': len(records),
+                'first': records[0][0],
+                'last': records[-1][0],
+            })
+
+        # Readers only see a segment once the index referencing it is replaced
+        _write_atomic(os.path.join(path, INDEX_FILENAME), json.dumps(index).encode())
+
+        return len(records)
+
+    def _get_file_path(self, filename: str) -> str:
+        return os.path.join(self.path, quote(filename, safe=''))
+
+    def _read_index(self, path: str, data_file: DataFile) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(path, INDEX_FILENAME)) as f:
+                return dict(json.loads(f.read()))
+        except FileNotFoundError:
+            os.makedirs(path, exist_ok=True)
+
+            return {
+                'filename': data_file['filename'],
+                'source': data_file['source'],
+                'headers': data_file['headers'],
+                'columns': [],
+                'segments': [],
+            }
+
+    def _write_segment(
+        self,
+        path: str,
+        segment_id: int,
+        columns: List[str],
+        records: List[Any],
+    ) -> None:
+        arrays = {
+            'timestamp': np.array(
+                [epoch for (epoch, _) in records],
+                dtype=np.int64,
+            ),
+            'record_num': np.array(
+                [record['record_num'] for (_, record) in records],
+                dtype=np.int64,
+            ),
+        }
+
+        for column in columns:
+            arrays[f'data.{column}'] = _to_array([
+                record['data'].get(column) for (_, record) in records
+            ])
+
+            if any(column in record.get('qc_flags', {}) for (_, record) in records):
+                arrays[f'qc_flags.{column}'] = _to_array([
+                    record.get('qc_flags', {}).get(column) for (_, record) in records
+                ])
+
+        for name, array in arrays.items():
+            filename = os.path.join(path, f'{segment_id:06d}.{quote(name, safe="")}.npy')
+            temp_filename = f'{filename}.{os.getpid()}.{get_ident()}.tmp'
+
+            with open(temp_filename, 'wb') as f:
+                np.save(f, array, allow_pickle=False)
+
+            os.replace(temp_filename, filename)
+
+
+def to_records(arrays: Dict[str, Any]) -> Iterator[DataRecord]:
+    # Convert arrays from an archived file back to data records
+    columns = [name[5:] for name in arrays if name.startswith('data.')]
+    flagged = [name[9:] for name in arrays if name.startswith('qc_flags.')]
+
+    for index in range(len(arrays['timestamp'])):
+        record: DataRecord = {
+            'timestamp': epoch_to_timestamp(int(arrays['timestamp'][index])),
+            'record_num': int(arrays['record_num'][index]),
+            'data': {
+                column: arrays[f'data.{column}'][index].item()
+                for column in columns
+            },
+        }
+
+        if flagged:
+            qc_flags = {}
+
+            for column in flagged:
+                value = arrays[f'qc_flags.{column}'][index].item()
+
+                # Missing flags are stored as NaN or empty strings
+                if value == value and value != '':
+                    qc_flags[column] = value
+
+            record['qc_flags'] = qc_flags
+
+        yield record
+
+
+def _get_missing(array: Any, count: int) -> Any:
+    # Missing text values are empty strings, NaN would be read back as the text 'nan'
+    if array.dtype.kind == 'U':
+        return np.full(count, '', dtype=array.dtype)
+
+    return np.full(count, np.nan)
+
+
+def _to_array(values: List[Any]) -> Any:
+    try:
+        return np.array([decode_number(value) for value in values], dtype=np.float64)
+    except (TypeError, ValueError):
+        # Fixed width strings keep text columns memory mappable
+        return np.array(['' if value is None else str(value) for value in values], dtype=str)
+
+
+def _write_atomic(path: str, content: bytes) -> None:
+    temp_path = f'{path}.{os.getpid()}.{get_ident()}.tmp'
+
+    with open(temp_path, 'wb') as f:
+        f.write(content)
+
+    os.replace(temp_path, path)
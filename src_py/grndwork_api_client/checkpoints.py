@@ -0,0 +1,209 @@
+from contextlib import contextmanager
+import json
+import os
+import sqlite3
+from threading import get_ident, Lock
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Protocol
+
+SQLITE_MAX_PARAMS = 500
+
+
+class CheckpointStore(Protocol):
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    def save(self, key: str, state: Dict[str, Any]) -> None:
+        ...
+
+    def delete(self, key: str) -> None:
+        ...
+
+
+class MemoryCheckpointStore():
+    def __init__(self) -> None:
+        self._checkpoints: Dict[str, Dict[str, Any]] = {}
+        self._lock = Lock()
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._checkpoints.get(key)
+
+    def load_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {key: self._checkpoints[key] for key in keys if key in self._checkpoints}
+
+    def save(self, key: str, state: Dict[str, Any]) -> None:
+        with self._lock:
+            self._checkpoints[key] = state
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._checkpoints.pop(key, None)
+
+
+class FileCheckpointStore():
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = Lock()
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._read().get(key)
+
+    def load_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        # The file is read once for all keys
+        with self._lock:
+            checkpoints = self._read()
+
+        return {key: checkpoints[key] for key in keys if key in checkpoints}
+
+    def save(self, key: str, state: Dict[str, Any]) -> None:
+        with self._lock:
+            checkpoints = self._read()
+            checkpoints[key] = state
+            self._write(checkpoints)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            checkpoints = self._read()
+
+            if checkpoints.pop(key, None) is not None:
+                self._write(checkpoints)
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path) as f:
+                return dict(json.loads(f.read()))
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, checkpoints: Dict[str, Any]) -> None:
+        temp_path = f'{self.path}.{os.getpid()}.{get_ident()}.tmp'
+
+        with open(temp_path, 'w') as f:
+            f.write(json.dumps(checkpoints))
+
+        os.replace(temp_path, self.path)
+
+
+class SQLiteCheckpointStore():
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+        with self._connect() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS checkpoints '
+                '(key TEXT PRIMARY KEY, state TEXT NOT NULL)',
+            )
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as connection:
+            row = connection.execute(
+                'SELECT state FROM checkpoints WHERE key = ?',
+                (key,),
+            ).fetchone()
+
+        return dict(json.loads(row[0])) if row else None
+
+    def load_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        keys = list(keys)
+        rows: List[Any] = []
+
+        with self._connect() as connection:
+            # Keys are queried in chunks to stay below the limit of sqlite query params
+            for start in range(0, len(keys), SQLITE_MAX_PARAMS):
+                chunk = keys[start:start + SQLITE_MAX_PARAMS]
+                params = ', '.join('?' * len(chunk))
+
+                rows.extend(connection.execute(
+                    f'SELECT key, state FROM checkpoints WHERE key IN ({params})',
+                    chunk,
+                ).fetchall())
+
+        return {key: dict(json.loads(state)) for (key, state) in rows}
+
+    def save(self, key: str, state: Dict[str, Any]) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO checkpoints (key, state) VALUES (?, ?)',
+                (key, json.dumps(state)),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._connect() as connection:
+            connection.execute('DELETE FROM checkpoints WHERE key = ?', (key,))
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per call keeps the store safe to share across threads and processes
+        connection = sqlite3.connect(self.path, timeout=30)
+
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+class Checkpoint():
+    def __init__(
+        self,
+        store: CheckpointStore,
+        key: str,
+        *,
+        interval: int,
+    ) -> None:
+        state = store.load(key) or {}
+
+        self.store = store
+        self.key = key
+        self.interval = interval
+        self.offset: int = state.get('offset', 0)
+        self.position: Optional[Dict[str, Any]] = state.get('position')
+        self.high_water_marks: Dict[str, str] = state.get('high_water_marks', {})
+        self.complete: bool = state.get('complete', False)
+        self._unsaved = 0
+
+    def advance(self, offset: int, data_file: Any) -> None:
+        self.offset = offset
+
+        for record in data_file.get('records') or []:
+            self._update_high_water_mark(data_file['filename'], record['timestamp'])
+
+        self._mark_unsaved()
+
+    def advance_record(self, filename: str, record: Any) -> None:
+        self.position = {
+            'timestamp': record['timestamp'],
+            'record_num': record['record_num'],
+        }
+
+        self._update_high_water_mark(filename, record['timestamp'])
+        self._mark_unsaved()
+
+    def finish(self, offset: Optional[int] = None) -> None:
+        if offset is not None:
+            self.offset = offset
+
+        self.complete = True
+        self.save()
+
+    def save(self) -> None:
+        self.store.save(self.key, {
+            'offset': self.offset,
+            'position': self.position,
+            'high_water_marks': self.high_water_marks,
+            'complete': self.complete,
+        })
+
+        self._unsaved = 0
+
+    def _update_high_water_mark(self, filename: str, timestamp: str) -> None:
+        if timestamp > self.high_water_marks.get(filename, ''):
+            self.high_water_marks[filename] = timestamp
+
+    def _mark_unsaved(self) -> None:
+        self._unsaved += 1
+
+        if self._unsaved >= self.interval:
+            self.save()
@@ -0,0 +1,622 @@
+import argparse
+import csv
+from fnmatch import fnmatch
+import io
+from itertools import chain, islice
+import json
+import os
+import sys
+import tempfile
+from threading import Lock
+import time
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    cast,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from requests import RequestException
+
+from . import create_client, LOGGERNET_PLATFORM
+from .checkpoints import CheckpointStore, FileCheckpointStore, MemoryCheckpointStore
+from .client import Client
+from .formats import (
+    FORMATS,
+    get_columns,
+    get_format,
+    get_output_filename,
+    read_records,
+    write_header,
+    write_records,
+)
+from .interfaces import DataFile, DataRecord, GetDataQuery, GetStationsQuery
+from .make_request import RequestError
+from .sync_planner import SyncPlanner, SyncTask
+from .uploader import DataUploader
+from .utils import map_concurrently
+
+RETRY_DELAY = 1.0
+
+SYNC_STATE_FILENAME = '.grndwork-sync.json'
+
+STATION_COLUMNS = [
+    'client_uuid',
+    'client_full_name',
+    'client_short_name',
+    'site_uuid',
+    'site_full_name',
+    'station_uuid',
+    'station_full_name',
+    'description',
+    'latitude',
+    'longitude',
+    'altitude',
+    'timezone_offset',
+    'start_timestamp',
+    'end_timestamp',
+    'data_file_prefix',
+    'data_files',
+]
+
+
+class _Output():
+    # Writes from concurrent exports are serialized, each record is written in one call
+    def __init__(self, f: TextIO) -> None:
+        self.f = f
+        self._lock = Lock()
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            return self.f.write(text)
+
+    def flush(self) -> None:
+        with self._lock:
+            self.f.flush()
+
+    def close(self) -> None:
+        if self.f is not sys.stdout:
+            self.f.close()
+
+
+class _FlushedCheckpointStore():
+    # Output is flushed before progress is saved, so saved progress never runs ahead of it
+    def __init__(self, store: CheckpointStore, output: _Output) -> None:
+        self.store = store
+        self.output = output
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.store.load(key)
+
+    def save(self, key: str, state: Dict[str, Any]) -> None:
+        self.output.flush()
+        self.store.save(key, state)
+
+    def delete(self, key: str) -> None:
+        self.store.delete(key)
+
+
+class _Progress():
+    def __init__(self, action: str) -> None:
+        self.action = action
+        self.files = 0
+        self.records = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self._lock = Lock()
+
+    def add(self, *, files: int = 0, records: int = 0, failed: int = 0) -> None:
+        with self._lock:
+            self.files += files
+            self.records += records
+            self.failed += failed
+
+    def get_summary(self) -> str:
+        elapsed = time.monotonic() - self.started
+        rate = self.records / elapsed if elapsed > 0 else 0
+
+        summary = (
+            f'{self.action} {self.records} records from {self.files} files '
+            f'in {elapsed:.1f}s ({rate:.0f} records/s)'
+        )
+
+        if self.failed:
+            summary += f', {self.failed} failed'
+
+        return summary
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = _make_parser()
+    args = parser.parse_args(argv)
+
+    if args.command_name == 'export' and args.resume and not args.output:
+        parser.error('--resume requires --output')
+
+    if args.command_name == 'sync' and args.changed_only and args.gateway:
+        parser.error('--changed-only can not be used with --gateway')
+
+    try:
+        client = create_client(args.platform)
+    except OSError as err:
+        parser.error(str(err))
+
+    try:
+        return int(args.command(client, args))
+    except (RequestError, RequestException) as err:
+        print(f'Error: {err}', file=sys.stderr)
+        return 1
+
+
+def _make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='grndwork', description='Groundwork API Client')
+    parser.add_argument('--platform', default=LOGGERNET_PLATFORM)
+    parser.add_argument('--quiet', action='store_true', help='do not print a summary')
+
+    commands = parser.add_subparsers(dest='command_name', required=True)
+
+    stations = commands.add_parser('stations', help='list stations')
+    stations.set_defaults(command=_list_stations)
+    stations.add_argument('--client')
+    stations.add_argument('--site')
+    stations.add_argument('--station')
+    stations.add_argument('--limit', type=int)
+    stations.add_argument('--page-size', type=int, default=100)
+    stations.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    stations.add_argument('--output', help='output file, defaults to stdout')
+
+    export = commands.add_parser('export', help='export data records')
+    export.set_defaults(command=_export)
+    _add_data_arguments(export)
+    export.add_argument(
+        '--output',
+        help='output file for ndjson or directory for csv and toa5, defaults to stdout',
+    )
+    export.add_argument('--resume', metavar='PATH', help='file to save export progress in')
+
+    sync = commands.add_parser('sync', help='append new data records to files in a directory')
+    sync.set_defaults(command=_sync)
+    sync.add_argument('output', metavar='DIRECTORY')
+    _add_data_arguments(sync)
+    sync.add_argument(
+        '--changed-only',
+        action='store_true',
+        help='only sync files that are new, have changed headers or are not stale',
+    )
+
+    upload = commands.add_parser('upload', help='upload data records from files')
+    upload.set_defaults(command=_upload)
+    upload.add_argument('paths', metavar='PATH', nargs='+')
+    upload.add_argument('--source', required=True)
+    upload.add_argument('--format', choices=FORMATS, help='defaults to the file extension')
+    upload.add_argument('--concurrency', type=int, default=4)
+    upload.add_argument('--page-size', type=int, default=100, help='records per request')
+    upload.add_argument('--retries', type=int, default=3)
+    upload.add_argument('--overwrite', action='store_true')
+    upload.add_argument(
+        '--resume',
+        action='store_true',
+        help='skip records older than the latest uploaded record of each file',
+    )
+
+    return parser
+
+
+def _add_data_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--client')
+    parser.add_argument('--site')
+    parser.add_argument('--gateway')
+    parser.add_argument('--station')
+    parser.add_argument('--filename')
+    parser.add_argument('--limit', type=int, help='maximum number of files')
+    parser.add_argument('--records-after')
+    parser.add_argument('--records-before')
+    parser.add_argument('--columns', type=lambda value: value.split(','))
+    parser.add_argument('--no-qc-flags', action='store_true')
+    parser.add_argument('--format', choices=FORMATS, default='toa5')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--page-size', type=int, default=1500, help='records per request')
+    parser.add_argument('--retries', type=int, default=3)
+
+
+def _list_stations(client: Client, args: argparse.Namespace) -> int:
+    progress = _Progress('Listed')
+
+    query = cast(GetStationsQuery, {
+        key: value for key, value in {
+            'client': args.client,
+            'site': args.site,
+            'station': args.station,
+            'limit': args.limit,
+        }.items() if value is not None
+    })
+
+    output = _Output(open(args.output, 'w', newline='') if args.output else sys.stdout)
+
+    try:
+        writer = csv.writer(output) if args.format == 'csv' else None
+
+        if writer:
+            writer.writerow(STATION_COLUMNS)
+
+        for station in client.get_stations(query, page_size=args.page_size):
+            if writer:
+                writer.writerow([
+                    ';'.join(data_file['filename'] for data_file in station['data_files'])
+                    if column == 'data_files' else cast(Dict[str, Any], station).get(column)
+                    for column in STATION_COLUMNS
+                ])
+            else:
+                output.write(json.dumps(station) + '\n')
+
+            progress.add(records=1)
+    finally:
+        output.close()
+
+    if not args.quiet:
+        print(
+            f'Listed {progress.records} stations in {time.monotonic() - progress.started:.1f}s',
+            file=sys.stderr,
+        )
+
+    return 0
+
+
+def _export(client: Client, args: argparse.Namespace) -> int:
+    progress = _Progress('Exported')
+    store: CheckpointStore = (
+        FileCheckpointStore(args.resume) if args.resume else MemoryCheckpointStore()
+    )
+
+    shared: Optional[_Output] = None
+    concurrency = args.concurrency
+
+    if not args.output:
+        shared = _Output(sys.stdout)
+
+        # Files written to stdout must not be interleaved
+        if args.format != 'ndjson':
+            concurrency = 1
+
+    elif args.format == 'ndjson':
+        shared = _Output(open(args.output, 'a' if args.resume else 'w'))
+
+    else:
+        os.makedirs(args.output, exist_ok=True)
+
+    def export_file(data_file: DataFile) -> None:
+        filename = data_file['filename']
+        key = f'export:{filename}:{args.records_after or ""}:{args.records_before or ""}'
+        state = store.load(key)
+
+        if state and state.get('complete'):
+            return
+
+        # TOA5 and CSV files are written oldest first, so records are only written once every
+        # record of the file is read and an interrupted file is exported again
+        spooled = args.format != 'ndjson'
+
+        if shared:
+            output = shared
+            resuming = state is not None and not spooled
+        else:
+            path = os.path.join(args.output, get_output_filename(filename, args.format))
+            resuming = state is not None and not spooled and os.path.exists(path)
+            output = _Output(open(path, 'a' if resuming else 'w', newline=''))
+
+        columns = get_columns(data_file, args.columns)
+
+        def write_spooled_records() -> int:
+            with tempfile.TemporaryFile() as spool:
+                (count, windows) = _spool_records(
+                    spool,
+                    args.format,
+                    data_file,
+                    columns,
+                    client.get_records(
+                        filename,
+                        records_after=args.records_after,
+                        records_before=args.records_before,
+                        include_qc_flags=not args.no_qc_flags,
+                        window_size=args.page_size,
+                    ),
+                    window_size=args.page_size,
+                    include_qc_flags=not args.no_qc_flags,
+                )
+
+                _write_spooled_records(output, spool, windows)
+
+            return count
+
+        try:
+            if not resuming:
+                write_header(
+                    output,
+                    args.format,
+                    data_file,
+                    columns,
+                    include_qc_flags=not args.no_qc_flags,
+                )
+
+            if spooled:
+                progress.add(files=1, records=_retry(write_spooled_records, retries=args.retries))
+                store.save(key, {'complete': True})
+            else:
+                # Retries continue from the last record written
+                checkpoint = _FlushedCheckpointStore(store, output)
+
+                _retry(
+                    lambda: write_records(
+                        output,
+                        args.format,
+                        data_file,
+                        columns,
+                        _count_records(progress, client.get_records(
+                            filename,
+                            records_after=args.records_after,
+                            records_before=args.records_before,
+                            include_qc_flags=not args.no_qc_flags,
+                            window_size=args.page_size,
+                            checkpoint=checkpoint,
+                            checkpoint_key=key,
+                        )),
+                        include_qc_flags=not args.no_qc_flags,
+                    ),
+                    retries=args.retries,
+                )
+
+                progress.add(files=1)
+        except (RequestError, RequestException) as err:
+            print(f'Failed to export {filename}: {err}', file=sys.stderr)
+            progress.add(failed=1)
+        finally:
+            if output is not shared:
+                output.close()
+
+    try:
+        for _ in map_concurrently(
+            export_file,
+            client.get_data(_get_files_query(args)),
+            max_workers=concurrency,
+        ):
+            pass
+    finally:
+        if shared:
+            shared.close()
+
+    if not args.quiet:
+        print(progress.get_summary(), file=sys.stderr)
+
+    return 1 if progress.failed else 0
+
+
+def _sync(client: Client, args: argparse.Namespace) -> int:
+    progress = _Progress('Synced')
+
+    os.makedirs(args.output, exist_ok=True)
+    store = FileCheckpointStore(os.path.join(args.output, SYNC_STATE_FILENAME))
+    planner = SyncPlanner(client, store) if args.changed_only else None
+    tasks: Dict[str, SyncTask] = {}
+
+    def sync_file(data_file: DataFile) -> None:
+        filename = data_file['filename']
+        key = f'sync:{filename}'
+        path = os.path.join(args.output, get_output_filename(filename, args.format))
+        columns = get_columns(data_file, args.columns)
+
+        # The latest synced record, later records are appended
+        latest = store.load(key)
+
+        def sync_records() -> int:
+            is_new = not os.path.exists(path)
+            records = client.get_records(
+                filename,
+                records_after=latest['timestamp'] if latest else args.records_after,
+                records_before=args.records_before,
+                include_qc_flags=not args.no_qc_flags,
+                window_size=args.page_size,
+            )
+
+            new_records = (record for record in records if _is_after(record, latest))
+            newest = next(new_records, None)
+
+            if newest is None:
+                return 0
+
+            with tempfile.TemporaryFile() as spool:
+                (count, windows) = _spool_records(
+                    spool,
+                    args.format,
+                    data_file,
+                    columns,
+                    chain([newest], new_records),
+                    window_size=args.page_size,
+                    include_qc_flags=not args.no_qc_flags,
+                )
+
+                with open(path, 'a', newline='') as f:
+                    if is_new:
+                        write_header(
+                            f,
+                            args.format,
+                            data_file,
+                            columns,
+                            include_qc_flags=not args.no_qc_flags,
+                        )
+
+                    _write_spooled_records(f, spool, windows)
+
+            store.save(key, {
+                'timestamp': newest['timestamp'],
+                'record_num': newest['record_num'],
+            })
+
+            return count
+
+        try:
+            progress.add(files=1, records=_retry(sync_records, retries=args.retries))
+        except (RequestError, RequestException) as err:
+            print(f'Failed to sync {filename}: {err}', file=sys.stderr)
+            progress.add(failed=1)
+        else:
+            if planner:
+                planner.complete(tasks[filename])
+
+    data_files: Iterable[DataFile]
+
+    if planner:
+        # Files are listed from stations, skipping stale files that have not changed
+        for task in planner.plan(cast(GetStationsQuery, {
+            key: value for key, value in {
+                'client': args.client,
+                'site': args.site,
+                'station': args.station,
+            }.items() if value is not None
+        })):
+            if not args.filename or fnmatch(task.filename, args.filename):
+                tasks[task.filename] = task
+
+        data_files = [task.to_data_file() for task in list(tasks.values())[:args.limit]]
+    else:
+        data_files = client.get_data(_get_files_query(args))
+
+    for _ in map_concurrently(
+        sync_file,
+        data_files,
+        max_workers=args.concurrency,
+    ):
+        pass
+
+    if not args.quiet:
+        print(progress.get_summary(), file=sys.stderr)
+
+    return 1 if progress.failed else 0
+
+
+def _upload(client: Client, args: argparse.Namespace) -> int:
+    progress = _Progress('Uploaded')
+
+    with DataUploader(
+        client,
+        source=args.source,
+        max_records=args.page_size,
+        max_workers=args.concurrency,
+        overwrite=args.overwrite or None,
+        delta=args.resume or None,
+        retries=args.retries,
+        retry_delay=RETRY_DELAY,
+    ) as uploader:
+        for path in args.paths:
+            file_format = args.format or get_format(path)
+            filename = os.path.basename(path)
+
+            if file_format != 'toa5':
+                filename = os.path.splitext(filename)[0]
+
+            with open(path, newline='') as f:
+                for (record_filename, headers, record) in read_records(f, file_format, filename):
+                    uploader.add(record_filename, record, headers=headers)
+
+            progress.add(files=1)
+
+    progress.add(records=uploader.records_sent, failed=uploader.records_failed)
+
+    if not args.quiet:
+        print(progress.get_summary(), file=sys.stderr)
+
+    return 1 if uploader.records_failed else 0
+
+
+def _get_files_query(args: argparse.Namespace) -> GetDataQuery:
+    # Files are listed without records, records are requested separately for each file
+    return cast(GetDataQuery, {
+        key: value for key, value in {
+            'client': args.client,
+            'site': args.site,
+            'gateway': args.gateway,
+            'station': args.station,
+            'filename': args.filename,
+            'limit': args.limit,
+        }.items() if value is not None
+    })
+
+
+def _spool_records(
+    spool: BinaryIO,
+    file_format: str,
+    data_file: DataFile,
+    columns: List[str],
+    records: Iterator[DataRecord],
+    *,
+    window_size: int,
+    include_qc_flags: bool,
+) -> Tuple[int, List[Tuple[int, int]]]:
+    # Records are requested newest first and written oldest first, each window is spooled to a
+    # temporary file so the history of a file is never held in memory
+    windows: List[Tuple[int, int]] = []
+    count = 0
+
+    while True:
+        window = list(islice(records, window_size))
+
+        if not window:
+            break
+
+        text = io.StringIO(newline='')
+        count += write_records(
+            text,
+            file_format,
+            data_file,
+            columns,
+            reversed(window),
+            include_qc_flags=include_qc_flags,
+        )
+
+        start = spool.tell()
+        spool.write(text.getvalue().encode())
+        windows.append((start, spool.tell()))
+
+    return (count, windows)
+
+
+def _write_spooled_records(
+    f: Union[TextIO, _Output],
+    spool: BinaryIO,
+    windows: List[Tuple[int, int]],
+) -> None:
+    for (start, end) in reversed(windows):
+        spool.seek(start)
+        f.write(spool.read(end - start).decode())
+
+
+def _count_records(progress: _Progress, records: Iterator[DataRecord]) -> Iterator[DataRecord]:
+    for record in records:
+        yield record
+        progress.add(records=1)
+
+
+def _is_after(record: DataRecord, latest: Optional[Dict[str, Any]]) -> bool:
+    if not latest:
+        return True
+
+    return (record['timestamp'], record['record_num']) > (latest['timestamp'], latest['record_num'])
+
+
+def _retry(fn: Callable[[], Any], *, retries: int) -> Any:
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except (RequestError, RequestException):
+            if attempt >= retries:
+                raise
+
+            time.sleep(RETRY_DELAY * 2 ** attempt)
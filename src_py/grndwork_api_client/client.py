@@ -1,20 +1,43 @@
-from typing import cast, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from itertools import chain
+import json
+from threading import Lock
+import time
+from typing import Any, Callable, cast, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from .access_tokens import get_access_token
-from .config import DATA_URL, QC_URL, STATIONS_URL
+from .checkpoints import Checkpoint, CheckpointStore
+from .config import DATA_PATH, get_api_url, QC_PATH, STATIONS_PATH
+from .content_range import ContentRange
+from .hedging import RequestHedger
 from .interfaces import (
     DataFile,
+    DataRecord,
     GetDataQuery,
     GetQCQuery,
     GetStationsQuery,
+    PostDataFile,
     PostDataPayload,
+    PostDataRecord,
     QCRecord,
     RefreshToken,
     Station,
 )
 from .make_paginated_request import make_paginated_request
-from .make_request import make_request
-from .utils import combine_data_and_qc_records
+from .make_request import make_request, open_connections
+from .make_sharded_request import make_sharded_request
+from .make_windowed_request import make_windowed_request
+from .paginated_iterator import PaginatedIterator
+from .response_cache import ResponseCache
+from .utils import combine_data_and_qc_records, map_concurrently, select_columns
+from .validation import validate_payload
+
+# Timestamp and record number of the latest record stored for a file
+Watermark = Tuple[str, int]
+
+SCOPES = ['read:stations', 'read:data', 'read:qc', 'write:data']
 
 
 class Client():
@@ -22,19 +45,64 @@ class Client():
         self,
         refresh_token: RefreshToken,
         platform: str,
+        *,
+        response_cache: Optional[ResponseCache] = None,
+        count_cache_ttl: float = 60,
+        watermarks: Optional[CheckpointStore] = None,
+        hedge: Optional[RequestHedger] = None,
+        api_url: Optional[str] = None,
     ) -> None:
         self.refresh_token = refresh_token
         self.platform = platform
+        self.api_url = api_url or get_api_url()
+        self.response_cache = response_cache
+        self.count_cache_ttl = count_cache_ttl
+        self.watermarks = watermarks
+        self.hedge = hedge
+        self._count_cache: Dict[str, Tuple[float, int]] = {}
+        # Delta posts for a file are sent one at a time, so each is trimmed against the
+        # records uploaded before it and never against a post still in flight
+        self._watermark_cache: Dict[str, Optional[Watermark]] = {}
+        self._watermark_locks: Dict[str, Lock] = {}
+        self._watermark_lock = Lock()
+
+    def warm_up(
+        self,
+        *,
+        scopes: Optional[List[str]] = None,
+        connections: int = 4,
+    ) -> None:
+        # Request access tokens and open connections ahead of the first request
+        scopes = SCOPES if scopes is None else scopes
+
+        def get_scope_access_token(scope: str) -> None:
+            get_access_token(
+                refresh_token=self.refresh_token,
+                platform=self.platform,
+                scope=scope,
+                api_url=self.api_url,
+            )
+
+        with ThreadPoolExecutor(max_workers=len(scopes) + 1) as executor:
+            futures = [executor.submit(get_scope_access_token, scope) for scope in scopes]
+
+            if connections:
+                futures.append(executor.submit(open_connections, self.api_url, connections))
+
+            for future in futures:
+                future.result()
 
     def get_stations(
         self,
         query: Optional[GetStationsQuery] = None,
         *,
         page_size: Optional[int] = None,
-    ) -> Iterator[Station]:
+        prefetch: Optional[bool] = None,
+    ) -> PaginatedIterator[Station]:
         iterator = self._request_stations(
             query=query,
             page_size=page_size,
+            prefetch=prefetch,
         )
 
         return iterator
@@ -44,108 +112,568 @@ class Client():
         *,
         query: Optional[GetStationsQuery],
         page_size: Optional[int],
-    ) -> Iterator[Station]:
+        prefetch: Optional[bool],
+    ) -> PaginatedIterator[Station]:
         access_token = get_access_token(
             refresh_token=self.refresh_token,
             platform=self.platform,
             scope='read:stations',
+            api_url=self.api_url,
         )
 
-        iterator = cast(Iterator[Station], make_paginated_request(
-            url=STATIONS_URL,
+        iterator = cast(PaginatedIterator[Station], make_paginated_request(
+            url=self.api_url + STATIONS_PATH,
             token=access_token,
             query=query or {},
             page_size=page_size or 100,
+            cache=self.response_cache,
+            hedge=self.hedge,
+            prefetch=bool(prefetch),
         ))
 
         return iterator
 
+    def count_stations(
+        self,
+        query: Optional[GetStationsQuery] = None,
+    ) -> int:
+        return self._request_count(
+            url=self.api_url + STATIONS_PATH,
+            scope='read:stations',
+            query=query,
+        )
+
     def get_data(
         self,
         query: Optional[GetDataQuery] = None,
         *,
         include_qc_flags: Optional[bool] = None,
         page_size: Optional[int] = None,
-    ) -> Iterator[DataFile]:
-        iterator = self._request_data(
+        shard_workers: Optional[int] = None,
+        prefetch: Optional[bool] = None,
+        columns: Optional[List[str]] = None,
+        checkpoint: Optional[CheckpointStore] = None,
+        checkpoint_key: Optional[str] = None,
+        checkpoint_interval: Optional[int] = None,
+    ) -> PaginatedIterator[DataFile]:
+        includes_records = bool((query or {}).get('records_limit') or shard_workers)
+
+        if shard_workers:
+            iterator = self._request_sharded_data(
+                query=query,
+                include_qc_flags=includes_records and include_qc_flags is not False,
+                columns=columns,
+                page_size=page_size,
+                prefetch=prefetch,
+                max_workers=shard_workers,
+            )
+        else:
+            iterator = self._request_data(
+                query=query,
+                include_qc_flags=includes_records and include_qc_flags is not False,
+                columns=columns,
+                page_size=page_size,
+                prefetch=prefetch,
+            )
+
+        if checkpoint:
+            iterator.resume_from(Checkpoint(
+                checkpoint,
+                checkpoint_key or 'data:' + json.dumps(query or {}, sort_keys=True),
+                interval=checkpoint_interval or 10,
+            ))
+
+        return iterator
+
+    def count_data_files(
+        self,
+        query: Optional[GetDataQuery] = None,
+    ) -> int:
+        return self._request_count(
+            url=self.api_url + DATA_PATH,
+            scope='read:data',
             query=query,
-            page_size=page_size,
         )
 
-        if (query or {}).get('records_limit') and include_qc_flags is not False:
-            iterator = self._include_qc_flags(iterator)
+    def _request_count(
+        self,
+        *,
+        url: str,
+        scope: str,
+        query: Any,
+    ) -> int:
+        # Request a single item without records and read the total from the content range
+        query = {
+            key: value for key, value in (query or {}).items()
+            if key not in ('limit', 'offset') and not key.startswith('records_')
+        }
 
-        return iterator
+        cache_key = json.dumps([url, query], sort_keys=True)
+        cached = self._count_cache.get(cache_key)
+
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        access_token = get_access_token(
+            refresh_token=self.refresh_token,
+            platform=self.platform,
+            scope=scope,
+            api_url=self.api_url,
+        )
+
+        results, resp = make_request(
+            url=url,
+            token=access_token,
+            query={
+                **query,
+                'limit': 1,
+                'offset': 0,
+            },
+        )
+
+        count = ContentRange.parse(resp.headers.get('Content-Range') or '').count if results else 0
+
+        if self.count_cache_ttl > 0:
+            self._count_cache[cache_key] = (time.monotonic() + self.count_cache_ttl, count)
+
+        return count
 
     def _request_data(
         self,
         *,
         query: Optional[GetDataQuery],
+        include_qc_flags: bool,
+        columns: Optional[List[str]],
         page_size: Optional[int],
-    ) -> Iterator[DataFile]:
+        prefetch: Optional[bool],
+    ) -> PaginatedIterator[DataFile]:
         access_token = get_access_token(
             refresh_token=self.refresh_token,
             platform=self.platform,
             scope='read:data',
+            api_url=self.api_url,
         )
 
-        iterator = cast(Iterator[DataFile], make_paginated_request(
-            url=DATA_URL,
+        iterator = cast(PaginatedIterator[DataFile], make_paginated_request(
+            url=self.api_url + DATA_PATH,
             token=access_token,
             query=query or {},
             page_size=page_size or 100,
+            cache=self.response_cache,
+            hedge=self.hedge,
+            transform=self._get_data_transform(
+                include_qc_flags=include_qc_flags,
+                columns=columns,
+            ),
+            prefetch=bool(prefetch),
         ))
 
         return iterator
 
+    def _request_sharded_data(
+        self,
+        *,
+        query: Optional[GetDataQuery],
+        include_qc_flags: bool,
+        columns: Optional[List[str]],
+        page_size: Optional[int],
+        prefetch: Optional[bool],
+        max_workers: int,
+    ) -> PaginatedIterator[DataFile]:
+        access_token = get_access_token(
+            refresh_token=self.refresh_token,
+            platform=self.platform,
+            scope='read:data',
+            api_url=self.api_url,
+        )
+
+        iterator = cast(PaginatedIterator[DataFile], make_sharded_request(
+            url=self.api_url + DATA_PATH,
+            token=access_token,
+            query=query or {},
+            page_size=page_size or 100,
+            max_workers=max_workers,
+            cache=self.response_cache,
+            hedge=self.hedge,
+            transform=self._get_data_transform(
+                include_qc_flags=include_qc_flags,
+                columns=columns,
+            ),
+            prefetch=bool(prefetch),
+        ))
+
+        return iterator
+
+    def _get_data_transform(
+        self,
+        *,
+        include_qc_flags: bool,
+        columns: Optional[List[str]],
+    ) -> Optional[Callable[[DataFile], DataFile]]:
+        include = self._get_qc_flags_transform(columns) if include_qc_flags else None
+
+        if not columns:
+            return include
+
+        selected_columns = columns
+
+        def transform(data_file: DataFile) -> DataFile:
+            # Drop unused columns before qc flags are combined with the records
+            data_file = select_columns(data_file, selected_columns)
+
+            return include(data_file) if include else data_file
+
+        return transform
+
+    def _get_qc_flags_transform(
+        self,
+        columns: Optional[List[str]] = None,
+    ) -> Callable[[DataFile], DataFile]:
+        access_token = get_access_token(
+            refresh_token=self.refresh_token,
+            platform=self.platform,
+            scope='read:qc',
+            api_url=self.api_url,
+        )
+
+        return partial(self._include_qc_flags, access_token, columns=columns)
+
     def _include_qc_flags(
         self,
-        iterator: Iterator[DataFile],
-    ) -> Iterator[DataFile]:
+        access_token: str,
+        data_file: DataFile,
+        *,
+        columns: Optional[List[str]] = None,
+    ) -> DataFile:
+        records = data_file.get('records', [])
+
+        if records:
+            return {
+                **data_file,
+                'records': self._combine_qc_flags(
+                    access_token,
+                    data_file['filename'],
+                    records,
+                    columns=columns,
+                ),
+            }
+
+        return data_file
+
+    def _combine_qc_flags(
+        self,
+        access_token: str,
+        filename: str,
+        records: List[DataRecord],
+        *,
+        columns: Optional[List[str]] = None,
+    ) -> List[DataRecord]:
+        results = list(self._request_qc(
+            access_token,
+            query={
+                'filename': filename,
+                'before': records[0]['timestamp'],
+                'after': records[-1]['timestamp'],
+            },
+            page_size=None,
+            prefetch=None,
+        ))
+
+        return combine_data_and_qc_records(records, results, columns)
+
+    def get_qc(
+        self,
+        query: GetQCQuery,
+        *,
+        page_size: Optional[int] = None,
+        prefetch: Optional[bool] = None,
+    ) -> PaginatedIterator[QCRecord]:
         access_token = get_access_token(
             refresh_token=self.refresh_token,
             platform=self.platform,
             scope='read:qc',
+            api_url=self.api_url,
         )
 
-        for data_file in iterator:
-            records = data_file.get('records', [])
+        return self._request_qc(
+            access_token,
+            query=query,
+            page_size=page_size,
+            prefetch=prefetch,
+        )
 
-            if records:
-                query: GetQCQuery = {
-                    'filename': data_file['filename'],
-                    'before': records[0]['timestamp'],
-                    'after': records[-1]['timestamp'],
-                    'limit': 1500,
-                }
+    def get_qc_batch(
+        self,
+        queries: Iterable[GetQCQuery],
+        *,
+        max_workers: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ) -> Iterator[List[QCRecord]]:
+        access_token = get_access_token(
+            refresh_token=self.refresh_token,
+            platform=self.platform,
+            scope='read:qc',
+            api_url=self.api_url,
+        )
 
-                results = cast(List[QCRecord], make_request(
-                    url=QC_URL,
-                    token=access_token,
-                    query=query,
-                )[0])
+        def request_qc(query: GetQCQuery) -> List[QCRecord]:
+            return list(self._request_qc(
+                access_token,
+                query=query,
+                page_size=page_size,
+                prefetch=None,
+            ))
 
-                yield {
-                    **data_file,
-                    'records': combine_data_and_qc_records(records, results),
-                }
+        return map_concurrently(
+            request_qc,
+            queries,
+            max_workers=max_workers or 8,
+        )
 
-            else:
-                yield data_file
+    def _request_qc(
+        self,
+        access_token: str,
+        *,
+        query: GetQCQuery,
+        page_size: Optional[int],
+        prefetch: Optional[bool],
+    ) -> PaginatedIterator[QCRecord]:
+        iterator = cast(PaginatedIterator[QCRecord], make_paginated_request(
+            url=self.api_url + QC_PATH,
+            token=access_token,
+            query=query,
+            page_size=page_size or 1500,
+            cache=self.response_cache,
+            hedge=self.hedge,
+            prefetch=bool(prefetch),
+        ))
 
-    def post_data(
+        return iterator
+
+    def get_records(
         self,
-        payload: PostDataPayload,
-    ) -> None:
+        filename: str,
+        *,
+        records_after: Optional[str] = None,
+        records_before: Optional[str] = None,
+        include_qc_flags: Optional[bool] = None,
+        window_size: Optional[int] = None,
+        checkpoint: Optional[CheckpointStore] = None,
+        checkpoint_key: Optional[str] = None,
+        checkpoint_interval: Optional[int] = None,
+    ) -> Iterator[DataRecord]:
+        if checkpoint:
+            return self._get_checkpointed_records(
+                filename,
+                records_after=records_after,
+                records_before=records_before,
+                include_qc_flags=include_qc_flags,
+                window_size=window_size,
+                checkpoint=Checkpoint(
+                    checkpoint,
+                    checkpoint_key or (
+                        f'records:{filename}:{records_after or ""}:{records_before or ""}'
+                    ),
+                    interval=checkpoint_interval or 10000,
+                ),
+            )
+
         access_token = get_access_token(
             refresh_token=self.refresh_token,
             platform=self.platform,
-            scope='write:data',
+            scope='read:data',
+            api_url=self.api_url,
         )
 
-        make_request(
-            url=DATA_URL,
+        transform = None
+
+        if include_qc_flags is not False:
+            qc_access_token = get_access_token(
+                refresh_token=self.refresh_token,
+                platform=self.platform,
+                scope='read:qc',
+                api_url=self.api_url,
+            )
+
+            transform = partial(self._combine_qc_flags, qc_access_token, filename)
+
+        windows = cast(Iterator[List[DataRecord]], make_windowed_request(
+            url=self.api_url + DATA_PATH,
             token=access_token,
-            method='POST',
-            body=payload,
+            filename=filename,
+            records_after=records_after,
+            records_before=records_before,
+            window_size=window_size or 1500,
+            transform=transform,
+            cache=self.response_cache,
+            hedge=self.hedge,
+        ))
+
+        return chain.from_iterable(windows)
+
+    def _get_checkpointed_records(
+        self,
+        filename: str,
+        *,
+        records_after: Optional[str],
+        records_before: Optional[str],
+        include_qc_flags: Optional[bool],
+        window_size: Optional[int],
+        checkpoint: Checkpoint,
+    ) -> Iterator[DataRecord]:
+        if checkpoint.complete:
+            return
+
+        position = checkpoint.position
+
+        records = self.get_records(
+            filename,
+            records_after=records_after,
+            records_before=position['timestamp'] if position else records_before,
+            include_qc_flags=include_qc_flags,
+            window_size=window_size,
         )
+
+        try:
+            for record in records:
+                if position and record['timestamp'] == position['timestamp']:
+                    if record['record_num'] >= position['record_num']:
+                        # Boundary records already returned before the checkpoint
+                        continue
+
+                yield record
+                checkpoint.advance_record(filename, record)
+
+            checkpoint.finish()
+        finally:
+            if not checkpoint.complete:
+                checkpoint.save()
+
+    def post_data(
+        self,
+        payload: PostDataPayload,
+        *,
+        delta: Optional[bool] = None,
+        validate: Optional[bool] = None,
+    ) -> int:
+        # Returns the number of records uploaded, after records already stored are trimmed
+        if validate:
+            # Malformed payloads fail before they are uploaded
+            validate_payload(payload)
+
+        with ExitStack() as stack:
+            if delta:
+                # Files are locked in a fixed order so payloads sharing files can not deadlock
+                for filename in sorted({data_file['filename'] for data_file in payload['files']}):
+                    stack.enter_context(self._get_watermark_lock(filename))
+
+                payload = self._trim_uploaded_records(payload)
+
+                if not payload['files']:
+                    return 0
+
+            access_token = get_access_token(
+                refresh_token=self.refresh_token,
+                platform=self.platform,
+                scope='write:data',
+                api_url=self.api_url,
+            )
+
+            make_request(
+                url=self.api_url + DATA_PATH,
+                token=access_token,
+                method='POST',
+                body=payload,
+            )
+
+            if delta:
+                for data_file in payload['files']:
+                    if data_file.get('records'):
+                        self._update_watermark(data_file['filename'], data_file['records'])
+
+        return sum(len(data_file.get('records') or []) for data_file in payload['files'])
+
+    def _trim_uploaded_records(
+        self,
+        payload: PostDataPayload,
+    ) -> PostDataPayload:
+        # Only send records newer than the latest record already stored for each file
+        filenames = [
+            data_file['filename'] for data_file in payload['files']
+            if data_file.get('records')
+        ]
+
+        watermarks = dict(zip(filenames, map_concurrently(
+            self._get_watermark,
+            filenames,
+            max_workers=8,
+        )))
+
+        files: List[PostDataFile] = []
+
+        for data_file in payload['files']:
+            watermark = watermarks.get(data_file['filename'])
+
+            if watermark and data_file.get('records'):
+                records = [
+                    record for record in data_file['records']
+                    if (record['timestamp'], record['record_num']) > watermark
+                ]
+
+                data_file = {**data_file, 'records': records}
+
+                if not records:
+                    del data_file['records']
+
+            if data_file.get('records') or data_file.get('headers'):
+                files.append(data_file)
+
+        return {**payload, 'files': files}
+
+    def _get_watermark(
+        self,
+        filename: str,
+    ) -> Optional[Watermark]:
+        if filename in self._watermark_cache:
+            return self._watermark_cache[filename]
+
+        state = self.watermarks.load(f'watermark:{filename}') if self.watermarks else None
+
+        if state:
+            watermark: Optional[Watermark] = (state['timestamp'], state['record_num'])
+        else:
+            watermark = None
+
+            for data_file in self.get_data(
+                {'filename': filename, 'limit': 1, 'records_limit': 1},
+                include_qc_flags=False,
+            ):
+                for record in data_file.get('records', []):
+                    watermark = (record['timestamp'], record['record_num'])
+
+        return self._watermark_cache.setdefault(filename, watermark)
+
+    def _get_watermark_lock(
+        self,
+        filename: str,
+    ) -> Lock:
+        with self._watermark_lock:
+            return self._watermark_locks.setdefault(filename, Lock())
+
+    def _update_watermark(
+        self,
+        filename: str,
+        records: List[PostDataRecord],
+    ) -> None:
+        # Called while holding the lock of the file, after its records were uploaded
+        latest = max((record['timestamp'], record['record_num']) for record in records)
+        watermark = self._watermark_cache.get(filename)
+
+        if watermark is None or latest > watermark:
+            self._watermark_cache[filename] = latest
+
+            if self.watermarks:
+                self.watermarks.save(f'watermark:{filename}', {
+                    'timestamp': latest[0],
+                    'record_num': latest[1],
+                })
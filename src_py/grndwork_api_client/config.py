@@ -4,12 +4,36 @@ from typing import cast
 
 from .interfaces import RefreshToken
 
-API_URL = os.environ.get('GROUNDWORK_API_URL', 'https://api.grndwork.com')
+DEFAULT_API_URL = 'https://api.grndwork.com'
 
-TOKENS_URL = f'{API_URL}/v1/tokens'
-STATIONS_URL = f'{API_URL}/v1/stations'
-DATA_URL = f'{API_URL}/v1/data'
-QC_URL = f'{API_URL}/v1/qc'
+TOKENS_PATH = '/v1/tokens'
+STATIONS_PATH = '/v1/stations'
+DATA_PATH = '/v1/data'
+QC_PATH = '/v1/qc'
+
+# Limits on a single post data payload
+MAX_POST_FILES = 20
+MAX_POST_RECORDS = 100
+
+
+def get_api_url() -> str:
+    return os.environ.get('GROUNDWORK_API_URL', DEFAULT_API_URL)
+
+
+def __getattr__(name: str) -> str:
+    # Url constants are resolved from the environment when read, rather than at import
+    paths = {
+        'API_URL': '',
+        'TOKENS_URL': TOKENS_PATH,
+        'STATIONS_URL': STATIONS_PATH,
+        'DATA_URL': DATA_PATH,
+        'QC_URL': QC_PATH,
+    }
+
+    if name in paths:
+        return get_api_url() + paths[name]
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 def get_refresh_token() -> RefreshToken:
@@ -0,0 +1,242 @@
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .decoding import decode_integer, decode_number
+from .interfaces import DataFile, DataFileHeaders, DataRecord
+from .utils import timestamp_to_epoch
+
+try:
+    import numpy as np
+    import pandas as pd
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
+CHUNK_SIZE = 10000
+
+QC_FLAG_SUFFIX = '_qc_flag'
+
+
+class _ColumnBuilder():
+    __slots__ = ('kind', 'chunks')
+
+    def __init__(self, kind: str) -> None:
+        self.kind = kind
+        self.chunks: List[Any] = []
+
+    def add(self, values: List[Any]) -> None:
+        if self.kind == 'float':
+            try:
+                self.chunks.append(np.array(
+                    [decode_number(value) for value in values],
+                    dtype=np.float64,
+                ))
+
+                return
+            except (TypeError, ValueError):
+                # Text in a numeric column, keep every value as is
+                self.kind = 'object'
+                self.chunks = [chunk.astype(object) for chunk in self.chunks]
+
+        if self.kind == 'timestamp':
+            self.chunks.append(np.array([
+                _to_datetime(value) for value in values
+            ], dtype='datetime64[s]'))
+
+        elif self.kind == 'integer':
+            self.chunks.append(pd.array([
+                _to_integer(value) for value in values
+            ], dtype='Int64'))
+
+        elif self.kind == 'object':
+            chunk = np.empty(len(values), dtype=object)
+            chunk[:] = values
+            self.chunks.append(chunk)
+
+    def pad(self, length: int) -> None:
+        # Fill rows added before the column was first seen
+        if length:
+            self.add([None] * length)
+
+    def build(self) -> Any:
+        if self.kind == 'integer':
+            return pd.concat(
+                [pd.Series(chunk, dtype='Int64') for chunk in self.chunks],
+                ignore_index=True,
+            ).array
+
+        return np.concatenate(self.chunks)
+
+
+class _FrameBuilder():
+    def __init__(
+        self,
+        columns: Optional[List[str]],
+        headers: Optional[DataFileHeaders],
+    ) -> None:
+        headers = headers or {'columns': [], 'units': []}
+
+        self.columns = columns
+        self.units = dict(zip(headers.get('columns') or [], headers.get('units') or []))
+        self.rows = 0
+        self.epochs: List[Any] = []
+        self.record_nums: List[Any] = []
+        self.data: Dict[str, _ColumnBuilder] = {}
+        self.qc_flags: Dict[str, _ColumnBuilder] = {}
+
+    def add(self, records: List[DataRecord]) -> None:
+        if self.columns is None:
+            self.columns = list(self.units) or list(records[0]['data'])
+
+        self.epochs.append(np.fromiter(
+            (timestamp_to_epoch(record['timestamp']) for record in records),
+            dtype=np.int64,
+            count=len(records),
+        ))
+
+        self.record_nums.append(np.fromiter(
+            (record['record_num'] for record in records),
+            dtype=np.int64,
+            count=len(records),
+        ))
+
+        for column in self.columns:
+            builder = self.data.get(column)
+
+            if builder is None:
+                builder = self.data[column] = _ColumnBuilder(self._get_kind(column))
+
+            builder.add([record['data'].get(column) for record in records])
+
+            if any(column in record.get('qc_flags', {}) for record in records):
+                if column not in self.qc_flags:
+                    self.qc_flags[column] = _ColumnBuilder('float')
+                    self.qc_flags[column].pad(self.rows)
+
+            qc_flags = self.qc_flags.get(column)
+
+            if qc_flags:
+                qc_flags.add([record.get('qc_flags', {}).get(column) for record in records])
+
+        self.rows += len(records)
+
+    def build(self) -> 'pd.DataFrame':
+        index = pd.DatetimeIndex(
+            np.concatenate(self.epochs).astype('datetime64[s]') if self.epochs else [],
+            name='timestamp',
+        )
+
+        frame: Dict[str, Any] = {
+            'record_num': np.concatenate(self.record_nums) if self.record_nums else [],
+        }
+
+        for column in self.columns or []:
+            builder = self.data.get(column)
+            frame[column] = builder.build() if builder else []
+
+            if column in self.qc_flags:
+                frame[column + QC_FLAG_SUFFIX] = self.qc_flags[column].build()
+
+        return pd.DataFrame(frame, index=index, copy=False)
+
+    def _get_kind(self, column: str) -> str:
+        units = self.units.get(column, '').upper()
+
+        if units == 'TS':
+            return 'timestamp'
+
+        if units == 'RN':
+            return 'integer'
+
+        return 'float'
+
+
+def records_to_frame(
+    records: Iterable[DataRecord],
+    headers: Optional[DataFileHeaders] = None,
+    *,
+    columns: Optional[List[str]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> 'pd.DataFrame':
+    if not HAS_PANDAS:
+        raise ImportError('pandas is required, install grndwork-api-client[pandas]')
+
+    builder = _FrameBuilder(columns, headers)
+    iterator = iter(records)
+
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+
+        if not chunk:
+            break
+
+        builder.add(chunk)
+
+    return builder.build()
+
+
+def data_file_to_frame(
+    data_file: DataFile,
+    *,
+    columns: Optional[List[str]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> 'pd.DataFrame':
+    return records_to_frame(
+        data_file.get('records', []),
+        data_file['headers'],
+        columns=columns,
+        chunk_size=chunk_size,
+    )
+
+
+def data_files_to_frames(
+    data_files: Iterable[DataFile],
+    *,
+    columns: Optional[List[str]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator['pd.DataFrame']:
+    for data_file in data_files:
+        frame = data_file_to_frame(data_file, columns=columns, chunk_size=chunk_size)
+        frame.attrs['filename'] = data_file['filename']
+        frame.attrs['source'] = data_file['source']
+
+        yield frame
+
+
+def data_files_to_frame(
+    data_files: Iterable[DataFile],
+    *,
+    columns: Optional[List[str]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> 'pd.DataFrame':
+    frames = list(data_files_to_frames(data_files, columns=columns, chunk_size=chunk_size))
+
+    if not frames:
+        return pd.DataFrame(
+            index=pd.MultiIndex.from_arrays([[], []], names=['filename', 'timestamp']),
+        )
+
+    return pd.concat(
+        frames,
+        keys=[frame.attrs['filename'] for frame in frames],
+        names=['filename', 'timestamp'],
+    )
+
+
+def _to_datetime(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return np.datetime64(timestamp_to_epoch(value), 's')
+        except ValueError:
+            pass
+
+    return np.datetime64('NaT')
+
+
+def _to_integer(value: Any) -> Optional[int]:
+    value = decode_integer(value)
+
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+
+    return None
@@ -0,0 +1,115 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from .interfaces import DataFileHeaders, DataRecord, DataValue, QCValue
+from .utils import parse_timestamp, timestamp_to_epoch
+
+Decoder = Callable[[DataValue], Any]
+
+
+class DecodedRecord():
+    __slots__ = ('record', '_decoders', '_values')
+
+    def __init__(
+        self,
+        record: DataRecord,
+        decoders: Optional[Dict[str, Decoder]] = None,
+    ) -> None:
+        self.record = record
+        self._decoders = decoders or {}
+        self._values: Optional[Dict[str, Any]] = None
+
+    def __repr__(self) -> str:
+        return f'DecodedRecord({self.record!r})'
+
+    @property
+    def timestamp(self) -> str:
+        return self.record['timestamp']
+
+    @property
+    def record_num(self) -> int:
+        return self.record['record_num']
+
+    @property
+    def datetime(self) -> datetime:
+        return parse_timestamp(self.record['timestamp'])
+
+    @property
+    def epoch(self) -> int:
+        return timestamp_to_epoch(self.record['timestamp'])
+
+    @property
+    def data(self) -> Dict[str, DataValue]:
+        return self.record['data']
+
+    @property
+    def qc_flags(self) -> Dict[str, QCValue]:
+        return self.record.get('qc_flags', {})
+
+    @property
+    def values(self) -> Dict[str, Any]:
+        # Data values coerced to the type given by the column units
+        if self._values is None:
+            self._values = {
+                column: self._decoders.get(column, decode_number)(value)
+                for column, value in self.record['data'].items()
+            }
+
+        return self._values
+
+
+def decode_records(
+    records: Iterable[DataRecord],
+    headers: Optional[DataFileHeaders] = None,
+) -> Iterator[DecodedRecord]:
+    decoders = get_decoders(headers) if headers else {}
+
+    for record in records:
+        yield DecodedRecord(record, decoders)
+
+
+def get_decoders(headers: DataFileHeaders) -> Dict[str, Decoder]:
+    return {
+        column: DECODERS_BY_UNITS.get(units.upper(), decode_number)
+        for column, units in zip(headers.get('columns') or [], headers.get('units') or [])
+    }
+
+
+def decode_number(value: DataValue) -> Any:
+    # Loggers report missing values as strings such as NAN and INF
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+    return value
+
+
+def decode_integer(value: DataValue) -> Any:
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return value
+
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+
+    return value
+
+
+def decode_timestamp(value: DataValue) -> Any:
+    if isinstance(value, str):
+        try:
+            return parse_timestamp(value)
+        except ValueError:
+            return value
+
+    return value
+
+
+DECODERS_BY_UNITS: Dict[str, Decoder] = {
+    'TS': decode_timestamp,
+    'RN': decode_integer,
+}
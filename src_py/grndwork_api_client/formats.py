@@ -0,0 +1,232 @@
+import csv
+import json
+import math
+import os
+from typing import Any, Iterable, Iterator, List, Optional, Protocol, TextIO, Tuple
+
+from .interfaces import DataFile, DataFileHeaders, DataRecord, DataValue, PostDataRecord
+
+FORMATS = ['ndjson', 'csv', 'toa5']
+
+# Meta keys holding the fields of the TOA5 environment line
+TOA5_META_KEYS = [
+    'station_name',
+    'logger_model',
+    'logger_serial',
+    'logger_os',
+    'program_name',
+    'program_signature',
+    'table_name',
+]
+
+# Filename, headers and record read from a file
+ReadRecord = Tuple[str, Optional[DataFileHeaders], PostDataRecord]
+
+
+class Writer(Protocol):
+    def write(self, text: str) -> Any:
+        ...
+
+
+def get_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+
+    if extension == '.csv':
+        return 'csv'
+
+    return 'toa5'
+
+
+def get_output_filename(filename: str, file_format: str) -> str:
+    if file_format == 'toa5':
+        return filename
+
+    return f'{filename}.{file_format}'
+
+
+def get_columns(data_file: DataFile, columns: Optional[List[str]] = None) -> List[str]:
+    if columns:
+        return columns
+
+    return data_file['headers'].get('columns') or list(dict.fromkeys(
+        column for record in data_file.get('records', []) for column in record['data']
+    ))
+
+
+def write_header(
+    f: Writer,
+    file_format: str,
+    data_file: DataFile,
+    columns: List[str],
+    *,
+    include_qc_flags: bool = True,
+) -> None:
+    if file_format == 'csv':
+        csv.writer(f).writerow([
+            'TIMESTAMP',
+            'RECORD',
+            *columns,
+            *([f'{column}_qc_flag' for column in columns] if include_qc_flags else []),
+        ])
+
+    elif file_format == 'toa5':
+        headers = data_file['headers']
+        meta = headers.get('meta') or {}
+        units = dict(zip(headers.get('columns', []), headers.get('units', [])))
+        processing = dict(zip(headers.get('columns', []), headers.get('processing', [])))
+
+        environment = [meta.get(key, '') for key in TOA5_META_KEYS]
+
+        if not environment[0]:
+            environment[0] = data_file['source'].split(':', 1)[-1]
+
+        if not environment[-1]:
+            environment[-1] = os.path.splitext(data_file['filename'])[0]
+
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator='\r\n')
+        writer.writerow(['TOA5', *environment])
+        writer.writerow(['TIMESTAMP', 'RECORD', *columns])
+        writer.writerow(['TS', 'RN', *[units.get(column, '') for column in columns]])
+        writer.writerow(['', '', *[processing.get(column, '') for column in columns]])
+
+
+def write_records(
+    f: Writer,
+    file_format: str,
+    data_file: DataFile,
+    columns: List[str],
+    records: Iterable[DataRecord],
+    *,
+    include_qc_flags: bool = True,
+) -> int:
+    count = 0
+
+    if file_format == 'ndjson':
+        for record in records:
+            f.write(json.dumps({
+                'filename': data_file['filename'],
+                'source': data_file['source'],
+                **record,
+            }) + '\n')
+
+            count += 1
+
+    elif file_format == 'csv':
+        writer = csv.writer(f)
+
+        for record in records:
+            data = record['data']
+            qc_flags = record.get('qc_flags') or {}
+
+            writer.writerow([
+                record['timestamp'],
+                record['record_num'],
+                *[data.get(column) for column in columns],
+                *([qc_flags.get(column) for column in columns] if include_qc_flags else []),
+            ])
+
+            count += 1
+
+    else:
+        for record in records:
+            data = record['data']
+
+            f.write(','.join([
+                f'"{record["timestamp"]}"',
+                str(record['record_num']),
+                *[_format_toa5_value(data.get(column)) for column in columns],
+            ]) + '\r\n')
+
+            count += 1
+
+    return count
+
+
+def read_records(f: TextIO, file_format: str, filename: str) -> Iterator[ReadRecord]:
+    if file_format == 'ndjson':
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+
+                yield (record.get('filename') or filename, None, {
+                    'timestamp': record['timestamp'],
+                    'record_num': record['record_num'],
+                    'data': record['data'],
+                })
+
+    elif file_format == 'csv':
+        reader = csv.reader(f)
+        (_, _, *columns) = next(reader)
+
+        # Exported qc flags can not be uploaded
+        columns = [column for column in columns if not column.endswith('_qc_flag')]
+
+        for (timestamp, record_num, *values) in reader:
+            yield (filename, None, {
+                'timestamp': timestamp,
+                'record_num': int(record_num),
+                'data': {
+                    column: _parse_value(value)
+                    for column, value in zip(columns, values)
+                },
+            })
+
+    else:
+        reader = csv.reader(f)
+        (_, *environment) = next(reader)
+        (_, _, *columns) = next(reader)
+        (_, _, *units) = next(reader)
+        (_, _, *processing) = next(reader)
+
+        headers: DataFileHeaders = {
+            'columns': columns,
+            'units': units,
+            'processing': processing,
+            'meta': {
+                key: value for key, value in zip(TOA5_META_KEYS, environment) if value
+            },
+        }
+
+        for (timestamp, record_num, *values) in reader:
+            yield (filename, headers, {
+                'timestamp': timestamp,
+                'record_num': int(record_num),
+                'data': {
+                    column: _parse_value(value)
+                    for column, value in zip(columns, values)
+                },
+            })
+
+
+def _format_toa5_value(value: DataValue) -> str:
+    if value is None:
+        return '"NAN"'
+
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+
+    if isinstance(value, bool):
+        return str(int(value))
+
+    return str(value)
+
+
+def _parse_value(value: str) -> Any:
+    if value == '':
+        return None
+
+    try:
+        return int(value)
+    except ValueError:
+        pass
+
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+
+    # Missing values such as NAN are kept as reported by the logger
+    return number if math.isfinite(number) else value
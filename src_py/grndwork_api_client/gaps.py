@@ -0,0 +1,212 @@
+from bisect import bisect_right, insort
+from dataclasses import asdict, dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from .checkpoints import CheckpointStore
+from .client import Client
+from .config import MAX_POST_RECORDS
+from .interfaces import DataRecord, PostDataRecord
+
+
+@dataclass(frozen=True, order=True)
+class Gap:
+    first_record_num: int
+    last_record_num: int
+    after: str
+    before: str
+
+    @property
+    def size(self) -> int:
+        return self.last_record_num - self.first_record_num + 1
+
+
+class GapIndex():
+    def __init__(self, gaps: Iterable[Gap] = ()) -> None:
+        self._gaps: List[Gap] = sorted(gaps)
+
+    def __iter__(self) -> Iterator[Gap]:
+        return iter(self._gaps)
+
+    def __len__(self) -> int:
+        return len(self._gaps)
+
+    @property
+    def missing_records(self) -> int:
+        return sum(gap.size for gap in self._gaps)
+
+    def add(self, gap: Gap) -> None:
+        insort(self._gaps, gap)
+
+    def find(self, record_num: int) -> Optional[Gap]:
+        index = bisect_right(self._gaps, (record_num,), key=lambda gap: (gap.first_record_num,))
+
+        if index:
+            gap = self._gaps[index - 1]
+
+            if gap.first_record_num <= record_num <= gap.last_record_num:
+                return gap
+
+        return None
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [asdict(gap) for gap in self._gaps]
+
+    @classmethod
+    def from_list(cls, gaps: Iterable[Dict[str, Any]]) -> 'GapIndex':
+        return cls(Gap(**gap) for gap in gaps)
+
+
+def find_gaps(
+    records: Iterable[DataRecord],
+    *,
+    index: Optional[GapIndex] = None,
+    previous: Optional[DataRecord] = None,
+) -> GapIndex:
+    # Records are expected in reverse chronological order, as returned by the API
+    index = index if index is not None else GapIndex()
+
+    for record in records:
+        _add_gap(index, previous, record)
+        previous = record
+
+    return index
+
+
+def _add_gap(
+    index: GapIndex,
+    newer: Optional[Mapping[str, Any]],
+    older: Mapping[str, Any],
+) -> None:
+    # A lower record number on the newer record means the logger was reset
+    if newer and newer['record_num'] - older['record_num'] > 1:
+        index.add(Gap(
+            first_record_num=older['record_num'] + 1,
+            last_record_num=newer['record_num'] - 1,
+            after=older['timestamp'],
+            before=newer['timestamp'],
+        ))
+
+
+def scan_gaps(
+    client: Client,
+    filename: str,
+    *,
+    records_after: Optional[str] = None,
+    records_before: Optional[str] = None,
+    checkpoint: Optional[CheckpointStore] = None,
+    checkpoint_key: Optional[str] = None,
+    checkpoint_interval: int = 10000,
+) -> GapIndex:
+    key = checkpoint_key or f'gaps:{filename}:{records_after or ""}:{records_before or ""}'
+    state = checkpoint.load(key) if checkpoint else None
+
+    index = GapIndex.from_list(state['gaps']) if state else GapIndex()
+    previous: Optional[Dict[str, Any]] = state['previous'] if state else None
+
+    if state and state.get('complete'):
+        return index
+
+    records = client.get_records(
+        filename,
+        records_after=records_after,
+        records_before=previous['timestamp'] if previous else records_before,
+        include_qc_flags=False,
+    )
+
+    def save(complete: bool) -> None:
+        if checkpoint:
+            checkpoint.save(key, {
+                'gaps': index.to_list(),
+                'previous': previous,
+                'complete': complete,
+            })
+
+    for count, record in enumerate(records, start=1):
+        if previous and record['record_num'] == previous['record_num']:
+            # Boundary record from where the previous scan stopped
+            continue
+
+        _add_gap(index, previous, record)
+        previous = {
+            'timestamp': record['timestamp'],
+            'record_num': record['record_num'],
+        }
+
+        if count % checkpoint_interval == 0:
+            save(complete=False)
+
+    save(complete=True)
+
+    return index
+
+
+def fetch_gaps(
+    client: Client,
+    filename: str,
+    gaps: Iterable[Gap],
+) -> Iterator[Tuple[Gap, List[DataRecord]]]:
+    # Request only the records within each gap, to patch a local copy of a file
+    for gap in gaps:
+        records = [
+            record for record in client.get_records(
+                filename,
+                records_after=gap.after,
+                records_before=gap.before,
+                include_qc_flags=False,
+            ) if gap.first_record_num <= record['record_num'] <= gap.last_record_num
+        ]
+
+        yield gap, records
+
+
+def backfill_gaps(
+    client: Client,
+    filename: str,
+    gaps: Iterable[Gap],
+    *,
+    source: str,
+    get_records: Callable[[Gap], Iterable[PostDataRecord]],
+    checkpoint: Optional[CheckpointStore] = None,
+    checkpoint_key: Optional[str] = None,
+) -> int:
+    # Re-post records for each gap from another source, such as the logger itself
+    key = checkpoint_key or f'backfill:{filename}'
+    state = checkpoint.load(key) if checkpoint else None
+    completed = set(state['completed'] if state else [])
+    posted = 0
+
+    for gap in gaps:
+        if gap.first_record_num in completed:
+            continue
+
+        records = [
+            record for record in get_records(gap)
+            if gap.first_record_num <= record['record_num'] <= gap.last_record_num
+        ]
+
+        for start in range(0, len(records), MAX_POST_RECORDS):
+            client.post_data({
+                'source': source,
+                'files': [{
+                    'filename': filename,
+                    'records': records[start:start + MAX_POST_RECORDS],
+                }],
+            })
+
+        posted += len(records)
+        completed.add(gap.first_record_num)
+
+        if checkpoint:
+            checkpoint.save(key, {'completed': sorted(completed)})
+
+    return posted
@@ -0,0 +1,142 @@
+from collections import deque
+from queue import Empty, Queue
+from threading import Lock, Thread
+import time
+from typing import Any, Callable, cast, Deque, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+Outcome = Tuple[Any, Optional[BaseException]]
+
+
+class RequestHedger():
+    def __init__(
+        self,
+        *,
+        percentile: float = 95,
+        window: int = 200,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        budget: float = 0.1,
+    ) -> None:
+        if not 0 < percentile <= 100:
+            raise ValueError('Percentile must be between 0 and 100')
+
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.budget = budget
+
+        self._lock = Lock()
+        self._latencies: Deque[float] = deque(maxlen=window)
+
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def get_delay(self) -> Optional[float]:
+        # Hedge once a request takes longer than the tracked percentile of recent latencies
+        with self._lock:
+            if len(self._latencies) < max(self.min_samples, 1):
+                return None
+
+            latencies = sorted(self._latencies)
+
+        index = min(int(len(latencies) * self.percentile / 100), len(latencies) - 1)
+
+        return max(latencies[index], self.min_delay)
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._latencies.clear()
+            self.requests = 0
+            self.hedges = 0
+            self.hedge_wins = 0
+
+    def do(
+        self,
+        fn: Callable[[], T],
+        *,
+        discard: Optional[Callable[[T], None]] = None,
+    ) -> T:
+        delay = self.get_delay()
+
+        with self._lock:
+            self.requests += 1
+
+        if delay is None:
+            # Not enough samples to pick a delay yet, send a single request
+            start = time.monotonic()
+            result = fn()
+            self.record(time.monotonic() - start)
+
+            return result
+
+        outcomes: Queue[Outcome] = Queue()
+        state = {'settled': False}
+
+        def attempt(is_hedge: bool) -> None:
+            start = time.monotonic()
+
+            try:
+                result = fn()
+            except BaseException as err:  # noqa: B036
+                # Every error, including interrupts, is raised by the caller, which would
+                # otherwise wait forever for an outcome
+                outcomes.put((None, err))
+                return
+
+            self.record(time.monotonic() - start)
+
+            with self._lock:
+                is_winner = not state['settled']
+                state['settled'] = True
+
+                if is_winner and is_hedge:
+                    self.hedge_wins += 1
+
+            if is_winner:
+                outcomes.put((result, None))
+            elif discard:
+                # The other request answered first, release this response
+                discard(result)
+
+        Thread(target=attempt, args=(False,), daemon=True).start()
+        pending = 1
+
+        try:
+            outcome = outcomes.get(timeout=delay)
+        except Empty:
+            if self._acquire_hedge():
+                Thread(target=attempt, args=(True,), daemon=True).start()
+                pending += 1
+
+            outcome = outcomes.get()
+
+        pending -= 1
+
+        # A failed request is only reported once no other request can still answer
+        while outcome[1] is not None and pending:
+            outcome = outcomes.get()
+            pending -= 1
+
+        result, err = outcome
+
+        if err is not None:
+            raise err
+
+        return cast(T, result)
+
+    def _acquire_hedge(self) -> bool:
+        # Hedged requests are capped at a fraction of all requests
+        with self._lock:
+            if self.hedges + 1 > self.budget * self.requests:
+                return False
+
+            self.hedges += 1
+
+            return True
@@ -50,6 +50,29 @@ class DataFile(_DataFileRequired, total=False):
     records: List[DataRecord]
 
 
+class AggregatedValue(TypedDict):
+    min: Optional[float]  # noqa: A003
+    max: Optional[float]  # noqa: A003
+    mean: Optional[float]
+    last: Optional[float]
+    count: int
+
+
+class AggregatedRecord(TypedDict):
+    timestamp: str
+    count: int
+    data: Dict[str, AggregatedValue]
+
+
+class AggregatedDataFile(TypedDict):
+    source: str
+    filename: str
+    is_stale: bool
+    headers: DataFileHeaders
+    interval: int
+    records: List[AggregatedRecord]
+
+
 class StationDataFile(TypedDict):
     filename: str
     is_stale: bool
@@ -104,6 +127,7 @@ class GetQCQuery(_GetQCQueryRequired, total=False):
     before: str
     after: str
     limit: int
+    offset: int
 
 
 class PostDataRecord(TypedDict):
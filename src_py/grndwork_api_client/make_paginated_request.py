@@ -1,7 +1,8 @@
-from typing import Any, Iterator, MutableMapping, Optional
+from typing import Any, Callable, MutableMapping, Optional
 
-from .content_range import ContentRange
-from .make_request import make_request
+from .hedging import RequestHedger
+from .paginated_iterator import PaginatedIterator
+from .response_cache import ResponseCache
 
 
 def make_paginated_request(
@@ -11,41 +12,19 @@ def make_paginated_request(
     headers: Optional[MutableMapping[str, Any]] = None,
     query: Any = None,
     page_size: int,
-) -> Iterator[Any]:
-    headers = headers or {}
-    query = query or {}
-    limit = query.get('limit')
-    offset = query.get('offset') or 0
-
-    while True:
-        results, resp = make_request(
-            url=url,
-            token=token,
-            headers=headers,
-            query={
-                **query,
-                'limit': min(limit, page_size) if limit else page_size,
-                'offset': offset,
-            },
-        )
-
-        if results:
-            yield from results
-        else:
-            break
-
-        if limit:
-            limit -= len(results)
-
-            if limit <= 0:
-                break
-
-        content_range = ContentRange.parse(resp.headers.get('Content-Range') or '')
-
-        if offset < content_range.last:
-            offset = content_range.last
-
-            if offset >= content_range.count:
-                break
-        else:
-            raise ValueError('Invalid content range')
+    cache: Optional[ResponseCache] = None,
+    hedge: Optional[RequestHedger] = None,
+    transform: Optional[Callable[[Any], Any]] = None,
+    prefetch: bool = False,
+) -> PaginatedIterator[Any]:
+    return PaginatedIterator(
+        url,
+        token=token,
+        headers=headers,
+        query=query,
+        page_size=page_size,
+        cache=cache,
+        hedge=hedge,
+        transform=transform,
+        prefetch=prefetch,
+    )
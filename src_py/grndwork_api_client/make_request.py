@@ -1,8 +1,17 @@
-from http.client import responses as status_codes
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from functools import partial
 import json
-from typing import Any, List, MutableMapping, Optional, Tuple
+from threading import Lock
+from typing import Any, List, MutableMapping, Optional, Tuple, TYPE_CHECKING
 
-import requests
+from .hedging import RequestHedger
+from .response_cache import CachedResponse, get_expires, is_cacheable, ResponseCache
+from .single_flight import SingleFlight
+
+if TYPE_CHECKING:  # Requests is imported on first use to keep importing this package fast
+    import requests
+    from requests.adapters import BaseAdapter
 
 
 class RequestError(Exception):
@@ -11,6 +20,56 @@ class RequestError(Exception):
         self.errors = errors or []
 
 
+# Identical requests made concurrently share a single response,
+# hits and misses are counted on this instance
+coalesced_requests = SingleFlight()
+
+# Connections are kept open and reused across requests and clients
+POOL_MAXSIZE = 32
+
+_session: Optional['requests.Session'] = None
+_session_lock = Lock()
+
+
+def get_session() -> 'requests.Session':
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_maxsize=POOL_MAXSIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+
+    return _session
+
+
+def mount_adapter(adapter: 'BaseAdapter') -> None:
+    # Replaces the transport used for every request, such as a recording or replay adapter
+    session = get_session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+
+def open_connections(url: str, count: int) -> None:
+    from requests import RequestException
+
+    # Concurrent requests each open a connection, which is kept in the pool afterwards
+    def open_connection(_: int) -> None:
+        try:
+            get_session().head(url)
+        except RequestException:
+            pass
+
+    with ThreadPoolExecutor(max_workers=min(count, POOL_MAXSIZE) or 1) as executor:
+        list(executor.map(open_connection, range(count)))
+
+
 def make_request(
     url: str,
     *,
@@ -19,8 +78,12 @@ def make_request(
     headers: Optional[MutableMapping[str, Any]] = None,
     query: Any = None,
     body: Any = None,
-) -> Tuple[Any, requests.Response]:
-    headers = headers or {}
+    coalesce: Optional[bool] = None,
+    cache: Optional[ResponseCache] = None,
+    hedge: Optional[RequestHedger] = None,
+) -> Tuple[Any, 'requests.Response']:
+    # Headers are copied, so a dict shared between threads or pages is never modified
+    headers = dict(headers or {})
     query = query or {}
 
     if token:
@@ -29,17 +92,142 @@ def make_request(
     if body:
         headers['Content-Type'] = 'application/json'
 
-    resp = requests.request(
+    if method != 'GET':
+        # Only idempotent requests are safe to send twice
+        hedge = None
+
+    def send_request() -> Tuple[Any, 'requests.Response']:
+        if cache is not None and method == 'GET':
+            return _send_cached_request(
+                url=url,
+                token=token,
+                headers=headers,
+                query=query,
+                cache=cache,
+                hedge=hedge,
+            )
+
+        return _send_request(
+            url=url,
+            method=method,
+            headers=headers,
+            query=query,
+            body=body,
+            hedge=hedge,
+        )
+
+    if coalesce is None:
+        coalesce = method == 'GET'
+
+    if coalesce:
+        return coalesced_requests.do(
+            json.dumps([method, url, headers, query, body], sort_keys=True, default=str),
+            send_request,
+            share=deepcopy,
+        )
+
+    return send_request()
+
+
+def _send_cached_request(
+    url: str,
+    *,
+    token: str,
+    headers: MutableMapping[str, Any],
+    query: Any,
+    cache: ResponseCache,
+    hedge: Optional[RequestHedger] = None,
+) -> Tuple[Any, 'requests.Response']:
+    key = cache.get_key(url, query, token)
+    entry = cache.get(key)
+
+    # Cached payloads are copied, so callers changing results do not change the cache
+    if entry:
+        if entry.is_fresh:
+            return deepcopy(entry.payload), entry.to_response()
+
+        headers = dict(headers)
+
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+
+    resp = _request(
+        url=url,
+        method='GET',
+        headers=headers,
+        params=query,
+        data=json.dumps(None),
+        hedge=hedge,
+    )
+
+    if entry and resp.status_code == 304:
+        # Not modified, reuse the decoded payload without reading a body
+        entry = entry.revalidated(resp.headers)
+        cache.set(key, entry)
+
+        return deepcopy(entry.payload), entry.to_response()
+
+    payload = _parse_response(resp)
+
+    if is_cacheable(resp):
+        cache.set(key, CachedResponse(
+            url=url,
+            headers=dict(resp.headers),
+            content=resp.content,
+            payload=deepcopy(payload),
+            expires=get_expires(resp.headers.get('Cache-Control') or ''),
+        ))
+
+    return payload, resp
+
+
+def _send_request(
+    url: str,
+    *,
+    method: str,
+    headers: MutableMapping[str, Any],
+    query: Any,
+    body: Any,
+    hedge: Optional[RequestHedger] = None,
+) -> Tuple[Any, 'requests.Response']:
+    resp = _request(
         url=url,
         method=method,
         headers=headers,
         params=query,
         data=json.dumps(body),
+        hedge=hedge,
+    )
+
+    return _parse_response(resp), resp
+
+
+def _request(
+    *,
+    hedge: Optional[RequestHedger],
+    **kwargs: Any,
+) -> 'requests.Response':
+    if hedge is None:
+        return get_session().request(**kwargs)
+
+    # Streamed responses return once headers arrive, the body is only read for the winner
+    return hedge.do(
+        partial(get_session().request, stream=True, **kwargs),
+        discard=lambda resp: resp.close(),
     )
 
+
+def _parse_response(resp: 'requests.Response') -> Any:
+    from http.client import responses as status_codes
+
+    from requests import RequestException
+
     try:
         payload = resp.json()
-    except requests.RequestException:
+    except RequestException:
         raise RequestError('Failed to parse response payload')
 
     if resp.status_code >= 400:
@@ -48,4 +236,4 @@ def make_request(
             errors=payload.get('errors'),
         )
 
-    return payload, resp
+    return payload
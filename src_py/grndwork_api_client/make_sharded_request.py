@@ -0,0 +1,213 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from .hedging import RequestHedger
+from .make_paginated_request import make_paginated_request
+from .make_request import make_request
+from .paginated_iterator import PaginatedIterator
+from .response_cache import ResponseCache
+from .utils import format_timestamp, parse_timestamp
+
+MAX_RECORDS_LIMIT = 1500
+
+# Aim for shards that come back below the records limit so most of them
+# do not have to be re-requested for their remainder.
+SHARD_FILL_RATIO = 0.8
+
+
+@dataclass
+class Shard:
+    after: datetime
+    before: datetime
+
+    @property
+    def seconds(self) -> float:
+        return (self.before - self.after).total_seconds()
+
+
+def make_sharded_request(
+    url: str,
+    *,
+    token: str,
+    query: Any,
+    page_size: int,
+    max_workers: int,
+    shard_records_limit: int = MAX_RECORDS_LIMIT,
+    cache: Optional[ResponseCache] = None,
+    hedge: Optional[RequestHedger] = None,
+    transform: Optional[Callable[[Any], Any]] = None,
+    prefetch: bool = False,
+) -> PaginatedIterator[Any]:
+    records_after = query.get('records_after')
+    records_before = query.get('records_before')
+
+    if not records_after or not records_before:
+        raise ValueError('Sharded requests require records_after and records_before')
+
+    files_query = {
+        key: value for key, value in query.items() if not key.startswith('records_')
+    }
+
+    def request_records(data_file: Any) -> Any:
+        records = _request_sharded_records(
+            url,
+            token=token,
+            filename=data_file['filename'],
+            records_after=parse_timestamp(records_after),
+            records_before=parse_timestamp(records_before),
+            records_limit=query.get('records_limit'),
+            shard_records_limit=shard_records_limit,
+            max_workers=max_workers,
+            cache=cache,
+            hedge=hedge,
+        )
+
+        data_file = {
+            **data_file,
+            'records': records,
+        }
+
+        return transform(data_file) if transform else data_file
+
+    return make_paginated_request(
+        url=url,
+        token=token,
+        query=files_query,
+        page_size=page_size,
+        cache=cache,
+        hedge=hedge,
+        transform=request_records,
+        prefetch=prefetch,
+    )
+
+
+def _request_sharded_records(
+    url: str,
+    *,
+    token: str,
+    filename: str,
+    records_after: datetime,
+    records_before: datetime,
+    records_limit: Optional[int],
+    shard_records_limit: int,
+    max_workers: int,
+    cache: Optional[ResponseCache],
+    hedge: Optional[RequestHedger],
+) -> List[Any]:
+    def request_shard(shard: Shard) -> List[Any]:
+        results, _ = make_request(
+            url=url,
+            token=token,
+            query={
+                'filename': filename,
+                'limit': 1,
+                'records_after': format_timestamp(shard.after),
+                'records_before': format_timestamp(shard.before),
+                'records_limit': shard_records_limit,
+            },
+            cache=cache,
+            hedge=hedge,
+        )
+
+        return results[0].get('records', []) if results else []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        records_by_num = _request_shards(
+            request_shard,
+            executor=executor,
+            window=Shard(after=records_after, before=records_before),
+            records_limit=records_limit,
+            shard_records_limit=shard_records_limit,
+            max_workers=max_workers,
+        )
+
+    records = sorted(
+        records_by_num.values(),
+        key=lambda record: record['timestamp'],
+        reverse=True,
+    )
+
+    if records_limit:
+        records = records[:records_limit]
+
+    return records
+
+
+def _request_shards(
+    request_shard: Callable[[Shard], List[Any]],
+    *,
+    executor: ThreadPoolExecutor,
+    window: Shard,
+    records_limit: Optional[int],
+    shard_records_limit: int,
+    max_workers: int,
+) -> Dict[int, Any]:
+    # Windows still to be requested, newest first
+    pending = [window]
+    running: Dict['Future[List[Any]]', Shard] = {}
+    records_by_num: Dict[int, Any] = {}
+
+    default_seconds = max(window.seconds / max_workers, 1)
+    covered_seconds = 0.0
+    covered_records = 0
+
+    while pending or running:
+        while pending and len(running) < max_workers:
+            if covered_seconds and covered_records:
+                density = covered_records / covered_seconds
+                shard_seconds = max(shard_records_limit * SHARD_FILL_RATIO / density, 1)
+            else:
+                shard_seconds = default_seconds
+
+            window = pending[0]
+
+            if window.seconds <= shard_seconds:
+                shard = pending.pop(0)
+            else:
+                shard = Shard(
+                    after=window.before - timedelta(seconds=int(shard_seconds)),
+                    before=window.before,
+                )
+                window.before = shard.after
+
+            running[executor.submit(request_shard, shard)] = shard
+
+        finished, _ = wait(running, return_when=FIRST_COMPLETED)
+
+        for future in finished:
+            shard = running.pop(future)
+            records = future.result()
+
+            for record in records:
+                records_by_num.setdefault(record['record_num'], record)
+
+            if records and len(records) >= shard_records_limit:
+                oldest = parse_timestamp(min(record['timestamp'] for record in records))
+
+                if shard.after < oldest < shard.before:
+                    pending.append(Shard(after=shard.after, before=oldest))
+                    pending.sort(key=lambda window: window.before, reverse=True)
+
+                    covered_seconds += (shard.before - oldest).total_seconds()
+                    covered_records += len(records)
+                    continue
+
+            covered_seconds += shard.seconds
+            covered_records += len(records)
+
+        if records_limit and pending:
+            # Everything newer than the newest open window has been fetched
+            open_before = format_timestamp(max(
+                window.before for window in [*pending, *running.values()]
+            ))
+
+            complete_records = sum(
+                1 for record in records_by_num.values() if record['timestamp'] > open_before
+            )
+
+            if complete_records >= records_limit:
+                pending.clear()
+
+    return records_by_num
@@ -0,0 +1,80 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Optional, Set, Tuple
+
+from .hedging import RequestHedger
+from .make_request import make_request
+from .response_cache import ResponseCache
+
+Transform = Callable[[List[Any]], List[Any]]
+
+
+def make_windowed_request(
+    url: str,
+    *,
+    token: str,
+    filename: str,
+    records_after: Optional[str] = None,
+    records_before: Optional[str] = None,
+    window_size: int,
+    transform: Optional[Transform] = None,
+    cache: Optional[ResponseCache] = None,
+    hedge: Optional[RequestHedger] = None,
+) -> Iterator[List[Any]]:
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        def request_window(before: Optional[str]) -> Tuple[List[Any], List[Any]]:
+            query = {
+                'filename': filename,
+                'limit': 1,
+                'records_limit': window_size,
+            }
+
+            if records_after:
+                query['records_after'] = records_after
+
+            if before:
+                query['records_before'] = before
+
+            results, _ = make_request(
+                url=url,
+                token=token,
+                query=query,
+                cache=cache,
+                hedge=hedge,
+            )
+
+            records = results[0].get('records', []) if results else []
+
+            return records, transform(records) if transform and records else records
+
+        future: Optional[Future[Tuple[List[Any], List[Any]]]] = executor.submit(
+            request_window,
+            records_before,
+        )
+
+        before = records_before
+        boundary: Set[int] = set()
+
+        while future:
+            records, window = future.result()
+            future = None
+
+            if len(records) >= window_size:
+                oldest = records[-1]['timestamp']
+
+                if before and oldest >= before:
+                    raise ValueError('Records window did not advance')
+
+                before = oldest
+
+                # Start fetching the next window while this one is consumed
+                future = executor.submit(request_window, before)
+
+            if boundary:
+                window = [record for record in window if record['record_num'] not in boundary]
+
+            boundary = {
+                record['record_num'] for record in records if record['timestamp'] == before
+            }
+
+            if window:
+                yield window
@@ -0,0 +1,217 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Deque,
+    Generic,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+    TypeVar,
+)
+
+from .checkpoints import Checkpoint
+from .content_range import ContentRange
+from .hedging import RequestHedger
+from .make_request import make_request
+from .response_cache import ResponseCache
+
+if TYPE_CHECKING:
+    import requests
+
+T = TypeVar('T')
+
+Page = Tuple[List[Any], 'requests.Response']
+
+
+class PaginatedIterator(Generic[T]):
+    def __init__(
+        self,
+        url: str,
+        *,
+        token: str,
+        headers: Optional[MutableMapping[str, Any]] = None,
+        query: Any = None,
+        page_size: int,
+        cache: Optional[ResponseCache] = None,
+        hedge: Optional[RequestHedger] = None,
+        transform: Optional[Callable[[Any], T]] = None,
+        prefetch: bool = False,
+    ) -> None:
+        query = dict(query or {})
+        limit = query.pop('limit', None)
+        offset = query.pop('offset', None) or 0
+
+        self.url = url
+        self.token = token
+        self.headers = headers or {}
+        self.query = query
+        self.page_size = page_size
+        self.cache = cache
+        self.hedge = hedge
+        self.transform = transform
+
+        self.count: Optional[int] = None
+        self.items_fetched = 0
+        self.pages_fetched = 0
+        self.bytes_read = 0
+
+        self._offset = offset
+        self._end = offset + limit if limit else None
+        self._items: Deque[Any] = deque()
+        self._done = False
+        self._future: Optional[Future[Page]] = None
+        self._executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        self._checkpoint: Optional[Checkpoint] = None
+        self._returned: Optional[T] = None
+
+    @property
+    def offset(self) -> int:
+        # Offset of the next item to be returned
+        return self._offset - len(self._items)
+
+    def __iter__(self) -> 'PaginatedIterator[T]':
+        return self
+
+    def __next__(self) -> T:
+        if self._checkpoint and self._returned is not None:
+            # The previous item counts as processed once the next one is requested
+            self._checkpoint.advance(self.offset, self._returned)
+            self._returned = None
+
+        while not self._items:
+            if self._done:
+                if self._checkpoint and not self._checkpoint.complete:
+                    self._checkpoint.finish(self.offset)
+
+                raise StopIteration
+
+            self._load_page()
+
+        item = self._items.popleft()
+
+        if self.transform:
+            item = self.transform(item)
+
+        if self._checkpoint:
+            self._returned = item
+
+        return cast(T, item)
+
+    def __enter__(self) -> 'PaginatedIterator[T]':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def seek(self, offset: int) -> None:
+        self._cancel_prefetch()
+        self._items.clear()
+        self._offset = offset
+        self._done = self._is_complete(offset)
+
+    def resume_from(self, checkpoint: Checkpoint) -> None:
+        self._checkpoint = checkpoint
+        self.seek(checkpoint.offset)
+
+        if checkpoint.complete:
+            self._done = True
+
+    def close(self) -> None:
+        if self._checkpoint and not self._checkpoint.complete:
+            self._checkpoint.save()
+
+        self._cancel_prefetch()
+        self._items.clear()
+        self._done = True
+
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _is_complete(self, offset: int) -> bool:
+        if self._end is not None and offset >= self._end:
+            return True
+
+        if self.count is not None and offset >= self.count:
+            return True
+
+        return False
+
+    def _cancel_prefetch(self) -> None:
+        if self._future:
+            self._future.cancel()
+            self._future = None
+
+    def _request_page(self, offset: int) -> Page:
+        limit = min(self._end - offset, self.page_size) if self._end else self.page_size
+
+        return make_request(
+            url=self.url,
+            token=self.token,
+            headers=self.headers,
+            query={
+                **self.query,
+                'limit': limit,
+                'offset': offset,
+            },
+            cache=self.cache,
+            hedge=self.hedge,
+        )
+
+    def _load_page(self) -> None:
+        if self._future:
+            results, resp = self._future.result()
+            self._future = None
+        else:
+            results, resp = self._request_page(self._offset)
+
+        self.pages_fetched += 1
+        self.bytes_read += len(resp.content or b'')
+
+        if not results:
+            self.close()
+            return
+
+        self.items_fetched += len(results)
+        self._items.extend(results)
+
+        offset = self._offset
+        header = resp.headers.get('Content-Range') or ''
+
+        if self._end is not None and offset + len(results) >= self._end:
+            # No more pages are needed, still record the count when available
+            try:
+                self.count = ContentRange.parse(header).count
+            except ValueError:
+                pass
+
+            self._offset = offset + len(results)
+            self._finish()
+            return
+
+        content_range = ContentRange.parse(header)
+        self.count = content_range.count
+
+        if offset < content_range.last:
+            self._offset = content_range.last
+
+            if self._is_complete(self._offset):
+                self._finish()
+
+            elif self._executor:
+                # Start fetching the next page while this one is consumed
+                self._future = self._executor.submit(self._request_page, self._offset)
+        else:
+            raise ValueError('Invalid content range')
+
+    def _finish(self) -> None:
+        self._done = True
+
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
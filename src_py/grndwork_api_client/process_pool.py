@@ -0,0 +1,153 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import os
+from typing import Any, Callable, cast, Dict, Iterator, List, Optional
+
+from .access_tokens import get_access_token, set_access_token
+from .client import Client
+from .interfaces import DataFile, GetDataQuery, RefreshToken
+from .utils import map_concurrently
+
+# Client used by tasks in each worker process, created by _init_worker
+_worker_client: Optional[Client] = None
+
+
+def get_data_in_processes(
+    client: Client,
+    query: Optional[GetDataQuery] = None,
+    *,
+    partition: str = 'filename',
+    processes: Optional[int] = None,
+    include_qc_flags: Optional[bool] = None,
+    columns: Optional[List[str]] = None,
+    page_size: Optional[int] = None,
+    transform: Optional[Callable[[DataFile], Any]] = None,
+) -> Iterator[List[Any]]:
+    if partition not in ('filename', 'station'):
+        raise ValueError('Partition must be filename or station')
+
+    processes = processes or os.cpu_count() or 1
+
+    # Access tokens are requested once and shared with every worker
+    scopes = ['read:data']
+
+    if (query or {}).get('records_limit') and include_qc_flags is not False:
+        scopes.append('read:qc')
+
+    access_tokens = {
+        scope: get_access_token(
+            refresh_token=client.refresh_token,
+            platform=client.platform,
+            scope=scope,
+            api_url=client.api_url,
+        ) for scope in scopes
+    }
+
+    return _get_data_batches(
+        client,
+        query or {},
+        partition=partition,
+        processes=processes,
+        access_tokens=access_tokens,
+        get_data_batch=partial(
+            _get_data_batch,
+            include_qc_flags=include_qc_flags,
+            columns=columns,
+            page_size=page_size,
+            transform=transform,
+        ),
+    )
+
+
+def _get_data_batches(
+    client: Client,
+    query: GetDataQuery,
+    *,
+    partition: str,
+    processes: int,
+    access_tokens: Dict[str, str],
+    get_data_batch: Callable[[GetDataQuery], List[Any]],
+) -> Iterator[List[Any]]:
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_worker,
+        initargs=(client.refresh_token, client.platform, client.api_url, access_tokens),
+    ) as executor:
+        yield from map_concurrently(
+            get_data_batch,
+            _partition_query(client, query, partition),
+            max_workers=processes,
+            executor=executor,
+        )
+
+
+def _partition_query(
+    client: Client,
+    query: GetDataQuery,
+    partition: str,
+) -> Iterator[GetDataQuery]:
+    # List matching files without records, then request each partition separately
+    files_query = cast(GetDataQuery, {
+        key: value for key, value in query.items()
+        if not key.startswith('records_')
+    })
+
+    partition_query = cast(GetDataQuery, {
+        key: value for key, value in query.items()
+        if key not in ('limit', 'offset')
+    })
+
+    stations = set()
+
+    for data_file in client.get_data(files_query):
+        if partition == 'filename':
+            yield {**partition_query, 'filename': data_file['filename']}
+
+        else:
+            station = data_file['source'].split(':', 1)[-1]
+
+            if station not in stations:
+                stations.add(station)
+                yield {**partition_query, 'station': station}
+
+
+def _init_worker(
+    refresh_token: RefreshToken,
+    platform: str,
+    api_url: str,
+    access_tokens: Dict[str, str],
+) -> None:
+    global _worker_client
+
+    for scope, access_token in access_tokens.items():
+        set_access_token(platform, scope, access_token, api_url=api_url)
+
+    _worker_client = Client(refresh_token=refresh_token, platform=platform, api_url=api_url)
+
+
+def _get_data_batch(
+    query: GetDataQuery,
+    *,
+    include_qc_flags: Optional[bool],
+    columns: Optional[List[str]],
+    page_size: Optional[int],
+    transform: Optional[Callable[[DataFile], Any]],
+) -> List[Any]:
+    if _worker_client is None:
+        raise RuntimeError('Worker process was not initialized')
+
+    batch = []
+
+    for data_file in _worker_client.get_data(
+        query,
+        include_qc_flags=include_qc_flags,
+        columns=columns,
+        page_size=page_size,
+    ):
+        result = transform(data_file) if transform else data_file
+
+        # Transforms that write results themselves return None to keep batches small
+        if result is not None:
+            batch.append(result)
+
+    return batch
@@ -0,0 +1,333 @@
+import base64
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+import hashlib
+import json
+import os
+import re
+from threading import get_ident, Lock
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+
+# Claims that change each time a token is issued, left out of the token identity
+TOKEN_TIME_CLAIMS = ['exp', 'iat', 'nbf', 'jti']
+
+
+@dataclass
+class CacheControl:
+    no_store: bool = False
+    no_cache: bool = False
+    max_age: Optional[int] = None
+
+    _max_age_pattern = re.compile(r'max-age=(\d+)')
+
+    @classmethod
+    def parse(cls, header: str) -> 'CacheControl':
+        directives = [directive.strip().lower() for directive in header.split(',')]
+        max_age = None
+
+        for directive in directives:
+            result = cls._max_age_pattern.match(directive)
+
+            if result:
+                max_age = int(result.group(1))
+
+        return CacheControl(
+            no_store='no-store' in directives,
+            no_cache='no-cache' in directives,
+            max_age=max_age,
+        )
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    headers: Dict[str, str]
+    content: bytes
+    payload: Any
+    expires: float
+
+    @property
+    def etag(self) -> Optional[str]:
+        return _get_header(self.headers, 'ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return _get_header(self.headers, 'Last-Modified')
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires
+
+    def revalidated(self, headers: Mapping[str, str]) -> 'CachedResponse':
+        from requests.structures import CaseInsensitiveDict
+
+        merged_headers = CaseInsensitiveDict(self.headers)
+        merged_headers.update(headers)
+
+        return CachedResponse(
+            url=self.url,
+            headers=dict(merged_headers),
+            content=self.content,
+            payload=self.payload,
+            expires=get_expires(merged_headers.get('Cache-Control') or ''),
+        )
+
+    def to_response(self) -> 'requests.Response':
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.url = self.url
+        resp.headers = CaseInsensitiveDict(self.headers)
+        resp.encoding = 'utf-8'
+        resp._content = self.content
+
+        return resp
+
+
+def get_expires(header: str) -> float:
+    cache_control = CacheControl.parse(header)
+
+    if cache_control.max_age and not cache_control.no_cache:
+        return time.time() + cache_control.max_age
+
+    return 0
+
+
+@lru_cache(maxsize=256)
+def get_token_identity(token: str) -> str:
+    # Tokens issued for the same subject, platform and scope share cached responses,
+    # so entries are kept when a token is refreshed but never served to another principal
+    try:
+        segment = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4)))
+    except (IndexError, ValueError):
+        claims = None
+
+    if isinstance(claims, dict):
+        identity = json.dumps({
+            key: value for key, value in claims.items() if key not in TOKEN_TIME_CLAIMS
+        }, sort_keys=True, default=str)
+    else:
+        identity = token
+
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+def is_cacheable(resp: 'requests.Response') -> bool:
+    cache_control = CacheControl.parse(resp.headers.get('Cache-Control') or '')
+
+    if resp.status_code != 200 or cache_control.no_store:
+        return False
+
+    return bool(
+        resp.headers.get('ETag') or
+        resp.headers.get('Last-Modified') or
+        (cache_control.max_age and not cache_control.no_cache),
+    )
+
+
+class ResponseCache():
+    def __init__(
+        self,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.size = 0
+        self.disk_size = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = Lock()
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self.disk_size = sum(size for (_, _, size) in self._list_files())
+
+    @staticmethod
+    def get_key(url: str, query: Any, token: str = '') -> str:
+        return json.dumps([get_token_identity(token), url, query], sort_keys=True, default=str)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry:
+                self._entries.move_to_end(key)
+                return entry
+
+        if self.directory:
+            entry = self._read(key)
+
+            if entry:
+                self._remember(key, entry)
+
+        return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:  # noqa: A003
+        self._remember(key, entry)
+
+        if self.directory:
+            self._write(key, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+        if self.directory:
+            for (path, _, _) in self._list_files():
+                os.remove(path)
+
+            with self._lock:
+                self.disk_size = 0
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        size = len(entry.content)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+
+            if previous:
+                self.size -= len(previous.content)
+
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = entry
+            self.size += size
+
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.content)
+
+    def _get_path(self, key: str) -> str:
+        assert self.directory
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    def _read(self, key: str) -> Optional[CachedResponse]:
+        path = self._get_path(key)
+
+        try:
+            with open(f'{path}.json') as f:
+                meta = json.loads(f.read())
+
+            with open(f'{path}.body', 'rb') as f:
+                content = f.read()
+
+        except FileNotFoundError:
+            return None
+
+        if meta.get('key') != key:
+            return None
+
+        try:
+            # Entries read are kept longest when the directory is trimmed
+            os.utime(f'{path}.body')
+        except FileNotFoundError:
+            pass
+
+        return CachedResponse(
+            url=meta['url'],
+            headers=meta['headers'],
+            content=content,
+            payload=json.loads(content),
+            expires=meta['expires'],
+        )
+
+    def _write(self, key: str, entry: CachedResponse) -> None:
+        path = self._get_path(key)
+        suffix = f'{os.getpid()}.{get_ident()}.tmp'
+        previous_size = self._get_entry_size(path)
+
+        with open(f'{path}.body.{suffix}', 'wb') as f:
+            f.write(entry.content)
+
+        with open(f'{path}.json.{suffix}', 'w') as f:
+            f.write(json.dumps({
+                'key': key,
+                'url': entry.url,
+                'headers': entry.headers,
+                'expires': entry.expires,
+            }))
+
+        os.replace(f'{path}.body.{suffix}', f'{path}.body')
+        os.replace(f'{path}.json.{suffix}', f'{path}.json')
+
+        with self._lock:
+            self.disk_size += self._get_entry_size(path) - previous_size
+            is_full = self.disk_size > self.max_disk_bytes
+
+        if is_full:
+            self._trim_directory()
+
+    def _trim_directory(self) -> None:
+        # Least recently used entries are removed first, files removed by
+        # other processes sharing the directory are skipped
+        files = self._list_files()
+        disk_size = sum(size for (_, _, size) in files)
+        entries: Dict[str, float] = {}
+
+        for (path, mtime, _) in files:
+            if path.endswith('.body'):
+                entries[path[:-len('.body')]] = mtime
+
+        for path in sorted(entries, key=entries.__getitem__):
+            if disk_size <= self.max_disk_bytes:
+                break
+
+            disk_size -= self._get_entry_size(path)
+
+            for extension in ['.json', '.body']:
+                try:
+                    os.remove(path + extension)
+                except FileNotFoundError:
+                    pass
+
+        with self._lock:
+            self.disk_size = disk_size
+
+    def _list_files(self) -> List[Tuple[str, float, int]]:
+        assert self.directory
+        files = []
+
+        for name in os.listdir(self.directory):
+            if name.endswith('.json') or name.endswith('.body'):
+                path = os.path.join(self.directory, name)
+
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+
+                files.append((path, stat.st_mtime, stat.st_size))
+
+        return files
+
+    @staticmethod
+    def _get_entry_size(path: str) -> int:
+        size = 0
+
+        for extension in ['.json', '.body']:
+            try:
+                size += os.path.getsize(path + extension)
+            except FileNotFoundError:
+                pass
+
+        return size
+
+
+def _get_header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    return next((value for key, value in headers.items() if key.lower() == name.lower()), None)
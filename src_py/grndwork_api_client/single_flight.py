@@ -0,0 +1,82 @@
+from concurrent.futures import Future
+from threading import Lock
+from typing import Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Keys are spread over independent locks, so concurrent calls for different keys rarely contend
+STRIPES = 16
+
+
+class SingleFlight():
+    def __init__(self, *, stripes: int = STRIPES) -> None:
+        self._stripes = [_Stripe() for _ in range(max(stripes, 1))]
+
+    @property
+    def hits(self) -> int:
+        return sum(stripe.hits for stripe in self._stripes)
+
+    @property
+    def misses(self) -> int:
+        return sum(stripe.misses for stripe in self._stripes)
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], T],
+        *,
+        share: Optional[Callable[[T], T]] = None,
+    ) -> T:
+        stripe = self._get_stripe(key)
+
+        with stripe.lock:
+            call = stripe.calls.get(key)
+            is_leader = call is None
+
+            if call is None:
+                call = stripe.calls[key] = Future()
+                stripe.misses += 1
+            else:
+                stripe.hits += 1
+
+        if not is_leader:
+            # Another caller is already running this call, wait for its result. Results passed
+            # through share are copies, so a caller changing its result does not affect others
+            result: T = call.result()  # type: ignore[assignment]
+
+            return share(result) if share else result
+
+        try:
+            result = fn()
+        except BaseException as err:
+            self._forget(key)
+            call.set_exception(err)
+            raise
+
+        self._forget(key)
+        call.set_result(result)
+
+        return result
+
+    def reset_stats(self) -> None:
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.hits = 0
+                stripe.misses = 0
+
+    def _get_stripe(self, key: Hashable) -> '_Stripe':
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def _forget(self, key: Hashable) -> None:
+        stripe = self._get_stripe(key)
+
+        with stripe.lock:
+            del stripe.calls[key]
+
+
+class _Stripe():
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.calls: Dict[Hashable, Future[object]] = {}
+        self.hits = 0
+        self.misses = 0
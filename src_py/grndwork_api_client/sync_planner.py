@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+from typing import Any, cast, Dict, List, Optional
+
+from .checkpoints import CheckpointStore
+from .client import Client
+from .interfaces import DataFile, DataFileHeaders, GetStationsQuery
+
+
+@dataclass(frozen=True)
+class SyncTask:
+    source: str
+    filename: str
+    is_stale: bool
+    headers: DataFileHeaders
+    # new, changed or active
+    reason: str
+
+    def to_data_file(self) -> DataFile:
+        return {
+            'source': self.source,
+            'filename': self.filename,
+            'is_stale': self.is_stale,
+            'headers': self.headers,
+        }
+
+
+class SyncPlanner():
+    def __init__(
+        self,
+        client: Client,
+        store: CheckpointStore,
+        *,
+        key_prefix: str = 'snapshot:',
+    ) -> None:
+        self.client = client
+        self.store = store
+        self.key_prefix = key_prefix
+
+    def plan(
+        self,
+        query: Optional[GetStationsQuery] = None,
+        *,
+        page_size: Optional[int] = None,
+    ) -> List[SyncTask]:
+        # Files listed by get_stations are compared against the snapshot of their last sync,
+        # stale files are skipped unless they are new or their headers have changed
+        tasks = []
+
+        stations = list(self.client.get_stations(query, page_size=page_size))
+        snapshots = self._load_snapshots([
+            self.key_prefix + data_file['filename']
+            for station in stations
+            for data_file in station['data_files']
+        ])
+
+        for station in stations:
+            for data_file in station['data_files']:
+                previous = snapshots.get(self.key_prefix + data_file['filename'])
+
+                if previous is None:
+                    reason = 'new'
+                elif (
+                    previous.get('headers') != data_file['headers'] or
+                    previous.get('is_stale') != data_file['is_stale']
+                ):
+                    reason = 'changed'
+                elif not data_file['is_stale']:
+                    reason = 'active'
+                else:
+                    continue
+
+                tasks.append(SyncTask(
+                    source=f'station:{station["station_uuid"]}',
+                    filename=data_file['filename'],
+                    is_stale=data_file['is_stale'],
+                    headers=data_file['headers'],
+                    reason=reason,
+                ))
+
+        return tasks
+
+    def complete(self, task: SyncTask) -> None:
+        # The snapshot is only saved once a file has synced, failed files are planned again
+        self.store.save(self.key_prefix + task.filename, {
+            'is_stale': task.is_stale,
+            'headers': task.headers,
+        })
+
+    def _load_snapshots(
+        self,
+        keys: List[str],
+    ) -> Dict[str, Dict[str, Any]]:
+        # Snapshots are loaded once per plan, stores without bulk reads load them one at a time
+        load_many = getattr(self.store, 'load_many', None)
+
+        if load_many is not None:
+            return cast(Dict[str, Dict[str, Any]], load_many(keys))
+
+        snapshots = {}
+
+        for key in keys:
+            snapshot = self.store.load(key)
+
+            if snapshot is not None:
+                snapshots[key] = snapshot
+
+        return snapshots
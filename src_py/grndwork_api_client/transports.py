@@ -0,0 +1,173 @@
+from collections import defaultdict
+import json
+from threading import BoundedSemaphore, Lock
+import time
+from typing import Any, Callable, DefaultDict, Dict, List, Mapping, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .config import TOKENS_PATH
+
+Exchange = Dict[str, Any]
+
+# Headers describing the encoding of the original body, which is stored decoded
+SKIPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+class RecordingAdapter(HTTPAdapter):
+    def __init__(self, path: str, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.path = path
+        self._lock = Lock()
+
+    def send(  # type: ignore[override]
+        self,
+        request: requests.PreparedRequest,
+        **kwargs: Any,
+    ) -> requests.Response:
+        resp = super().send(request, **kwargs)
+
+        # Reading the body here also records streamed responses
+        exchange = {
+            'method': request.method,
+            'url': get_exchange_url(request.url or ''),
+            'status': resp.status_code,
+            'headers': {
+                key: value for key, value in resp.headers.items()
+                if key.lower() not in SKIPPED_HEADERS
+            },
+            'body': _redact_body(request, resp.content.decode('utf-8')),
+            'elapsed': resp.elapsed.total_seconds(),
+        }
+
+        with self._lock:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(exchange) + '\n')
+
+        return resp
+
+
+class ReplayAdapter(BaseAdapter):
+    def __init__(
+        self,
+        path: str,
+        *,
+        speed: float = 1,
+        concurrency: Optional[int] = None,
+        latency: Union[float, Callable[[], float]] = 0,
+    ) -> None:
+        super().__init__()
+
+        if speed <= 0:
+            raise ValueError('Speed must be greater than 0')
+
+        self.speed = speed
+        self.latency = latency
+
+        self._exchanges: DefaultDict[str, List[Exchange]] = defaultdict(list)
+        self._replayed: Dict[str, int] = {}
+        self._lock = Lock()
+        self._semaphore = BoundedSemaphore(concurrency) if concurrency else None
+
+        self.requests = 0
+        self.misses = 0
+
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    exchange = json.loads(line)
+                    self._exchanges[_get_key(exchange['method'], exchange['url'])].append(exchange)
+
+    def send(  # type: ignore[override]
+        self,
+        request: requests.PreparedRequest,
+        **kwargs: Any,
+    ) -> requests.Response:
+        key = _get_key(request.method or 'GET', get_exchange_url(request.url or ''))
+
+        with self._lock:
+            self.requests += 1
+            exchanges = self._exchanges.get(key)
+
+            if exchanges:
+                # Repeated requests cycle through every response recorded for them
+                index = self._replayed.get(key, 0)
+                self._replayed[key] = index + 1
+                exchange = exchanges[index % len(exchanges)]
+            else:
+                self.misses += 1
+                exchange = {
+                    'status': 404,
+                    'headers': {'Content-Type': 'application/json'},
+                    'body': json.dumps({'message': 'No recorded response'}),
+                    'elapsed': 0,
+                }
+
+        if self._semaphore:
+            # Limits the number of requests served at once, like a server with fixed capacity
+            with self._semaphore:
+                self._wait(exchange)
+        else:
+            self._wait(exchange)
+
+        return _build_response(request, exchange)
+
+    def close(self) -> None:
+        pass
+
+    def _wait(self, exchange: Exchange) -> None:
+        latency = self.latency() if callable(self.latency) else self.latency
+        delay = exchange['elapsed'] / self.speed + latency
+
+        if delay > 0:
+            time.sleep(delay)
+
+
+def get_exchange_url(url: str) -> str:
+    # Query params are sorted so requests match regardless of param order
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))
+
+
+def _redact_body(request: requests.PreparedRequest, body: str) -> str:
+    # Access tokens are credentials, their signature is removed before they are written to disk.
+    # The claims are kept, so replayed tokens can still be checked for expiry
+    if request.method != 'POST' or not urlsplit(request.url or '').path.endswith(TOKENS_PATH):
+        return body
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return body
+
+    if not isinstance(payload, dict) or not isinstance(payload.get('token'), str):
+        return body
+
+    parts = payload['token'].split('.')
+    payload['token'] = '.'.join([*parts[:2], '']) if len(parts) == 3 else ''
+
+    return json.dumps(payload)
+
+
+def _get_key(method: str, url: str) -> str:
+    return f'{method.upper()} {url}'
+
+
+def _build_response(
+    request: requests.PreparedRequest,
+    exchange: Mapping[str, Any],
+) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = exchange['status']
+    resp.headers = CaseInsensitiveDict(exchange['headers'])
+    resp._content = exchange['body'].encode('utf-8')
+    resp.encoding = 'utf-8'
+    resp.url = request.url or ''
+    resp.request = request
+
+    return resp
@@ -0,0 +1,268 @@
+import json
+from queue import Queue
+from threading import Condition, Lock, Thread
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .client import Client
+from .config import MAX_POST_FILES, MAX_POST_RECORDS
+from .interfaces import (
+    DataFileHeaders,
+    PostDataFile,
+    PostDataPayload,
+    PostDataRecord,
+)
+
+DeliveryCallback = Callable[[PostDataPayload, Optional[Exception]], None]
+
+
+class _Batch():
+    __slots__ = ('records', 'headers', 'sequences', 'count', 'bytes', 'created')
+
+    def __init__(self) -> None:
+        self.records: Dict[str, List[PostDataRecord]] = {}
+        self.headers: Dict[str, DataFileHeaders] = {}
+        self.sequences: Dict[str, int] = {}
+        self.count = 0
+        self.bytes = 0
+        self.created = time.monotonic()
+
+    def fits(self, filename: str, size: int, max_bytes: int) -> bool:
+        if not self.count:
+            return True
+
+        if filename not in self.records and len(self.records) >= MAX_POST_FILES:
+            return False
+
+        return self.bytes + size <= max_bytes
+
+    def add(
+        self,
+        filename: str,
+        record: PostDataRecord,
+        headers: Optional[DataFileHeaders],
+        size: int,
+    ) -> None:
+        self.records.setdefault(filename, []).append(record)
+
+        if headers is not None:
+            self.headers[filename] = headers
+
+        self.count += 1
+        self.bytes += size
+
+
+class DataUploader():
+    def __init__(
+        self,
+        client: Client,
+        *,
+        source: str,
+        max_records: int = MAX_POST_RECORDS,
+        max_bytes: int = 1000000,
+        linger: float = 1.0,
+        max_workers: int = 4,
+        max_pending_batches: int = 8,
+        overwrite: Optional[bool] = None,
+        delta: Optional[bool] = None,
+        retries: int = 0,
+        retry_delay: float = 1.0,
+        on_delivery: Optional[DeliveryCallback] = None,
+    ) -> None:
+        self.client = client
+        self.source = source
+        self.max_records = min(max_records, MAX_POST_RECORDS)
+        self.max_bytes = max_bytes
+        self.linger = linger
+        self.overwrite = overwrite
+        self.delta = delta
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.on_delivery = on_delivery
+
+        self.records_sent = 0
+        self.records_skipped = 0
+        self.records_failed = 0
+        self.batches_sent = 0
+        self.batches_failed = 0
+        self.bytes_sent = 0
+        self.callbacks_failed = 0
+        self.last_callback_error: Optional[Exception] = None
+
+        self._batch: Optional[_Batch] = None
+        self._closed = False
+        self._condition = Condition()
+        self._metrics_lock = Lock()
+
+        # Delta uploads of a file are posted in the order they were batched, so the saved
+        # watermark never moves past records of an earlier batch that has not been posted
+        self._next_sequences: Dict[str, int] = {}
+        self._posted_sequences: Dict[str, int] = {}
+        self._order = Condition()
+
+        # Bounded so producers block when uploads fall behind
+        self._queue: Queue[Optional[_Batch]] = Queue(maxsize=max_pending_batches)
+
+        self._workers = [
+            Thread(target=self._run_worker, daemon=True)
+            for _ in range(max_workers)
+        ]
+
+        self._linger_thread = Thread(target=self._run_linger, daemon=True)
+
+        for thread in [*self._workers, self._linger_thread]:
+            thread.start()
+
+    def __enter__(self) -> 'DataUploader':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def add(
+        self,
+        filename: str,
+        record: PostDataRecord,
+        *,
+        headers: Optional[DataFileHeaders] = None,
+    ) -> None:
+        size = len(json.dumps(record, default=str))
+
+        with self._condition:
+            if self._closed:
+                raise ValueError('Uploader is closed')
+
+            if self._batch and not self._batch.fits(filename, size, self.max_bytes):
+                self._dispatch()
+
+            if self._batch is None:
+                self._batch = _Batch()
+                self._condition.notify_all()
+
+            self._batch.add(filename, record, headers, size)
+
+            if self._batch.count >= self.max_records:
+                self._dispatch()
+
+    def flush(self) -> None:
+        with self._condition:
+            self._dispatch()
+
+        self._queue.join()
+
+    def close(self) -> None:
+        with self._condition:
+            if self._closed:
+                return
+
+            self._dispatch()
+            self._closed = True
+            self._condition.notify_all()
+
+        for _ in self._workers:
+            self._queue.put(None)
+
+        for thread in [*self._workers, self._linger_thread]:
+            thread.join()
+
+    def _dispatch(self) -> None:
+        # Called with the condition held, blocks while the queue is full
+        batch = self._batch
+        self._batch = None
+
+        if batch:
+            if self.delta:
+                for filename in batch.records:
+                    batch.sequences[filename] = self._next_sequences.get(filename, 0)
+                    self._next_sequences[filename] = batch.sequences[filename] + 1
+
+            self._queue.put(batch)
+
+    def _run_linger(self) -> None:
+        with self._condition:
+            while not self._closed:
+                if self._batch is None:
+                    self._condition.wait()
+                    continue
+
+                remaining = self._batch.created + self.linger - time.monotonic()
+
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                else:
+                    self._dispatch()
+
+    def _run_worker(self) -> None:
+        while True:
+            batch = self._queue.get()
+
+            try:
+                if batch is None:
+                    return
+
+                self._send(batch)
+            finally:
+                self._queue.task_done()
+
+    def _send(self, batch: _Batch) -> None:
+        files: List[PostDataFile] = []
+
+        for filename, records in batch.records.items():
+            data_file: PostDataFile = {'filename': filename, 'records': records}
+
+            if filename in batch.headers:
+                data_file['headers'] = batch.headers[filename]
+
+            files.append(data_file)
+
+        payload: PostDataPayload = {'source': self.source, 'files': files}
+
+        if self.overwrite is not None:
+            payload['overwrite'] = self.overwrite
+
+        error: Optional[Exception] = None
+        posted = 0
+
+        with self._order:
+            self._order.wait_for(lambda: all(
+                self._posted_sequences.get(filename, 0) == sequence
+                for filename, sequence in batch.sequences.items()
+            ))
+
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    posted = self.client.post_data(payload, delta=self.delta)
+                    error = None
+                    break
+                except Exception as err:
+                    error = err
+
+                    if attempt < self.retries:
+                        time.sleep(self.retry_delay * 2 ** attempt)
+        finally:
+            with self._order:
+                for filename, sequence in batch.sequences.items():
+                    self._posted_sequences[filename] = sequence + 1
+
+                self._order.notify_all()
+
+        with self._metrics_lock:
+            if error:
+                self.records_failed += batch.count
+                self.batches_failed += 1
+            else:
+                # Records already stored are trimmed from delta uploads and not sent
+                self.records_sent += posted
+                self.records_skipped += batch.count - posted
+                self.batches_sent += 1
+                self.bytes_sent += batch.bytes
+
+        if self.on_delivery:
+            try:
+                self.on_delivery(payload, error)
+            except Exception as err:
+                # Keep the worker running, the failure is reported on the uploader
+                with self._metrics_lock:
+                    self.callbacks_failed += 1
+                    self.last_callback_error = err
@@ -1,20 +1,135 @@
-from typing import Dict, List
+import calendar
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 from .interfaces import (
+    DataFile,
+    DataFileHeaders,
     DataRecord,
     QCRecord,
     QCValue,
 )
 
+T = TypeVar('T')
+R = TypeVar('R')
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+@lru_cache(maxsize=4096)
+def parse_timestamp(timestamp: str) -> datetime:
+    return datetime(*_parse_timestamp_fields(timestamp))
+
+
+def format_timestamp(value: datetime) -> str:
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+@lru_cache(maxsize=4096)
+def timestamp_to_epoch(timestamp: str) -> int:
+    return calendar.timegm(parse_timestamp(timestamp).timetuple())
+
+
+def _parse_timestamp_fields(timestamp: str) -> Tuple[int, int, int, int, int, int]:
+    # Fast path for the fixed width format returned by the api
+    if (
+        len(timestamp) == 19 and
+        timestamp[4] == '-' and timestamp[7] == '-' and timestamp[10] == ' ' and
+        timestamp[13] == ':' and timestamp[16] == ':'
+    ):
+        try:
+            return (
+                int(timestamp[0:4]),
+                int(timestamp[5:7]),
+                int(timestamp[8:10]),
+                int(timestamp[11:13]),
+                int(timestamp[14:16]),
+                int(timestamp[17:19]),
+            )
+        except ValueError:
+            pass
+
+    value = datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+
+    return (value.year, value.month, value.day, value.hour, value.minute, value.second)
+
+
+def epoch_to_timestamp(epoch: int) -> str:
+    return format_timestamp(datetime.fromtimestamp(epoch, tz=timezone.utc))
+
+
+def select_columns(
+    data_file: DataFile,
+    columns: List[str],
+) -> DataFile:
+    headers = data_file['headers']
+    header_columns = headers.get('columns') or []
+
+    indexes = [
+        header_columns.index(column) for column in columns
+        if column in header_columns
+    ]
+
+    selected_headers: DataFileHeaders = {
+        **headers,
+        'columns': [header_columns[index] for index in indexes],
+        'units': [headers['units'][index] for index in indexes if index < len(headers['units'])],
+    }
+
+    if 'processing' in headers:
+        selected_headers['processing'] = [
+            headers['processing'][index] for index in indexes
+            if index < len(headers['processing'])
+        ]
+
+    selected: DataFile = {**data_file, 'headers': selected_headers}
+
+    if 'records' in data_file:
+        selected['records'] = [
+            _select_record_columns(record, columns)
+            for record in data_file['records']
+        ]
+
+    return selected
+
+
+def _select_record_columns(
+    record: DataRecord,
+    columns: List[str],
+) -> DataRecord:
+    data = record['data']
+
+    selected: DataRecord = {
+        **record,
+        'data': {column: data[column] for column in columns if column in data},
+    }
+
+    if 'qc_flags' in record:
+        qc_flags = record['qc_flags']
+        selected['qc_flags'] = {
+            column: qc_flags[column] for column in columns if column in qc_flags
+        }
+
+    return selected
+
 
 def combine_data_and_qc_records(
     data_records: List[DataRecord],
     qc_records: List[QCRecord],
+    columns: Optional[List[str]] = None,
 ) -> List[DataRecord]:
     qc_flags_by_timestamp: Dict[str, Dict[str, QCValue]] = {}
 
     for record in qc_records:
-        qc_flags_by_timestamp[record['timestamp']] = record['qc_flags']
+        qc_flags = record['qc_flags']
+
+        if columns is not None:
+            qc_flags = {column: qc_flags[column] for column in columns if column in qc_flags}
+
+        qc_flags_by_timestamp[record['timestamp']] = qc_flags
 
     return [
         {
@@ -22,3 +137,30 @@ def combine_data_and_qc_records(
             'qc_flags': qc_flags_by_timestamp.get(record['timestamp'], {}),
         } for record in data_records
     ]
+
+
+def map_concurrently(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    max_workers: int,
+    executor: Optional[Executor] = None,
+) -> Iterator[R]:
+    # Like executor.map, but only keeps a bounded number of items in flight
+    # so large or lazy inputs are not consumed all at once
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            yield from map_concurrently(fn, items, max_workers=max_workers, executor=executor)
+
+        return
+
+    futures: Deque[Future[R]] = deque()
+
+    for item in items:
+        if len(futures) >= max_workers * 2:
+            yield futures.popleft().result()
+
+        futures.append(executor.submit(fn, item))
+
+    while futures:
+        yield futures.popleft().result()
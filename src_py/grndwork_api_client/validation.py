@@ -0,0 +1,154 @@
+from typing import Any, cast, Dict, Iterable, List, Optional, Sequence
+
+from .config import MAX_POST_FILES, MAX_POST_RECORDS
+from .interfaces import DataFileHeaders, PostDataFile, PostDataPayload, StationDataFile
+
+# Validation stops once this many errors are found, a badly formed batch is not read in full
+MAX_ERRORS = 100
+
+
+class ValidationError(Exception):
+    def __init__(self, *args: Any, errors: Optional[List[str]] = None) -> None:
+        super().__init__(*args)
+        self.errors = errors or []
+
+
+def validate_payload(
+    payload: PostDataPayload,
+    *,
+    data_files: Optional[Iterable[StationDataFile]] = None,
+    max_errors: int = MAX_ERRORS,
+) -> None:
+    # Headers of station data files are used for files posted without headers
+    known_headers = {
+        data_file['filename']: data_file['headers']
+        for data_file in data_files or []
+    }
+
+    errors: List[str] = []
+    files = payload.get('files') or []
+
+    if not payload.get('source'):
+        errors.append('source is required')
+
+    if not files:
+        errors.append('files must not be empty')
+
+    if len(files) > MAX_POST_FILES:
+        errors.append(f'files must not have more than {MAX_POST_FILES} items')
+
+    total_records = sum(len(data_file.get('records') or []) for data_file in files)
+
+    if total_records > MAX_POST_RECORDS:
+        errors.append(f'files must not have more than {MAX_POST_RECORDS} records combined')
+
+    for (index, data_file) in enumerate(files):
+        if len(errors) >= max_errors:
+            break
+
+        _validate_file(
+            errors,
+            f'files[{index}]',
+            data_file,
+            data_file.get('headers') or known_headers.get(data_file.get('filename', '')),
+            max_errors=max_errors,
+        )
+
+    if errors:
+        raise ValidationError(f'Invalid payload: {errors[0]}', errors=errors[:max_errors])
+
+
+def _validate_file(
+    errors: List[str],
+    path: str,
+    data_file: PostDataFile,
+    headers: Optional[DataFileHeaders],
+    *,
+    max_errors: int,
+) -> None:
+    if not data_file.get('filename'):
+        errors.append(f'{path}.filename is required')
+
+    columns: Optional[Sequence[str]] = None
+
+    if headers and headers.get('columns') is not None:
+        columns = headers['columns']
+
+        if len(set(columns)) != len(columns):
+            errors.append(f'{path}.headers.columns must not have duplicate columns')
+
+        for (key, values) in [
+            ('units', headers.get('units')),
+            ('processing', headers.get('processing')),
+        ]:
+            if values is not None and len(values) != len(columns):
+                errors.append(f'{path}.headers.{key} must have one item for each column')
+
+    column_set = set(columns) if columns is not None else None
+    record_nums = set()
+    direction = 0
+    previous: Optional[str] = None
+
+    # Records are checked in a single pass, and may be in either chronological order.
+    # Payloads may be built from untyped sources, so records are not assumed to be well formed
+    records = cast(List[Dict[str, Any]], data_file.get('records') or [])
+
+    for (index, record) in enumerate(records):
+        if len(errors) >= max_errors:
+            return
+
+        record_path = f'{path}.records[{index}]'
+        timestamp = record.get('timestamp')
+        record_num = record.get('record_num')
+        data = record.get('data')
+
+        if not _is_timestamp(timestamp):
+            errors.append(f'{record_path}.timestamp must use the format yyyy-mm-dd hh:mm:ss')
+            timestamp = None
+
+        if not isinstance(record_num, int) or isinstance(record_num, bool) or record_num < 1:
+            errors.append(f'{record_path}.record_num must be a positive integer')
+        elif record_num in record_nums:
+            errors.append(f'{record_path}.record_num {record_num} is duplicated')
+        else:
+            record_nums.add(record_num)
+
+        if not isinstance(data, dict):
+            errors.append(f'{record_path}.data must be an object')
+        elif column_set is not None and data.keys() != column_set:
+            unknown = [key for key in data if key not in column_set]
+
+            if unknown:
+                errors.append(f'{record_path}.data has unknown columns {", ".join(unknown)}')
+            else:
+                errors.append(
+                    f'{record_path}.data has {len(data)} values for {len(column_set)} columns',
+                )
+
+        if timestamp is None:
+            continue
+
+        if previous is not None:
+            step = (timestamp > previous) - (timestamp < previous)
+
+            if step == 0:
+                errors.append(f'{record_path}.timestamp {timestamp} is duplicated')
+            elif direction and step != direction:
+                errors.append(f'{record_path}.timestamp {timestamp} is out of order')
+                continue
+            else:
+                direction = step
+
+        previous = timestamp
+
+
+def _is_timestamp(value: Any) -> bool:
+    # Fixed width timestamps compare correctly as strings
+    return (
+        isinstance(value, str) and
+        len(value) == 19 and
+        value[4] == '-' and value[7] == '-' and value[10] == ' ' and
+        value[13] == ':' and value[16] == ':' and
+        value[0:4].isdigit() and value[5:7].isdigit() and value[8:10].isdigit() and
+        value[11:13].isdigit() and value[14:16].isdigit() and value[17:19].isdigit()
+    )
@@ -27,7 +27,7 @@ def describe_get_access_token():
     @pytest.fixture(name='decode', autouse=True)
     def fixture_decode(mocker):
         return mocker.patch(
-            target='src_py.grndwork_api_client.access_tokens.jwt.decode',
+            target='jwt.decode',
             spec=jwt.decode,
             return_value={
                 'exp': int(time.time()) + 1000,
@@ -58,6 +58,7 @@ def describe_get_access_token():
                 'platform': 'platform',
                 'scope': 'read:data',
             },
+            'coalesce': True,
         }
 
         assert access_token == 'access_token'
@@ -107,6 +108,26 @@ def describe_get_access_token():
 
         assert make_request.call_count == 2
 
+    def it_requests_new_access_token_for_other_api_url(make_request):
+        get_access_token(
+            refresh_token=refresh_token,
+            platform='platform',
+            scope='read:data',
+        )
+
+        get_access_token(
+            refresh_token=refresh_token,
+            platform='platform',
+            scope='read:data',
+            api_url='http://localhost:3000',
+        )
+
+        assert make_request.call_count == 2
+
+        (_, kwargs) = make_request.call_args
+
+        assert kwargs.get('url') == 'http://localhost:3000/v1/tokens'
+
     def it_requests_new_access_token_when_existing_has_expired(make_request, decode):
         decode.return_value = {
             'exp': int(time.time()) - 1000,
@@ -0,0 +1,118 @@
+import pytest
+from src_py.grndwork_api_client import aggregate
+from src_py.grndwork_api_client.aggregate import aggregate_data, aggregate_records
+
+
+def describe_aggregate_records():
+    records = [
+        {
+            'timestamp': '2020-01-01 00:01:00',
+            'record_num': 4,
+            'data': {'Temp': 4, 'Status': 'OK'},
+            'qc_flags': {'Temp': 'FLAG'},
+        },
+        {
+            'timestamp': '2020-01-01 00:00:40',
+            'record_num': 3,
+            'data': {'Temp': 3, 'Status': 'OK'},
+            'qc_flags': {},
+        },
+        {
+            'timestamp': '2020-01-01 00:00:20',
+            'record_num': 2,
+            'data': {'Temp': None, 'Status': 'OK'},
+            'qc_flags': {},
+        },
+        {
+            'timestamp': '2020-01-01 00:00:00',
+            'record_num': 1,
+            'data': {'Temp': 1, 'Status': 'OK'},
+            'qc_flags': {},
+        },
+    ]
+
+    @pytest.fixture(autouse=True, params=[True, False], ids=['numpy', 'python'])
+    def _use_numpy(request, monkeypatch):
+        monkeypatch.setattr(aggregate, 'HAS_NUMPY', request.param)
+
+    def it_summarizes_records_per_interval():
+        assert aggregate_records(records, interval=60, columns=['Temp']) == [
+            {
+                'timestamp': '2020-01-01 00:01:00',
+                'count': 1,
+                'data': {
+                    'Temp': {'min': 4.0, 'max': 4.0, 'mean': 4.0, 'last': 4.0, 'count': 1},
+                },
+            },
+            {
+                'timestamp': '2020-01-01 00:00:00',
+                'count': 3,
+                'data': {
+                    'Temp': {'min': 1.0, 'max': 3.0, 'mean': 2.0, 'last': 3.0, 'count': 2},
+                },
+            },
+        ]
+
+    def it_excludes_flagged_values():
+        results = aggregate_records(records, interval=60, columns=['Temp'], exclude_flagged=True)
+
+        assert results[0]['count'] == 1
+        assert results[0]['data']['Temp'] == {
+            'min': None,
+            'max': None,
+            'mean': None,
+            'last': None,
+            'count': 0,
+        }
+
+    def it_skips_non_numeric_columns():
+        results = aggregate_records(records, interval=60)
+
+        assert results[0]['data']['Status']['count'] == 0
+
+    def it_aggregates_across_chunks(monkeypatch):
+        monkeypatch.setattr(aggregate, 'CHUNK_SIZE', 1)
+
+        results = aggregate_records(records, interval=60, columns=['Temp'])
+
+        assert results[1]['data']['Temp'] == {
+            'min': 1.0,
+            'max': 3.0,
+            'mean': 2.0,
+            'last': 3.0,
+            'count': 2,
+        }
+
+    def it_raises_error_when_invalid_interval():
+        with pytest.raises(ValueError, match='Interval must be greater than 0'):
+            aggregate_records(records, interval=0)
+
+
+def describe_aggregate_data():
+    def it_summarizes_each_data_file():
+        results = list(aggregate_data([{
+            'source': 'station:uuid',
+            'filename': 'Test_OneMin.dat',
+            'is_stale': False,
+            'headers': {'columns': ['Temp'], 'units': ['Deg_C']},
+            'records': [{
+                'timestamp': '2020-01-01 00:00:00',
+                'record_num': 1,
+                'data': {'Temp': 1, 'Other': 2},
+            }],
+        }], interval=3600))
+
+        assert results == [{
+            'source': 'station:uuid',
+            'filename': 'Test_OneMin.dat',
+            'is_stale': False,
+            'headers': {'columns': ['Temp'], 'units': ['Deg_C']},
+            'interval': 3600,
+            'records': [{
+                'timestamp': '2020-01-01 00:00:00',
+                'count': 1,
+                'data': {
+                    'Temp': {'min': 1.0, 'max': 1.0, 'mean': 1.0, 'last': 1.0, 'count': 1},
+                },
+            }],
+        }]
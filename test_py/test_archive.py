@@ -0,0 +1,121 @@
+import pytest
+from src_py.grndwork_api_client import archive
+from src_py.grndwork_api_client.archive import ArchivedFile, DataArchive, to_records
+
+np = pytest.importorskip('numpy')
+
+
+def describe_data_archive():
+    def _make_data_file(minutes):
+        return {
+            'source': 'station:uuid',
+            'filename': 'Test_OneMin.dat',
+            'is_stale': False,
+            'headers': {
+                'columns': ['Ambient_Temp', 'Status'],
+                'units': ['Deg_C', ''],
+            },
+            'records': [{
+                'timestamp': f'2020-01-01 00:{minute:02d}:00',
+                'record_num': minute + 1,
+                'data': {'Ambient_Temp': minute * 1.5, 'Status': 'OK'},
+                'qc_flags': {'Ambient_Temp': 1} if minute % 2 else {},
+            } for minute in reversed(minutes)],
+        }
+
+    def it_appends_records_into_segments(tmp_path):
+        data_archive = DataArchive(str(tmp_path))
+
+        assert data_archive.append(_make_data_file(range(0, 10))) == 10
+        assert data_archive.append(_make_data_file(range(5, 20))) == 10
+        assert data_archive.append(_make_data_file(range(0, 20))) == 0
+
+        assert data_archive.filenames() == ['Test_OneMin.dat']
+
+        archived = data_archive.open('Test_OneMin.dat')
+
+        assert len(archived) == 20
+        assert archived.headers == _make_data_file([])['headers']
+        assert archived.first_timestamp == '2020-01-01 00:00:00'
+        assert archived.last_timestamp == '2020-01-01 00:19:00'
+
+        arrays = archived.read()
+
+        assert arrays['record_num'].tolist() == list(range(1, 21))
+        assert arrays['data.Ambient_Temp'].tolist() == [minute * 1.5 for minute in range(20)]
+        assert arrays['data.Status'].tolist() == ['OK'] * 20
+
+    def it_reads_memory_mapped_segments(tmp_path):
+        data_archive = DataArchive(str(tmp_path))
+        data_archive.append(_make_data_file(range(0, 10)))
+        data_archive.append(_make_data_file(range(10, 20)))
+
+        segments = list(DataArchive(str(tmp_path)).open('Test_OneMin.dat').segments(
+            columns=['Ambient_Temp'],
+            records_after='2020-01-01 00:08:00',
+            records_before='2020-01-01 00:11:00',
+        ))
+
+        assert [segment['record_num'].tolist() for segment in segments] == [[9, 10], [11, 12]]
+        assert set(segments[0]) == {
+            'timestamp',
+            'record_num',
+            'data.Ambient_Temp',
+            'qc_flags.Ambient_Temp',
+        }
+
+        for segment in segments:
+            assert isinstance(segment['data.Ambient_Temp'].base, np.memmap)
+
+    def it_converts_arrays_to_records(tmp_path):
+        data_archive = DataArchive(str(tmp_path))
+        data_archive.append(_make_data_file(range(0, 2)))
+
+        records = list(to_records(data_archive.open('Test_OneMin.dat').read()))
+
+        assert records == [{
+            'timestamp': '2020-01-01 00:00:00',
+            'record_num': 1,
+            'data': {'Ambient_Temp': 0.0, 'Status': 'OK'},
+            'qc_flags': {},
+        }, {
+            'timestamp': '2020-01-01 00:01:00',
+            'record_num': 2,
+            'data': {'Ambient_Temp': 1.5, 'Status': 'OK'},
+            'qc_flags': {'Ambient_Temp': 1.0},
+        }]
+
+    def it_reads_missing_text_columns_as_empty(tmp_path):
+        data_archive = DataArchive(str(tmp_path))
+
+        flagged = _make_data_file(range(0, 2))
+
+        for record in flagged['records']:
+            record['qc_flags'] = {'Status': 'Q'}
+
+        unflagged = _make_data_file(range(2, 4))
+
+        for record in unflagged['records']:
+            record['qc_flags'] = {}
+
+        data_archive.append(flagged)
+        data_archive.append(unflagged)
+
+        arrays = data_archive.open('Test_OneMin.dat').read()
+
+        assert arrays['qc_flags.Status'].tolist() == ['Q', 'Q', '', '']
+        assert [record['qc_flags'] for record in to_records(arrays)] == [
+            {'Status': 'Q'},
+            {'Status': 'Q'},
+            {},
+            {},
+        ]
+
+    def it_raises_error_without_numpy(tmp_path, mocker):
+        mocker.patch.object(archive, 'HAS_NUMPY', False)
+
+        with pytest.raises(ImportError, match='numpy is required'):
+            DataArchive(str(tmp_path))
+
+        with pytest.raises(ImportError, match='numpy is required'):
+            ArchivedFile(str(tmp_path))
@@ -0,0 +1,145 @@
+from src_py.grndwork_api_client.checkpoints import (
+    Checkpoint,
+    FileCheckpointStore,
+    MemoryCheckpointStore,
+    SQLiteCheckpointStore,
+)
+
+
+def describe_memory_checkpoint_store():
+    def it_saves_loads_and_deletes_state():
+        store = MemoryCheckpointStore()
+
+        store.save('key', {'offset': 100})
+
+        assert store.load('key') == {'offset': 100}
+        assert store.load('other') is None
+        assert store.load_many(['key', 'other']) == {'key': {'offset': 100}}
+
+        store.delete('key')
+        store.delete('other')
+
+        assert store.load('key') is None
+
+
+def describe_file_checkpoint_store():
+    def it_saves_and_loads_state(tmp_path):
+        FileCheckpointStore(str(tmp_path / 'checkpoints.json')).save('key', {'offset': 100})
+
+        store = FileCheckpointStore(str(tmp_path / 'checkpoints.json'))
+
+        assert store.load('key') == {'offset': 100}
+        assert store.load('other') is None
+
+    def it_keeps_state_per_key(tmp_path):
+        store = FileCheckpointStore(str(tmp_path / 'checkpoints.json'))
+
+        store.save('first', {'offset': 1})
+        store.save('second', {'offset': 2})
+
+        assert store.load('first') == {'offset': 1}
+        assert store.load('second') == {'offset': 2}
+
+    def it_loads_many_keys_with_one_read(mocker, tmp_path):
+        store = FileCheckpointStore(str(tmp_path / 'checkpoints.json'))
+
+        store.save('first', {'offset': 1})
+        store.save('second', {'offset': 2})
+
+        read = mocker.spy(store, '_read')
+
+        assert store.load_many(['first', 'second', 'third']) == {
+            'first': {'offset': 1},
+            'second': {'offset': 2},
+        }
+        assert read.call_count == 1
+
+    def it_deletes_state(tmp_path):
+        store = FileCheckpointStore(str(tmp_path / 'checkpoints.json'))
+
+        store.save('key', {'offset': 100})
+        store.delete('key')
+
+        assert store.load('key') is None
+
+
+def describe_sqlite_checkpoint_store():
+    def it_saves_and_loads_state(tmp_path):
+        SQLiteCheckpointStore(str(tmp_path / 'checkpoints.db')).save('key', {'offset': 100})
+
+        store = SQLiteCheckpointStore(str(tmp_path / 'checkpoints.db'))
+
+        assert store.load('key') == {'offset': 100}
+        assert store.load('other') is None
+
+    def it_replaces_state(tmp_path):
+        store = SQLiteCheckpointStore(str(tmp_path / 'checkpoints.db'))
+
+        store.save('key', {'offset': 1})
+        store.save('key', {'offset': 2})
+
+        assert store.load('key') == {'offset': 2}
+
+    def it_loads_many_keys(tmp_path):
+        store = SQLiteCheckpointStore(str(tmp_path / 'checkpoints.db'))
+
+        for index in range(0, 1200, 2):
+            store.save(f'key:{index}', {'offset': index})
+
+        states = store.load_many(f'key:{index}' for index in range(1200))
+
+        assert states == {f'key:{index}': {'offset': index} for index in range(0, 1200, 2)}
+
+    def it_deletes_state(tmp_path):
+        store = SQLiteCheckpointStore(str(tmp_path / 'checkpoints.db'))
+
+        store.save('key', {'offset': 100})
+        store.delete('key')
+
+        assert store.load('key') is None
+
+
+def describe_checkpoint():
+    def it_saves_progress_at_interval(tmp_path):
+        store = FileCheckpointStore(str(tmp_path / 'checkpoints.json'))
+        checkpoint = Checkpoint(store, 'key', interval=2)
+
+        checkpoint.advance(1, {'filename': 'Test_OneMin.dat'})
+
+        assert store.load('key') is None
+
+        checkpoint.advance(2, {'filename': 'Test_OneMin.dat'})
+
+        assert store.load('key')['offset'] == 2
+
+    def it_tracks_high_water_marks_per_file(tmp_path):
+        store = FileCheckpointStore(str(tmp_path / 'checkpoints.json'))
+        checkpoint = Checkpoint(store, 'key', interval=1)
+
+        checkpoint.advance(1, {
+            'filename': 'Test_OneMin.dat',
+            'records': [
+                {'timestamp': '2020-01-01 00:01:00'},
+                {'timestamp': '2020-01-01 00:00:00'},
+            ],
+        })
+
+        checkpoint.advance_record('Test_Hourly.dat', {
+            'timestamp': '2020-01-01 01:00:00',
+            'record_num': 2,
+        })
+
+        assert Checkpoint(store, 'key', interval=1).high_water_marks == {
+            'Test_OneMin.dat': '2020-01-01 00:01:00',
+            'Test_Hourly.dat': '2020-01-01 01:00:00',
+        }
+
+    def it_saves_completion(tmp_path):
+        store = FileCheckpointStore(str(tmp_path / 'checkpoints.json'))
+
+        Checkpoint(store, 'key', interval=10).finish(5)
+
+        checkpoint = Checkpoint(store, 'key', interval=10)
+
+        assert checkpoint.offset == 5
+        assert checkpoint.complete
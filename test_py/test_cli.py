@@ -0,0 +1,324 @@
+import json
+import threading
+
+import pytest
+from src_py.grndwork_api_client import cli
+from src_py.grndwork_api_client.checkpoints import FileCheckpointStore
+from src_py.grndwork_api_client.client import Client
+from src_py.grndwork_api_client.make_request import RequestError
+
+
+def describe_cli():
+    data_files = [{
+        'source': 'station:uuid',
+        'filename': filename,
+        'is_stale': False,
+        'headers': {'columns': ['Ambient_Temp'], 'units': ['Deg_C']},
+    } for filename in ['Test_OneMin.dat', 'Test_Hourly.dat']]
+
+    records = [{
+        'timestamp': f'2020-01-01 00:0{record_num}:00',
+        'record_num': record_num,
+        'data': {'Ambient_Temp': record_num / 2},
+    } for record_num in [3, 2, 1]]
+
+    @pytest.fixture(name='client', autouse=True)
+    def fixture_client(mocker):
+        client = mocker.MagicMock(spec=Client)
+        client.get_data.side_effect = lambda *args, **kwargs: iter(data_files)
+
+        def get_records_mock(filename, *, records_after=None, **kwargs):
+            return iter([
+                record for record in records
+                if not records_after or record['timestamp'] > records_after
+            ])
+
+        client.get_records.side_effect = get_records_mock
+        client.post_data.side_effect = lambda payload, **kwargs: sum(
+            len(data_file['records']) for data_file in payload['files']
+        )
+
+        mocker.patch.object(cli, 'create_client', return_value=client)
+
+        return client
+
+    @pytest.fixture(name='sleep', autouse=True)
+    def fixture_sleep(mocker):
+        return mocker.patch.object(cli.time, 'sleep')
+
+    def describe_stations():
+        def it_writes_stations_as_csv(client, capsys):
+            client.get_stations.return_value = iter([{
+                'station_uuid': 'uuid',
+                'station_full_name': 'Station',
+                'data_files': data_files,
+            }])
+
+            assert cli.main(['stations', '--station', 'uuid', '--format', 'csv']) == 0
+
+            lines = capsys.readouterr().out.splitlines()
+
+            assert lines[0].startswith('client_uuid,')
+            assert lines[1].endswith(',Test_OneMin.dat;Test_Hourly.dat')
+
+            (args, kwargs) = client.get_stations.call_args
+
+            assert args[0] == {'station': 'uuid'}
+            assert kwargs == {'page_size': 100}
+
+    def describe_export():
+        def it_writes_ndjson_to_stdout(client, capsys):
+            assert cli.main([
+                'export',
+                '--filename', 'Test_*',
+                '--format', 'ndjson',
+                '--concurrency', '1',
+                '--no-qc-flags',
+            ]) == 0
+
+            output = capsys.readouterr()
+            lines = [json.loads(line) for line in output.out.splitlines()]
+
+            assert len(lines) == 6
+            assert lines[0] == {
+                'filename': 'Test_OneMin.dat',
+                'source': 'station:uuid',
+                **records[0],
+            }
+            assert output.err.startswith('Exported 6 records from 2 files in ')
+
+            (args, _) = client.get_data.call_args
+
+            assert args[0] == {'filename': 'Test_*'}
+
+            (_, kwargs) = client.get_records.call_args
+
+            assert kwargs.get('include_qc_flags') is False
+            assert kwargs.get('window_size') == 1500
+
+        def it_writes_toa5_files_to_directory(tmp_path):
+            argv = ['--quiet', 'export', '--output', str(tmp_path), '--page-size', '2']
+
+            assert cli.main(argv) == 0
+
+            assert sorted(path.name for path in tmp_path.iterdir()) == [
+                'Test_Hourly.dat',
+                'Test_OneMin.dat',
+            ]
+
+            lines = (tmp_path / 'Test_OneMin.dat').read_text().splitlines()
+
+            assert lines[0].startswith('"TOA5"')
+            assert lines[4:] == [
+                '"2020-01-01 00:01:00",1,0.5',
+                '"2020-01-01 00:02:00",2,1.0',
+                '"2020-01-01 00:03:00",3,1.5',
+            ]
+
+        def it_skips_completed_files_when_resumed(client, tmp_path):
+            resume = str(tmp_path / 'progress.json')
+
+            FileCheckpointStore(resume).save('export:Test_OneMin.dat::', {'complete': True})
+
+            assert cli.main([
+                '--quiet',
+                'export',
+                '--format', 'ndjson',
+                '--output', str(tmp_path / 'output.ndjson'),
+                '--resume', resume,
+            ]) == 0
+
+            assert [args[0] for (args, _) in client.get_records.call_args_list] == [
+                'Test_Hourly.dat',
+            ]
+
+            (_, kwargs) = client.get_records.call_args
+
+            assert isinstance(kwargs.get('checkpoint'), cli._FlushedCheckpointStore)
+            assert kwargs.get('checkpoint_key') == 'export:Test_Hourly.dat::'
+
+        def it_exports_interrupted_toa5_files_again_when_resumed(client, tmp_path):
+            resume = str(tmp_path / 'progress.json')
+            output = tmp_path / 'output'
+            output.mkdir()
+
+            (output / 'Test_OneMin.dat').write_text('partial\n')
+            FileCheckpointStore(resume).save('export:Test_OneMin.dat::', {'complete': False})
+
+            assert cli.main(['--quiet', 'export', '--output', str(output), '--resume', resume]) == 0
+
+            lines = (output / 'Test_OneMin.dat').read_text().splitlines()
+
+            assert lines[0].startswith('"TOA5"')
+            assert len(lines) == 7
+
+            (_, kwargs) = client.get_records.call_args
+
+            assert kwargs.get('checkpoint') is None
+            assert FileCheckpointStore(resume).load('export:Test_Hourly.dat::') == {
+                'complete': True,
+            }
+
+        def it_retries_failed_files(client, sleep, capsys):
+            client.get_records.side_effect = RequestError('Bad gateway')
+
+            assert cli.main(['export', '--format', 'ndjson', '--retries', '2']) == 1
+
+            assert client.get_records.call_count == 6
+            assert [args[0] for (args, _) in sleep.call_args_list] == [1.0, 2.0, 1.0, 2.0]
+
+            output = capsys.readouterr()
+
+            assert 'Failed to export Test_OneMin.dat: Bad gateway' in output.err
+            assert output.err.splitlines()[-1].endswith(', 2 failed')
+
+        def it_requires_output_to_resume(capsys):
+            with pytest.raises(SystemExit):
+                cli.main(['export', '--resume', 'progress.json'])
+
+            assert '--resume requires --output' in capsys.readouterr().err
+
+    def describe_sync():
+        def it_appends_new_records(client, tmp_path):
+            assert cli.main(['--quiet', 'sync', str(tmp_path), '--format', 'csv']) == 0
+
+            lines = (tmp_path / 'Test_OneMin.dat.csv').read_text().splitlines()
+
+            assert lines == [
+                'TIMESTAMP,RECORD,Ambient_Temp,Ambient_Temp_qc_flag',
+                '2020-01-01 00:01:00,1,0.5,',
+                '2020-01-01 00:02:00,2,1.0,',
+                '2020-01-01 00:03:00,3,1.5,',
+            ]
+
+            records.insert(0, {
+                'timestamp': '2020-01-01 00:04:00',
+                'record_num': 4,
+                'data': {'Ambient_Temp': 2.0},
+            })
+
+            try:
+                assert cli.main(['--quiet', 'sync', str(tmp_path), '--format', 'csv']) == 0
+            finally:
+                records.pop(0)
+
+            (_, kwargs) = client.get_records.call_args
+
+            assert kwargs.get('records_after') == '2020-01-01 00:03:00'
+
+            lines = (tmp_path / 'Test_OneMin.dat.csv').read_text().splitlines()
+
+            assert lines[-2:] == [
+                '2020-01-01 00:03:00,3,1.5,',
+                '2020-01-01 00:04:00,4,2.0,',
+            ]
+
+        def it_appends_records_in_windows(tmp_path):
+            argv = ['--quiet', 'sync', str(tmp_path), '--format', 'csv', '--page-size', '2']
+
+            assert cli.main(argv) == 0
+
+            lines = (tmp_path / 'Test_OneMin.dat.csv').read_text().splitlines()
+
+            assert lines[1:] == [
+                '2020-01-01 00:01:00,1,0.5,',
+                '2020-01-01 00:02:00,2,1.0,',
+                '2020-01-01 00:03:00,3,1.5,',
+            ]
+
+        def it_syncs_changed_files_only(client, tmp_path):
+            client.get_stations.side_effect = lambda *args, **kwargs: iter([{
+                'station_uuid': 'uuid',
+                'data_files': [
+                    {**data_file, 'is_stale': data_file['filename'] == 'Test_Hourly.dat'}
+                    for data_file in data_files
+                ],
+            }])
+
+            argv = ['--quiet', 'sync', str(tmp_path), '--site', 'site', '--changed-only']
+
+            assert cli.main(argv) == 0
+
+            assert client.get_data.call_count == 0
+            assert sorted(args[0] for (args, _) in client.get_records.call_args_list) == [
+                'Test_Hourly.dat',
+                'Test_OneMin.dat',
+            ]
+
+            (args, _) = client.get_stations.call_args
+
+            assert args[0] == {'site': 'site'}
+
+            client.get_records.reset_mock()
+
+            assert cli.main(argv) == 0
+
+            assert [args[0] for (args, _) in client.get_records.call_args_list] == [
+                'Test_OneMin.dat',
+            ]
+
+        def it_does_not_sync_changed_files_by_gateway(capsys):
+            with pytest.raises(SystemExit):
+                cli.main(['sync', 'data', '--gateway', 'uuid', '--changed-only'])
+
+            assert '--changed-only can not be used with --gateway' in capsys.readouterr().err
+
+    def describe_upload():
+        def it_uploads_records_from_files(client, tmp_path, capsys):
+            path = tmp_path / 'Test_OneMin.dat.csv'
+            path.write_text('TIMESTAMP,RECORD,Ambient_Temp\n2020-01-01 00:01:00,1,0.5\n')
+
+            assert cli.main([
+                'upload', str(path),
+                '--source', 'station:uuid',
+                '--resume',
+            ]) == 0
+
+            (args, kwargs) = client.post_data.call_args
+
+            assert args[0] == {
+                'source': 'station:uuid',
+                'files': [{
+                    'filename': 'Test_OneMin.dat',
+                    'records': [{
+                        'timestamp': '2020-01-01 00:01:00',
+                        'record_num': 1,
+                        'data': {'Ambient_Temp': 0.5},
+                    }],
+                }],
+            }
+
+            assert kwargs == {'delta': True}
+            assert capsys.readouterr().err.startswith('Uploaded 1 records from 1 files in ')
+
+        def it_posts_resumed_batches_of_a_file_in_order(client, tmp_path):
+            path = tmp_path / 'Test_OneMin.dat.csv'
+            path.write_text('TIMESTAMP,RECORD,Ambient_Temp\n' + ''.join(
+                f'2020-01-01 00:{record_num // 60:02}:{record_num % 60:02},{record_num},0.5\n'
+                for record_num in range(250)
+            ))
+
+            first_batch = threading.Event()
+            posted = []
+
+            def post_data_mock(payload, **kwargs):
+                records = payload['files'][0]['records']
+
+                if records[0]['record_num'] == 0:
+                    first_batch.wait(0.2)
+
+                posted.extend(record['record_num'] for record in records)
+
+                return len(records)
+
+            client.post_data.side_effect = post_data_mock
+
+            assert cli.main([
+                '--quiet',
+                'upload', str(path),
+                '--source', 'station:uuid',
+                '--concurrency', '4',
+                '--resume',
+            ]) == 0
+
+            assert posted == list(range(250))
@@ -1,9 +1,17 @@
 import pytest
 from src_py.grndwork_api_client.access_tokens import get_access_token as _get_access_token
+from src_py.grndwork_api_client.checkpoints import FileCheckpointStore
 from src_py.grndwork_api_client.client import Client
-from src_py.grndwork_api_client.config import DATA_URL, QC_URL, STATIONS_URL
+from src_py.grndwork_api_client.config import API_URL, DATA_URL, QC_URL, STATIONS_URL
+from src_py.grndwork_api_client.hedging import RequestHedger
 from src_py.grndwork_api_client.make_paginated_request import make_paginated_request as _make_paginated_request  # noqa: E501
 from src_py.grndwork_api_client.make_request import make_request as _make_request
+from src_py.grndwork_api_client.make_request import open_connections as _open_connections
+from src_py.grndwork_api_client.make_sharded_request import make_sharded_request as _make_sharded_request  # noqa: E501
+from src_py.grndwork_api_client.make_windowed_request import make_windowed_request as _make_windowed_request  # noqa: E501
+from src_py.grndwork_api_client.paginated_iterator import PaginatedIterator
+from src_py.grndwork_api_client.response_cache import ResponseCache
+from src_py.grndwork_api_client.validation import ValidationError
 
 
 def describe_client():
@@ -36,6 +44,70 @@ def describe_client():
             return_value=(None, mocker.MagicMock()),
         )
 
+    @pytest.fixture(name='make_sharded_request', autouse=True)
+    def fixture_make_sharded_request(mocker):
+        return mocker.patch(
+            target='src_py.grndwork_api_client.client.make_sharded_request',
+            spec=_make_sharded_request,
+            return_value=[],
+        )
+
+    @pytest.fixture(name='make_windowed_request', autouse=True)
+    def fixture_make_windowed_request(mocker):
+        return mocker.patch(
+            target='src_py.grndwork_api_client.client.make_windowed_request',
+            spec=_make_windowed_request,
+            return_value=[],
+        )
+
+    def describe_warm_up():
+        @pytest.fixture(name='open_connections', autouse=True)
+        def fixture_open_connections(mocker):
+            return mocker.patch(
+                target='src_py.grndwork_api_client.client.open_connections',
+                spec=_open_connections,
+            )
+
+        def it_requests_access_tokens_and_opens_connections(get_access_token, open_connections):
+            client = Client(refresh_token=refresh_token, platform='platform')
+
+            client.warm_up()
+
+            assert sorted(kwargs['scope'] for (_, kwargs) in get_access_token.call_args_list) == [
+                'read:data',
+                'read:qc',
+                'read:stations',
+                'write:data',
+            ]
+
+            for (_, kwargs) in get_access_token.call_args_list:
+                assert kwargs['refresh_token'] == refresh_token
+                assert kwargs['platform'] == 'platform'
+
+            open_connections.assert_called_once_with(API_URL, 4)
+
+        def it_requests_selected_scopes(get_access_token, open_connections):
+            client = Client(refresh_token=refresh_token, platform='platform')
+
+            client.warm_up(scopes=['read:data'], connections=0)
+
+            get_access_token.assert_called_once_with(
+                refresh_token=refresh_token,
+                platform='platform',
+                scope='read:data',
+                api_url=API_URL,
+            )
+
+            open_connections.assert_not_called()
+
+        def it_raises_token_errors(get_access_token):
+            get_access_token.side_effect = ValueError('Invalid refresh token')
+
+            client = Client(refresh_token=refresh_token, platform='platform')
+
+            with pytest.raises(ValueError, match='Invalid refresh token'):
+                client.warm_up()
+
     def describe_get_stations():
         def it_gets_read_stations_access_token(get_access_token):
             client = Client(
@@ -87,6 +159,53 @@ def describe_client():
             assert kwargs.get('query') == {'limit': 10}
             assert kwargs.get('page_size') == 100
 
+        def it_makes_get_stations_request_with_response_cache(make_paginated_request):
+            response_cache = ResponseCache()
+
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+                response_cache=response_cache,
+            )
+
+            list(client.get_stations())
+
+            (_, kwargs) = make_paginated_request.call_args
+
+            assert kwargs.get('cache') is response_cache
+
+        def it_makes_get_stations_request_to_api_url(get_access_token, make_paginated_request):
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+                api_url='http://localhost:3000',
+            )
+
+            list(client.get_stations())
+
+            (_, kwargs) = get_access_token.call_args
+
+            assert kwargs.get('api_url') == 'http://localhost:3000'
+
+            (_, kwargs) = make_paginated_request.call_args
+
+            assert kwargs.get('url') == 'http://localhost:3000/v1/stations'
+
+        def it_makes_get_stations_request_with_hedge(make_paginated_request):
+            hedge = RequestHedger()
+
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+                hedge=hedge,
+            )
+
+            list(client.get_stations())
+
+            (_, kwargs) = make_paginated_request.call_args
+
+            assert kwargs.get('hedge') is hedge
+
         def it_makes_get_stations_request_with_page_size(make_paginated_request):
             client = Client(
                 refresh_token=refresh_token,
@@ -104,6 +223,92 @@ def describe_client():
             assert kwargs.get('query') == {}
             assert kwargs.get('page_size') == 50
 
+    def describe_count_stations():
+        @pytest.fixture(autouse=True)
+        def _set_content_range(mocker, make_request):
+            make_request.return_value = ([{}], mocker.MagicMock(**{
+                'headers': {'Content-Range': 'items 1-1/42'},
+            }))
+
+        def it_requests_minimal_page_and_returns_count(make_request):
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+            )
+
+            count = client.count_stations({'site': 'Test*', 'limit': 10, 'offset': 5})
+
+            assert make_request.call_count == 1
+
+            (_, kwargs) = make_request.call_args
+
+            assert kwargs.get('url') == STATIONS_URL
+            assert kwargs.get('token') == 'access_token'
+            assert kwargs.get('query') == {'site': 'Test*', 'limit': 1, 'offset': 0}
+
+            assert count == 42
+
+        def it_returns_zero_without_results(mocker, make_request):
+            make_request.return_value = ([], mocker.MagicMock(headers={}))
+
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+            )
+
+            assert client.count_stations() == 0
+
+        def it_caches_counts(make_request):
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+            )
+
+            assert client.count_stations({'site': 'Test*'}) == 42
+            assert client.count_stations({'site': 'Test*'}) == 42
+            assert client.count_stations({'site': 'Other*'}) == 42
+
+            assert make_request.call_count == 2
+
+        def it_does_not_cache_counts_when_disabled(make_request):
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+                count_cache_ttl=0,
+            )
+
+            client.count_stations()
+            client.count_stations()
+
+            assert make_request.call_count == 2
+
+    def describe_count_data_files():
+        def it_requests_minimal_page_without_records(mocker, get_access_token, make_request):
+            make_request.return_value = ([{}], mocker.MagicMock(**{
+                'headers': {'Content-Range': 'items 1-1/7'},
+            }))
+
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+            )
+
+            count = client.count_data_files({
+                'filename': '*_OneMin.dat',
+                'records_limit': 100,
+            })
+
+            (_, kwargs) = get_access_token.call_args
+
+            assert kwargs.get('scope') == 'read:data'
+
+            (_, kwargs) = make_request.call_args
+
+            assert kwargs.get('url') == DATA_URL
+            assert kwargs.get('query') == {'filename': '*_OneMin.dat', 'limit': 1, 'offset': 0}
+
+            assert count == 7
+
     def describe_get_data():
         def it_gets_read_data_access_token(get_access_token):
             client = Client(
@@ -171,8 +376,8 @@ def describe_client():
             assert kwargs.get('platform') == 'platform'
             assert kwargs.get('scope') == 'read:qc'
 
-        def it_makes_get_qc_requests_per_data_file(mocker, make_paginated_request, make_request):
-            make_paginated_request.return_value = [{
+        def it_makes_get_qc_requests_per_data_file(make_paginated_request):
+            data_files = [{
                 'source': 'station:uuid',
                 'filename': 'Test_OneMin.dat',
                 'is_stale': False,
@@ -187,10 +392,18 @@ def describe_client():
                 }],
             }]
 
-            make_request.return_value = ([{
+            qc_records = [{
                 'timestamp': '2020-01-01 00:00:00',
                 'qc_flags': {'SOME_KEY': 'FLAG'},
-            }], mocker.MagicMock())
+            }]
+
+            def make_paginated_request_mock(*args, **kwargs):
+                if kwargs.get('url') == QC_URL:
+                    return iter(qc_records)
+
+                return map(kwargs['transform'], data_files)
+
+            make_paginated_request.side_effect = make_paginated_request_mock
 
             client = Client(
                 refresh_token=refresh_token,
@@ -199,9 +412,9 @@ def describe_client():
 
             results = list(client.get_data({'records_limit': 1}))
 
-            assert make_request.call_count == 1
+            assert make_paginated_request.call_count == 2
 
-            (_, kwargs) = make_request.call_args
+            (_, kwargs) = make_paginated_request.call_args
 
             assert kwargs.get('url') == QC_URL
             assert kwargs.get('token') == 'access_token'
@@ -209,8 +422,8 @@ def describe_client():
                 'filename': 'Test_OneMin.dat',
                 'before': '2020-01-01 00:00:00',
                 'after': '2020-01-01 00:00:00',
-                'limit': 1500,
             }
+            assert kwargs.get('page_size') == 1500
 
             assert results == [{
                 'source': 'station:uuid',
@@ -228,6 +441,60 @@ def describe_client():
                 }],
             }]
 
+        def it_selects_columns_from_data_files_and_qc_flags(make_paginated_request):
+            data_files = [{
+                'source': 'station:uuid',
+                'filename': 'Test_OneMin.dat',
+                'is_stale': False,
+                'headers': {
+                    'columns': ['FIRST', 'SECOND', 'THIRD'],
+                    'units': ['m', 's', 'kg'],
+                    'processing': ['Avg', 'Min', 'Max'],
+                },
+                'records': [{
+                    'timestamp': '2020-01-01 00:00:00',
+                    'record_num': 1,
+                    'data': {'FIRST': 1, 'SECOND': 2, 'THIRD': 3},
+                }],
+            }]
+
+            qc_records = [{
+                'timestamp': '2020-01-01 00:00:00',
+                'qc_flags': {'FIRST': 'FLAG', 'SECOND': 'FLAG'},
+            }]
+
+            def make_paginated_request_mock(*args, **kwargs):
+                if kwargs.get('url') == QC_URL:
+                    return iter(qc_records)
+
+                return map(kwargs['transform'], data_files)
+
+            make_paginated_request.side_effect = make_paginated_request_mock
+
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+            )
+
+            results = list(client.get_data({'records_limit': 1}, columns=['THIRD', 'SECOND']))
+
+            assert results == [{
+                'source': 'station:uuid',
+                'filename': 'Test_OneMin.dat',
+                'is_stale': False,
+                'headers': {
+                    'columns': ['THIRD', 'SECOND'],
+                    'units': ['kg', 's'],
+                    'processing': ['Max', 'Min'],
+                },
+                'records': [{
+                    'timestamp': '2020-01-01 00:00:00',
+                    'record_num': 1,
+                    'data': {'THIRD': 3, 'SECOND': 2},
+                    'qc_flags': {'SECOND': 'FLAG'},
+                }],
+            }]
+
         def it_does_not_get_read_qc_access_token_when_disabled(get_access_token):
             client = Client(
                 refresh_token=refresh_token,
@@ -255,6 +522,232 @@ def describe_client():
             assert kwargs.get('query') == {}
             assert kwargs.get('page_size') == 50
 
+        def it_makes_sharded_get_data_request_with_shard_workers(
+            make_paginated_request,
+            make_sharded_request,
+        ):
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+            )
+
+            query = {
+                'records_after': '2020-01-01 00:00:00',
+                'records_before': '2020-01-31 00:00:00',
+            }
+
+            list(client.get_data(query, shard_workers=4))
+
+            assert make_paginated_request.call_count == 0
+            assert make_sharded_request.call_count == 1
+
+            (_, kwargs) = make_sharded_request.call_args
+
+            assert kwargs.get('url') == DATA_URL
+            assert kwargs.get('token') == 'access_token'
+            assert kwargs.get('query') == query
+            assert kwargs.get('page_size') == 100
+            assert kwargs.get('max_workers') == 4
+
+        def it_resumes_get_data_request_from_checkpoint(tmp_path, make_paginated_request):
+            iterator = make_paginated_request.return_value = PaginatedIterator(
+                DATA_URL,
+                token='access_token',
+                page_size=100,
+            )
+
+            store = FileCheckpointStore(str(tmp_path / 'checkpoints.json'))
+            store.save('data:{"filename": "*_OneMin.dat"}', {'offset': 20})
+
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+            )
+
+            assert client.get_data({'filename': '*_OneMin.dat'}, checkpoint=store) is iterator
+            assert iterator.offset == 20
+
+    def describe_get_records():
+        def it_gets_read_data_and_read_qc_access_tokens(get_access_token):
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+            )
+
+            list(client.get_records('Test_OneMin.dat'))
+
+            assert get_access_token.call_count == 2
+
+            scopes = [kwargs.get('scope') for (_, kwargs) in get_access_token.call_args_list]
+
+            assert scopes == ['read:data', 'read:qc']
+
+        def it_makes_windowed_request_with_default_options(make_windowed_request):
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+            )
+
+            list(client.get_records('Test_OneMin.dat', include_qc_flags=False))
+
+            assert make_windowed_request.call_count == 1
+
+            (_, kwargs) = make_windowed_request.call_args
+
+            assert kwargs.get('url') == DATA_URL
+            assert kwargs.get('token') == 'access_token'
+            assert kwargs.get('filename') == 'Test_OneMin.dat'
+            assert kwargs.get('records_after') is None
+            assert kwargs.get('records_before') is None
+            assert kwargs.get('window_size') == 1500
+            assert kwargs.get('transform') is None
+
+        def it_combines_qc_flags_per_window(make_windowed_request, make_paginated_request):
+            make_paginated_request.return_value = [{
+                'timestamp': '2020-01-01 00:00:00',
+                'qc_flags': {'SOME_KEY': 'FLAG'},
+            }]
+
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+            )
+
+            list(client.get_records('Test_OneMin.dat', window_size=10))
+
+            (_, kwargs) = make_windowed_request.call_args
+
+            assert kwargs.get('window_size') == 10
+
+            window = kwargs['transform']([{
+                'timestamp': '2020-01-01 00:00:00',
+                'record_num': 1,
+                'data': {'SOME_KEY': 'VALUE'},
+            }])
+
+            (_, kwargs) = make_paginated_request.call_args
+
+            assert kwargs.get('url') == QC_URL
+            assert kwargs.get('query') == {
+                'filename': 'Test_OneMin.dat',
+                'before': '2020-01-01 00:00:00',
+                'after': '2020-01-01 00:00:00',
+            }
+
+            assert window == [{
+                'timestamp': '2020-01-01 00:00:00',
+                'record_num': 1,
+                'data': {'SOME_KEY': 'VALUE'},
+                'qc_flags': {'SOME_KEY': 'FLAG'},
+            }]
+
+        def it_resumes_from_checkpoint(tmp_path, make_windowed_request):
+            records = [
+                {'timestamp': '2020-01-01 00:02:00', 'record_num': 3, 'data': {}},
+                {'timestamp': '2020-01-01 00:01:00', 'record_num': 2, 'data': {}},
+                {'timestamp': '2020-01-01 00:00:00', 'record_num': 1, 'data': {}},
+            ]
+
+            make_windowed_request.side_effect = lambda **kwargs: [[
+                record for record in records
+                if record['timestamp'] <= (kwargs['records_before'] or record['timestamp'])
+            ]]
+
+            store = FileCheckpointStore(str(tmp_path / 'checkpoints.json'))
+
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+            )
+
+            iterator = client.get_records(
+                'Test_OneMin.dat',
+                include_qc_flags=False,
+                checkpoint=store,
+                checkpoint_interval=1,
+            )
+
+            assert next(iterator) == records[0]
+            assert next(iterator) == records[1]
+
+            iterator.close()
+
+            assert list(client.get_records(
+                'Test_OneMin.dat',
+                include_qc_flags=False,
+                checkpoint=store,
+            )) == records[1:]
+
+            (_, kwargs) = make_windowed_request.call_args
+
+            assert kwargs.get('records_before') == '2020-01-01 00:02:00'
+
+            assert store.load('records:Test_OneMin.dat::') == {
+                'offset': 0,
+                'position': {'timestamp': '2020-01-01 00:00:00', 'record_num': 1},
+                'high_water_marks': {'Test_OneMin.dat': '2020-01-01 00:02:00'},
+                'complete': True,
+            }
+
+    def describe_get_qc():
+        def it_gets_read_qc_access_token(get_access_token):
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+            )
+
+            list(client.get_qc({'filename': 'Test_OneMin.dat'}))
+
+            (_, kwargs) = get_access_token.call_args
+
+            assert kwargs.get('scope') == 'read:qc'
+
+        def it_makes_paginated_get_qc_request(make_paginated_request):
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+            )
+
+            query = {
+                'filename': 'Test_OneMin.dat',
+                'after': '2020-01-01 00:00:00',
+                'before': '2020-01-31 00:00:00',
+            }
+
+            list(client.get_qc(query, page_size=500))
+
+            assert make_paginated_request.call_count == 1
+
+            (_, kwargs) = make_paginated_request.call_args
+
+            assert kwargs.get('url') == QC_URL
+            assert kwargs.get('token') == 'access_token'
+            assert kwargs.get('query') == query
+            assert kwargs.get('page_size') == 500
+
+    def describe_get_qc_batch():
+        def it_gets_qc_records_per_query_in_order(make_paginated_request):
+            make_paginated_request.side_effect = lambda *args, **kwargs: iter([{
+                'timestamp': '2020-01-01 00:00:00',
+                'qc_flags': {'SOME_KEY': kwargs['query']['filename']},
+            }])
+
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+            )
+
+            filenames = [f'Test_{index}.dat' for index in range(50)]
+
+            results = list(client.get_qc_batch(
+                ({'filename': filename} for filename in filenames),
+                max_workers=4,
+            ))
+
+            assert make_paginated_request.call_count == 50
+
+            assert [records[0]['qc_flags']['SOME_KEY'] for records in results] == filenames
+
     def describe_post_data():
         payload = {
             'source': 'station:uuid',
@@ -300,3 +793,140 @@ def describe_client():
             assert kwargs.get('token') == 'access_token'
             assert kwargs.get('method') == 'POST'
             assert kwargs.get('body') == payload
+
+        def it_does_not_post_invalid_payload(make_request):
+            client = Client(
+                refresh_token=refresh_token,
+                platform='platform',
+            )
+
+            with pytest.raises(ValidationError) as exc_info:
+                client.post_data(
+                    payload={'source': 'station:uuid', 'files': []},
+                    validate=True,
+                )
+
+            assert exc_info.value.errors == ['files must not be empty']
+            assert make_request.call_count == 0
+
+        def describe_delta():
+            records = [
+                {'timestamp': '2020-01-01 00:02:00', 'record_num': 3, 'data': {}},
+                {'timestamp': '2020-01-01 00:01:00', 'record_num': 2, 'data': {}},
+                {'timestamp': '2020-01-01 00:00:00', 'record_num': 1, 'data': {}},
+            ]
+
+            delta_payload = {
+                'source': 'station:uuid',
+                'files': [{
+                    'filename': 'Test_OneMin.dat',
+                    'records': records,
+                }],
+            }
+
+            def it_trims_records_already_stored(make_paginated_request, make_request):
+                make_paginated_request.return_value = [{
+                    'filename': 'Test_OneMin.dat',
+                    'records': [records[1]],
+                }]
+
+                client = Client(
+                    refresh_token=refresh_token,
+                    platform='platform',
+                )
+
+                client.post_data(delta_payload, delta=True)
+
+                (_, kwargs) = make_paginated_request.call_args
+
+                assert kwargs.get('query') == {
+                    'filename': 'Test_OneMin.dat',
+                    'limit': 1,
+                    'records_limit': 1,
+                }
+
+                (_, kwargs) = make_request.call_args
+
+                assert kwargs.get('body') == {
+                    'source': 'station:uuid',
+                    'files': [{
+                        'filename': 'Test_OneMin.dat',
+                        'records': [records[0]],
+                    }],
+                }
+
+            def it_skips_request_when_nothing_is_new(make_paginated_request, make_request):
+                make_paginated_request.return_value = [{
+                    'filename': 'Test_OneMin.dat',
+                    'records': [records[0]],
+                }]
+
+                client = Client(
+                    refresh_token=refresh_token,
+                    platform='platform',
+                )
+
+                client.post_data(delta_payload, delta=True)
+
+                assert make_request.call_count == 0
+
+            def it_trims_overlapping_windows_posted_by_one_client(make_request):
+                client = Client(
+                    refresh_token=refresh_token,
+                    platform='platform',
+                )
+
+                for (first, last) in [(1, 10), (5, 15), (5, 15)]:
+                    client.post_data({
+                        'source': 'station:uuid',
+                        'files': [{
+                            'filename': 'Test_OneMin.dat',
+                            'records': [{
+                                'timestamp': f'2020-01-01 00:{record_num:02}:00',
+                                'record_num': record_num,
+                                'data': {},
+                            } for record_num in range(first, last + 1)],
+                        }],
+                    }, delta=True)
+
+                assert [
+                    [record['record_num'] for record in kwargs['body']['files'][0]['records']]
+                    for (_, kwargs) in make_request.call_args_list
+                ] == [
+                    list(range(1, 11)),
+                    list(range(11, 16)),
+                ]
+
+            def it_reuses_watermarks_from_previous_uploads(
+                tmp_path,
+                make_paginated_request,
+                make_request,
+            ):
+                store = FileCheckpointStore(str(tmp_path / 'watermarks.json'))
+
+                client = Client(
+                    refresh_token=refresh_token,
+                    platform='platform',
+                    watermarks=store,
+                )
+
+                client.post_data(delta_payload, delta=True)
+
+                assert make_paginated_request.call_count == 1
+                assert make_request.call_count == 1
+
+                assert store.load('watermark:Test_OneMin.dat') == {
+                    'timestamp': '2020-01-01 00:02:00',
+                    'record_num': 3,
+                }
+
+                client = Client(
+                    refresh_token=refresh_token,
+                    platform='platform',
+                    watermarks=store,
+                )
+
+                client.post_data(delta_payload, delta=True)
+
+                assert make_paginated_request.call_count == 1
+                assert make_request.call_count == 1
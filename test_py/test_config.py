@@ -4,6 +4,23 @@ import pytest
 from src_py.grndwork_api_client import config
 
 
+def describe_get_api_url():
+    def it_returns_default_api_url(monkeypatch):
+        monkeypatch.delenv('GROUNDWORK_API_URL', False)
+
+        assert config.get_api_url() == 'https://api.grndwork.com'
+
+    def it_returns_api_url_from_environment(monkeypatch):
+        monkeypatch.setenv('GROUNDWORK_API_URL', 'http://localhost:3000')
+
+        assert config.get_api_url() == 'http://localhost:3000'
+        assert config.DATA_URL == 'http://localhost:3000/v1/data'
+
+    def it_raises_error_for_unknown_attribute():
+        with pytest.raises(AttributeError):
+            config.OTHER_URL
+
+
 def describe_get_refresh_token():
     refresh_token = {
         'subject': 'uuid',
@@ -0,0 +1,94 @@
+import pytest
+from src_py.grndwork_api_client import data_frames
+from src_py.grndwork_api_client.data_frames import (
+    data_file_to_frame,
+    data_files_to_frame,
+    records_to_frame,
+)
+
+pd = pytest.importorskip('pandas')
+
+
+def describe_data_frames():
+    data_file = {
+        'source': 'station:uuid',
+        'filename': 'Test_OneMin.dat',
+        'is_stale': False,
+        'headers': {
+            'columns': ['Ambient_Temp', 'Logged_At', 'Count', 'Status'],
+            'units': ['Deg_C', 'TS', 'RN', ''],
+        },
+        'records': [{
+            'timestamp': '2020-01-01 00:01:00',
+            'record_num': 2,
+            'data': {
+                'Ambient_Temp': 1.5,
+                'Logged_At': '2020-01-01 00:00:59',
+                'Count': 3,
+                'Status': 'NAN',
+            },
+            'qc_flags': {'Ambient_Temp': 1},
+        }, {
+            'timestamp': '2020-01-01 00:00:00',
+            'record_num': 1,
+            'data': {
+                'Ambient_Temp': 'NAN',
+                'Logged_At': None,
+                'Count': None,
+                'Status': 'OK',
+            },
+        }],
+    }
+
+    def it_builds_typed_columns_from_headers():
+        frame = data_file_to_frame(data_file, chunk_size=1)
+
+        assert list(frame.columns) == [
+            'record_num',
+            'Ambient_Temp',
+            'Ambient_Temp_qc_flag',
+            'Logged_At',
+            'Count',
+            'Status',
+        ]
+
+        assert list(frame.index) == [
+            pd.Timestamp('2020-01-01 00:01:00'),
+            pd.Timestamp('2020-01-01 00:00:00'),
+        ]
+
+        assert frame['record_num'].tolist() == [2, 1]
+        assert frame['Ambient_Temp'].dtype == 'float64'
+        assert frame['Ambient_Temp'].isna().tolist() == [False, True]
+        assert frame['Ambient_Temp_qc_flag'].isna().tolist() == [False, True]
+        assert frame['Logged_At'].iloc[0] == pd.Timestamp('2020-01-01 00:00:59')
+        assert str(frame['Count'].dtype) == 'Int64'
+        assert frame['Count'].isna().tolist() == [False, True]
+        assert frame['Status'].isna().tolist() == [True, False]
+        assert frame['Status'].iloc[1] == 'OK'
+
+    def it_selects_columns():
+        frame = data_file_to_frame(data_file, columns=['Count'])
+
+        assert list(frame.columns) == ['record_num', 'Count']
+
+    def it_builds_combined_frame_with_filename_index():
+        frame = data_files_to_frame([
+            data_file,
+            {**data_file, 'filename': 'Test_Hourly.dat', 'records': data_file['records'][:1]},
+        ])
+
+        assert frame.index.names == ['filename', 'timestamp']
+        assert frame.loc['Test_OneMin.dat']['record_num'].tolist() == [2, 1]
+        assert frame.loc['Test_Hourly.dat']['record_num'].tolist() == [2]
+
+    def it_builds_frame_from_records_without_headers():
+        frame = records_to_frame(iter(data_file['records']), columns=['Ambient_Temp'])
+
+        assert frame['Ambient_Temp'].dtype == 'float64'
+
+    def it_raises_error_without_pandas(mocker):
+        mocker.patch.object(data_frames, 'HAS_PANDAS', False)
+
+        with pytest.raises(ImportError, match='pandas is required'):
+            data_file_to_frame(data_file)
@@ -0,0 +1,55 @@
+from datetime import datetime
+import math
+
+from src_py.grndwork_api_client.decoding import decode_records
+
+
+def describe_decode_records():
+    headers = {
+        'columns': ['Ambient_Temp', 'Logged_At', 'Count', 'Status'],
+        'units': ['Deg_C', 'TS', 'RN', ''],
+    }
+
+    record = {
+        'timestamp': '2020-01-01 00:01:00',
+        'record_num': 2,
+        'data': {
+            'Ambient_Temp': 'NAN',
+            'Logged_At': '2020-01-01 00:00:59',
+            'Count': 4.0,
+            'Status': 'OK',
+        },
+        'qc_flags': {'Ambient_Temp': 1},
+    }
+
+    def it_parses_timestamps_lazily():
+        [decoded] = decode_records([record], headers)
+
+        assert decoded.timestamp == '2020-01-01 00:01:00'
+        assert decoded.record_num == 2
+        assert decoded.datetime == datetime(2020, 1, 1, 0, 1)
+        assert decoded.epoch == 1577836860
+        assert decoded.qc_flags == {'Ambient_Temp': 1}
+
+    def it_decodes_values_by_units():
+        [decoded] = decode_records([record], headers)
+
+        values = decoded.values
+
+        assert math.isnan(values['Ambient_Temp'])
+        assert values['Logged_At'] == datetime(2020, 1, 1, 0, 0, 59)
+        assert values['Count'] == 4
+        assert isinstance(values['Count'], int)
+        assert values['Status'] == 'OK'
+
+        assert decoded.values is values
+        assert decoded.data == record['data']
+
+    def it_decodes_numbers_without_headers():
+        [decoded] = decode_records([{
+            'timestamp': '2020-01-01 00:00:00',
+            'record_num': 1,
+            'data': {'SOME_KEY': '1.5', 'OTHER_KEY': 2},
+        }])
+
+        assert decoded.values == {'SOME_KEY': 1.5, 'OTHER_KEY': 2}
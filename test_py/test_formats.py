@@ -0,0 +1,127 @@
+import io
+
+from src_py.grndwork_api_client.formats import (
+    get_columns,
+    get_format,
+    get_output_filename,
+    read_records,
+    write_header,
+    write_records,
+)
+
+
+def describe_formats():
+    data_file = {
+        'source': 'station:uuid',
+        'filename': 'Test_OneMin.dat',
+        'is_stale': False,
+        'headers': {
+            'columns': ['Ambient_Temp', 'Status'],
+            'units': ['Deg_C', ''],
+            'processing': ['Avg', 'Smp'],
+            'meta': {'logger_model': 'CR1000X'},
+        },
+    }
+
+    records = [{
+        'timestamp': '2020-01-01 00:01:00',
+        'record_num': 2,
+        'data': {'Ambient_Temp': 1.5, 'Status': 'NAN'},
+        'qc_flags': {'Ambient_Temp': 1},
+    }, {
+        'timestamp': '2020-01-01 00:00:00',
+        'record_num': 1,
+        'data': {'Ambient_Temp': 2, 'Status': None},
+    }]
+
+    def _write(file_format, **kwargs):
+        f = io.StringIO()
+        columns = get_columns(data_file)
+
+        write_header(f, file_format, data_file, columns, **kwargs)
+        count = write_records(f, file_format, data_file, columns, records, **kwargs)
+
+        assert count == 2
+
+        return f.getvalue()
+
+    def it_gets_format_from_extension():
+        assert get_format('Test_OneMin.ndjson') == 'ndjson'
+        assert get_format('Test_OneMin.dat.csv') == 'csv'
+        assert get_format('Test_OneMin.dat') == 'toa5'
+
+    def it_gets_output_filename():
+        assert get_output_filename('Test_OneMin.dat', 'toa5') == 'Test_OneMin.dat'
+        assert get_output_filename('Test_OneMin.dat', 'csv') == 'Test_OneMin.dat.csv'
+
+    def it_writes_toa5():
+        assert _write('toa5').split('\r\n') == [
+            '"TOA5","uuid","CR1000X","","","","","Test_OneMin"',
+            '"TIMESTAMP","RECORD","Ambient_Temp","Status"',
+            '"TS","RN","Deg_C",""',
+            '"","","Avg","Smp"',
+            '"2020-01-01 00:01:00",2,1.5,"NAN"',
+            '"2020-01-01 00:00:00",1,2,"NAN"',
+            '',
+        ]
+
+    def it_writes_csv_with_qc_flags():
+        assert _write('csv').splitlines() == [
+            'TIMESTAMP,RECORD,Ambient_Temp,Status,Ambient_Temp_qc_flag,Status_qc_flag',
+            '2020-01-01 00:01:00,2,1.5,NAN,1,',
+            '2020-01-01 00:00:00,1,2,,,',
+        ]
+
+    def it_writes_csv_without_qc_flags():
+        assert _write('csv', include_qc_flags=False).splitlines()[0] == (
+            'TIMESTAMP,RECORD,Ambient_Temp,Status'
+        )
+
+    def it_reads_toa5():
+        result = list(read_records(io.StringIO(_write('toa5')), 'toa5', 'Test_OneMin.dat'))
+
+        (filename, headers, record) = result[0]
+
+        assert filename == 'Test_OneMin.dat'
+        assert headers == {
+            'columns': ['Ambient_Temp', 'Status'],
+            'units': ['Deg_C', ''],
+            'processing': ['Avg', 'Smp'],
+            'meta': {
+                'station_name': 'uuid',
+                'logger_model': 'CR1000X',
+                'table_name': 'Test_OneMin',
+            },
+        }
+
+        assert [record for (_, _, record) in result] == [{
+            'timestamp': '2020-01-01 00:01:00',
+            'record_num': 2,
+            'data': {'Ambient_Temp': 1.5, 'Status': 'NAN'},
+        }, {
+            'timestamp': '2020-01-01 00:00:00',
+            'record_num': 1,
+            'data': {'Ambient_Temp': 2, 'Status': 'NAN'},
+        }]
+
+    def it_reads_csv_without_qc_flags():
+        result = list(read_records(io.StringIO(_write('csv')), 'csv', 'Test_OneMin.dat'))
+
+        assert [record for (_, _, record) in result] == [{
+            'timestamp': '2020-01-01 00:01:00',
+            'record_num': 2,
+            'data': {'Ambient_Temp': 1.5, 'Status': 'NAN'},
+        }, {
+            'timestamp': '2020-01-01 00:00:00',
+            'record_num': 1,
+            'data': {'Ambient_Temp': 2, 'Status': None},
+        }]
+
+    def it_reads_ndjson():
+        result = list(read_records(io.StringIO(_write('ndjson')), 'ndjson', 'other'))
+
+        assert result[1] == ('Test_OneMin.dat', None, {
+            'timestamp': '2020-01-01 00:00:00',
+            'record_num': 1,
+            'data': {'Ambient_Temp': 2, 'Status': None},
+        })
@@ -0,0 +1,183 @@
+import pytest
+from src_py.grndwork_api_client.checkpoints import FileCheckpointStore
+from src_py.grndwork_api_client.client import Client
+from src_py.grndwork_api_client.gaps import (
+    backfill_gaps,
+    fetch_gaps,
+    find_gaps,
+    Gap,
+    GapIndex,
+    scan_gaps,
+)
+
+
+def create_records(record_nums):
+    return [
+        {
+            'timestamp': f'2020-01-01 00:{record_num:02}:00',
+            'record_num': record_num,
+            'data': {},
+        } for record_num in sorted(record_nums, reverse=True)
+    ]
+
+
+def describe_gap_index():
+    index = GapIndex([
+        Gap(first_record_num=20, last_record_num=25, after='', before=''),
+        Gap(first_record_num=3, last_record_num=4, after='', before=''),
+    ])
+
+    def it_sorts_gaps():
+        assert [gap.first_record_num for gap in index] == [3, 20]
+
+    def it_finds_gap_for_record_num():
+        assert index.find(3).first_record_num == 3
+        assert index.find(22).first_record_num == 20
+        assert index.find(5) is None
+        assert index.find(1) is None
+
+    def it_counts_missing_records():
+        assert index.missing_records == 8
+
+    def it_serializes_gaps():
+        assert list(GapIndex.from_list(index.to_list())) == list(index)
+
+
+def describe_find_gaps():
+    def it_finds_missing_record_nums():
+        index = find_gaps(create_records([1, 2, 5, 6, 10]))
+
+        assert list(index) == [
+            Gap(first_record_num=3, last_record_num=4, after='2020-01-01 00:02:00', before='2020-01-01 00:05:00'),  # noqa: E501
+            Gap(first_record_num=7, last_record_num=9, after='2020-01-01 00:06:00', before='2020-01-01 00:10:00'),  # noqa: E501
+        ]
+
+    def it_ignores_record_num_resets():
+        index = find_gaps([
+            {'timestamp': '2020-01-01 00:01:00', 'record_num': 1, 'data': {}},
+            {'timestamp': '2020-01-01 00:00:00', 'record_num': 500, 'data': {}},
+        ])
+
+        assert len(index) == 0
+
+
+def describe_scan_gaps():
+    @pytest.fixture(name='client')
+    def fixture_client(mocker):
+        client = mocker.MagicMock(spec=Client)
+        records = create_records([1, 2, 5, 6, 10])
+
+        def get_records(filename, *, records_before=None, **kwargs):
+            return iter([
+                record for record in records
+                if not records_before or record['timestamp'] <= records_before
+            ])
+
+        client.get_records.side_effect = get_records
+
+        return client
+
+    def it_scans_records_for_file(client):
+        index = scan_gaps(client, 'Test_OneMin.dat')
+
+        assert [gap.first_record_num for gap in index] == [3, 7]
+
+        (args, kwargs) = client.get_records.call_args
+
+        assert args == ('Test_OneMin.dat',)
+        assert kwargs.get('include_qc_flags') is False
+
+    def it_resumes_from_checkpoint(tmp_path, client):
+        checkpoint = FileCheckpointStore(str(tmp_path / 'checkpoints.json'))
+
+        checkpoint.save('gaps:Test_OneMin.dat::', {
+            'gaps': [{
+                'first_record_num': 7,
+                'last_record_num': 9,
+                'after': '2020-01-01 00:06:00',
+                'before': '2020-01-01 00:10:00',
+            }],
+            'previous': {'timestamp': '2020-01-01 00:06:00', 'record_num': 6},
+            'complete': False,
+        })
+
+        index = scan_gaps(client, 'Test_OneMin.dat', checkpoint=checkpoint)
+
+        (_, kwargs) = client.get_records.call_args
+
+        assert kwargs.get('records_before') == '2020-01-01 00:06:00'
+        assert [gap.first_record_num for gap in index] == [3, 7]
+        assert checkpoint.load('gaps:Test_OneMin.dat::')['complete'] is True
+
+    def it_skips_completed_scans(tmp_path, client):
+        checkpoint = FileCheckpointStore(str(tmp_path / 'checkpoints.json'))
+
+        scan_gaps(client, 'Test_OneMin.dat', checkpoint=checkpoint)
+        index = scan_gaps(client, 'Test_OneMin.dat', checkpoint=checkpoint)
+
+        assert client.get_records.call_count == 1
+        assert [gap.first_record_num for gap in index] == [3, 7]
+
+
+def describe_fetch_gaps():
+    def it_requests_only_gap_ranges(mocker):
+        client = mocker.MagicMock(spec=Client)
+        client.get_records.return_value = iter(create_records([2, 3, 4, 5]))
+
+        gap = Gap(first_record_num=3, last_record_num=4, after='2020-01-01 00:02:00', before='2020-01-01 00:05:00')  # noqa: E501
+
+        results = list(fetch_gaps(client, 'Test_OneMin.dat', [gap]))
+
+        (_, kwargs) = client.get_records.call_args
+
+        assert kwargs.get('records_after') == '2020-01-01 00:02:00'
+        assert kwargs.get('records_before') == '2020-01-01 00:05:00'
+
+        assert results == [(gap, create_records([3, 4]))]
+
+
+def describe_backfill_gaps():
+    gaps = [
+        Gap(first_record_num=3, last_record_num=4, after='', before=''),
+        Gap(first_record_num=100, last_record_num=349, after='', before=''),
+    ]
+
+    def _get_records(gap):
+        return create_records(range(gap.first_record_num - 1, gap.last_record_num + 2))
+
+    def it_posts_records_for_gaps_in_batches(mocker):
+        client = mocker.MagicMock(spec=Client)
+
+        posted = backfill_gaps(
+            client,
+            'Test_OneMin.dat',
+            gaps,
+            source='station:uuid',
+            get_records=_get_records,
+        )
+
+        assert posted == 252
+        assert client.post_data.call_count == 4
+
+        payload = client.post_data.call_args_list[0][0][0]
+
+        assert payload['source'] == 'station:uuid'
+        assert payload['files'][0]['filename'] == 'Test_OneMin.dat'
+        assert [record['record_num'] for record in payload['files'][0]['records']] == [4, 3]
+
+    def it_skips_completed_gaps(mocker, tmp_path):
+        client = mocker.MagicMock(spec=Client)
+        checkpoint = FileCheckpointStore(str(tmp_path / 'checkpoints.json'))
+        checkpoint.save('backfill:Test_OneMin.dat', {'completed': [3]})
+
+        posted = backfill_gaps(
+            client,
+            'Test_OneMin.dat',
+            gaps,
+            source='station:uuid',
+            get_records=_get_records,
+            checkpoint=checkpoint,
+        )
+
+        assert posted == 250
+        assert checkpoint.load('backfill:Test_OneMin.dat') == {'completed': [3, 100]}
@@ -0,0 +1,164 @@
+from threading import Event, Lock
+
+import pytest
+from src_py.grndwork_api_client.hedging import RequestHedger
+
+
+def _make_hedger(**kwargs):
+    hedger = RequestHedger(min_samples=1, min_delay=0.01, budget=1, **kwargs)
+    hedger.record(0.01)
+
+    return hedger
+
+
+def describe_request_hedger():
+    def describe_get_delay():
+        def it_waits_for_enough_samples():
+            hedger = RequestHedger(min_samples=2)
+            hedger.record(0.5)
+
+            assert hedger.get_delay() is None
+
+        def it_returns_latency_percentile():
+            hedger = RequestHedger(percentile=90, min_samples=1, min_delay=0)
+
+            for latency in range(1, 11):
+                hedger.record(latency / 10)
+
+            assert hedger.get_delay() == 1.0
+
+        def it_returns_minimum_delay():
+            hedger = RequestHedger(min_samples=1, min_delay=0.2)
+            hedger.record(0.01)
+
+            assert hedger.get_delay() == 0.2
+
+        def it_keeps_recent_latencies():
+            hedger = RequestHedger(window=2, min_samples=1, min_delay=0)
+
+            for latency in [5, 1, 2]:
+                hedger.record(latency)
+
+            assert hedger.get_delay() == 2
+
+        def it_raises_error_for_invalid_percentile():
+            with pytest.raises(ValueError, match='Percentile must be between 0 and 100'):
+                RequestHedger(percentile=0)
+
+    def describe_do():
+        def it_sends_single_request_without_samples():
+            hedger = RequestHedger()
+            calls = []
+
+            assert hedger.do(lambda: calls.append(1) or 'result') == 'result'
+            assert calls == [1]
+            assert hedger.requests == 1
+            assert hedger.hedges == 0
+
+        def it_returns_first_response():
+            hedger = _make_hedger()
+
+            assert hedger.do(lambda: 'result') == 'result'
+            assert hedger.hedges == 0
+
+        def it_sends_hedged_request_when_slow():
+            hedger = _make_hedger()
+            released = Event()
+            discarded = []
+            lock = Lock()
+            calls = []
+
+            def send():
+                with lock:
+                    calls.append(1)
+                    is_first = len(calls) == 1
+
+                if is_first:
+                    released.wait(5)
+                    return 'slow'
+
+                return 'fast'
+
+            assert hedger.do(send, discard=discarded.append) == 'fast'
+
+            released.set()
+
+            assert hedger.hedges == 1
+            assert hedger.hedge_wins == 1
+
+        def it_discards_losing_response():
+            hedger = _make_hedger()
+            released = Event()
+            discarded = Event()
+            calls = []
+
+            def send():
+                calls.append(1)
+
+                if len(calls) == 1:
+                    released.wait(5)
+                    return 'slow'
+
+                return 'fast'
+
+            def discard(result):
+                assert result == 'slow'
+                discarded.set()
+
+            assert hedger.do(send, discard=discard) == 'fast'
+
+            released.set()
+
+            assert discarded.wait(5)
+
+        def it_caps_hedged_requests():
+            hedger = RequestHedger(min_samples=1, min_delay=0.01, budget=0)
+            hedger.record(0.01)
+            calls = []
+
+            def send():
+                calls.append(1)
+
+                if len(calls) == 1:
+                    Event().wait(0.05)
+
+                return 'result'
+
+            assert hedger.do(send) == 'result'
+            assert calls == [1]
+            assert hedger.hedges == 0
+
+        def it_returns_hedged_response_when_first_fails():
+            hedger = _make_hedger()
+            calls = []
+
+            def send():
+                calls.append(1)
+
+                if len(calls) == 1:
+                    Event().wait(0.05)
+                    raise ValueError('Connection reset')
+
+                Event().wait(0.1)
+
+                return 'result'
+
+            assert hedger.do(send) == 'result'
+
+        def it_raises_error_when_all_requests_fail():
+            hedger = _make_hedger()
+
+            def send():
+                raise ValueError('Connection reset')
+
+            with pytest.raises(ValueError, match='Connection reset'):
+                hedger.do(send)
+
+        def it_raises_interrupts_of_requests():
+            hedger = _make_hedger()
+
+            def send():
+                raise KeyboardInterrupt()
+
+            with pytest.raises(KeyboardInterrupt):
+                hedger.do(send)
@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous enough for slow machines, while catching an eager import of requests or pandas
+MAX_IMPORT_TIME = 0.1
+
+
+def _run(code, *args):
+    return subprocess.run(
+        [sys.executable, *args, '-c', code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _get_loaded_modules(statement):
+    result = _run(f'import sys; {statement}; print(" ".join(sys.modules))')
+
+    return set(result.stdout.split())
+
+
+def describe_import_time():
+    @pytest.mark.parametrize('statement', [
+        'import src_py.grndwork_api_client',
+        'from src_py.grndwork_api_client import Client, create_client, ResponseCache',
+    ])
+    def it_does_not_import_heavy_dependencies(statement):
+        modules = _get_loaded_modules(statement)
+
+        for module in ['requests', 'jwt', 'numpy', 'pandas']:
+            assert module not in modules
+
+    def it_imports_dependencies_on_first_use():
+        modules = _get_loaded_modules(
+            'from src_py.grndwork_api_client.make_request import get_session; get_session()',
+        )
+
+        assert 'requests' in modules
+
+    def it_imports_package_quickly():
+        result = _run('import src_py.grndwork_api_client', '-X', 'importtime')
+
+        (line,) = [
+            line for line in result.stderr.splitlines()
+            if line.endswith('| src_py.grndwork_api_client')
+        ]
+
+        cumulative = int(line.split('|')[1]) / 1000000
+
+        assert cumulative < MAX_IMPORT_TIME
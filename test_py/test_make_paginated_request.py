@@ -25,7 +25,7 @@ def describe_make_paginated_request():
             )
 
         return mocker.patch(
-            target='src_py.grndwork_api_client.make_paginated_request.make_request',
+            target='src_py.grndwork_api_client.paginated_iterator.make_request',
             spec=_make_request,
             side_effect=make_request_mock,
         )
@@ -1,16 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import json
+from threading import Event
 
 import pytest
 import requests as _requests
 from src_py.grndwork_api_client.config import TOKENS_URL as API_URL
-from src_py.grndwork_api_client.make_request import make_request, RequestError
-
-
-@pytest.fixture(name='requests', autouse=True)
-def fixture_requests(mocker):
-    return mocker.patch(
-        target='src_py.grndwork_api_client.make_request.requests',
-        spec=_requests,
+from src_py.grndwork_api_client.hedging import RequestHedger
+from src_py.grndwork_api_client.make_request import (
+    coalesced_requests,
+    get_session,
+    make_request,
+    open_connections,
+    POOL_MAXSIZE,
+    RequestError,
+)
+from src_py.grndwork_api_client.response_cache import ResponseCache
+
+
+@pytest.fixture(name='session', autouse=True)
+def fixture_session(mocker):
+    session = mocker.MagicMock(
+        spec=_requests.Session,
         **{
             'request.return_value': mocker.MagicMock(**{
                 'status_code': 200,
@@ -21,21 +32,27 @@ def fixture_requests(mocker):
                     'token': 'access_token',
                 },
             }),
-            'RequestException': _requests.RequestException,
         },
     )
 
+    mocker.patch(
+        target='src_py.grndwork_api_client.make_request.get_session',
+        return_value=session,
+    )
+
+    return session
+
 
 def describe_make_request():
-    def it_makes_request_with_auth_token(requests):
+    def it_makes_request_with_auth_token(session):
         make_request(
             url=API_URL,
             token='auth token',
         )
 
-        assert requests.request.call_count == 1
+        assert session.request.call_count == 1
 
-        (_, kwargs) = requests.request.call_args
+        (_, kwargs) = session.request.call_args
 
         assert kwargs.get('url') == API_URL
         assert kwargs.get('method') == 'GET'
@@ -46,7 +63,7 @@ def describe_make_request():
 
         assert kwargs.get('params') == {}
 
-    def it_makes_request_with_query_params(requests):
+    def it_makes_request_with_query_params(session):
         make_request(
             url=API_URL,
             token='auth token',
@@ -55,28 +72,28 @@ def describe_make_request():
             },
         )
 
-        assert requests.request.call_count == 1
+        assert session.request.call_count == 1
 
-        (_, kwargs) = requests.request.call_args
+        (_, kwargs) = session.request.call_args
 
         assert kwargs.get('params') == {
             'limit': 10,
         }
 
-    def it_makes_request_with_method(requests):
+    def it_makes_request_with_method(session):
         make_request(
             url=API_URL,
             token='auth token',
             method='POST',
         )
 
-        assert requests.request.call_count == 1
+        assert session.request.call_count == 1
 
-        (_, kwargs) = requests.request.call_args
+        (_, kwargs) = session.request.call_args
 
         assert kwargs.get('method') == 'POST'
 
-    def it_makes_request_with_body(requests):
+    def it_makes_request_with_body(session):
         make_request(
             url=API_URL,
             token='auth token',
@@ -86,9 +103,9 @@ def describe_make_request():
             },
         )
 
-        assert requests.request.call_count == 1
+        assert session.request.call_count == 1
 
-        (_, kwargs) = requests.request.call_args
+        (_, kwargs) = session.request.call_args
 
         assert kwargs.get('headers') == {
             'Authorization': 'Bearer auth token',
@@ -99,7 +116,7 @@ def describe_make_request():
             'test': 'test',
         })
 
-    def it_makes_request_with_additional_headers(requests):
+    def it_makes_request_with_additional_headers(session):
         make_request(
             url=API_URL,
             token='auth token',
@@ -112,9 +129,9 @@ def describe_make_request():
             },
         )
 
-        assert requests.request.call_count == 1
+        assert session.request.call_count == 1
 
-        (_, kwargs) = requests.request.call_args
+        (_, kwargs) = session.request.call_args
 
         assert kwargs.get('headers') == {
             'Authorization': 'Bearer auth token',
@@ -122,8 +139,8 @@ def describe_make_request():
             'X-Test': 'test_value',
         }
 
-    def it_raises_error_when_bad_request(requests):
-        requests.request.return_value.status_code = 400
+    def it_raises_error_when_bad_request(session):
+        session.request.return_value.status_code = 400
 
         with pytest.raises(RequestError, match='Bad Request'):
             make_request(
@@ -131,8 +148,8 @@ def describe_make_request():
                 token='auth token',
             )
 
-    def it_raises_error_when_bad_response_body(requests):
-        requests.request.return_value.json.side_effect = _requests.JSONDecodeError('Invalid', '', 0)
+    def it_raises_error_when_bad_response_body(session):
+        session.request.return_value.json.side_effect = _requests.JSONDecodeError('Invalid', '', 0)
 
         with pytest.raises(RequestError, match='Failed to parse response payload'):
             make_request(
@@ -140,7 +157,7 @@ def describe_make_request():
                 token='auth token',
             )
 
-    def it_returns_payload_and_response(requests):
+    def it_returns_payload_and_response(session):
         payload, resp = make_request(
             url=API_URL,
             token='auth token',
@@ -151,3 +168,237 @@ def describe_make_request():
         }
 
         assert resp.headers.get('Content-Type') == 'application/json'
+
+    def describe_coalescing():
+        @pytest.fixture(name='do', autouse=True)
+        def fixture_do(mocker):
+            return mocker.spy(coalesced_requests, 'do')
+
+        def it_coalesces_get_requests(session, do):
+            make_request(
+                url=API_URL,
+                token='auth token',
+                query={'limit': 10},
+            )
+
+            assert do.call_count == 1
+            assert session.request.call_count == 1
+
+        def it_uses_same_key_for_identical_requests(do):
+            for _ in range(2):
+                make_request(
+                    url=API_URL,
+                    token='auth token',
+                    query={'limit': 10, 'offset': 0},
+                )
+
+            assert do.call_args_list[0][0][0] == do.call_args_list[1][0][0]
+
+        def it_uses_different_keys_for_different_tokens(do):
+            for token in ['first token', 'second token']:
+                make_request(
+                    url=API_URL,
+                    token=token,
+                )
+
+            assert do.call_args_list[0][0][0] != do.call_args_list[1][0][0]
+
+        def it_copies_results_for_coalesced_callers(session):
+            started = Event()
+            release = Event()
+            resp = session.request.return_value
+            resp.json.return_value = {'records': [1, 2, 3]}
+
+            def request_mock(**kwargs):
+                started.set()
+                release.wait(5)
+                return resp
+
+            session.request.side_effect = request_mock
+            hits = coalesced_requests.hits
+
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                request = partial(make_request, url=API_URL, token='auth token')
+
+                leader = executor.submit(request)
+                started.wait(5)
+
+                follower = executor.submit(request)
+
+                while coalesced_requests.hits == hits:
+                    pass
+
+                release.set()
+
+            (payload, _) = leader.result()
+            payload['records'].clear()
+
+            (payload, _) = follower.result()
+
+            assert payload == {'records': [1, 2, 3]}
+            assert session.request.call_count == 1
+
+        def it_does_not_coalesce_post_requests(do):
+            make_request(
+                url=API_URL,
+                token='auth token',
+                method='POST',
+                body={'test': 'test'},
+            )
+
+            assert do.call_count == 0
+
+        def it_coalesces_post_requests_when_enabled(do):
+            make_request(
+                url=API_URL,
+                token='auth token',
+                method='POST',
+                body={'test': 'test'},
+                coalesce=True,
+            )
+
+            assert do.call_count == 1
+
+        def it_does_not_coalesce_get_requests_when_disabled(do):
+            make_request(
+                url=API_URL,
+                token='auth token',
+                coalesce=False,
+            )
+
+            assert do.call_count == 0
+
+    def describe_caching():
+        @pytest.fixture(name='cache')
+        def fixture_cache():
+            return ResponseCache()
+
+        @pytest.fixture(autouse=True)
+        def _set_response_headers(session):
+            session.request.return_value.headers = {
+                'Content-Type': 'application/json',
+                'ETag': '"etag"',
+            }
+            session.request.return_value.content = b'{"token": "access_token"}'
+
+        def it_revalidates_cached_responses(session, cache):
+            make_request(url=API_URL, token='auth token', cache=cache)
+
+            session.request.return_value.status_code = 304
+            session.request.return_value.json.reset_mock()
+
+            payload, resp = make_request(url=API_URL, token='auth token', cache=cache)
+
+            assert session.request.call_count == 2
+
+            (_, kwargs) = session.request.call_args
+
+            assert kwargs.get('headers') == {
+                'Authorization': 'Bearer auth token',
+                'If-None-Match': '"etag"',
+            }
+
+            assert session.request.return_value.json.call_count == 0
+            assert payload == {'token': 'access_token'}
+            assert resp.status_code == 200
+            assert resp.headers.get('ETag') == '"etag"'
+
+        def it_returns_fresh_responses_without_request(session, cache):
+            session.request.return_value.headers['Cache-Control'] = 'max-age=60'
+
+            make_request(url=API_URL, token='auth token', cache=cache)
+            payload, _ = make_request(url=API_URL, token='auth token', cache=cache)
+
+            assert session.request.call_count == 1
+            assert payload == {'token': 'access_token'}
+
+        def it_returns_copies_of_cached_payloads(session, cache):
+            session.request.return_value.headers['Cache-Control'] = 'max-age=60'
+
+            payload, _ = make_request(url=API_URL, token='auth token', cache=cache)
+            payload['token'] = 'changed'
+
+            payload, _ = make_request(url=API_URL, token='auth token', cache=cache)
+            payload['token'] = 'changed'
+
+            payload, _ = make_request(url=API_URL, token='auth token', cache=cache)
+
+            assert session.request.call_count == 1
+            assert payload == {'token': 'access_token'}
+
+        def it_does_not_share_responses_between_tokens(session, cache):
+            session.request.return_value.headers['Cache-Control'] = 'max-age=60'
+
+            make_request(url=API_URL, token='auth token', cache=cache)
+            make_request(url=API_URL, token='other token', cache=cache)
+
+            assert session.request.call_count == 2
+
+        def it_does_not_cache_no_store_responses(session, cache):
+            session.request.return_value.headers['Cache-Control'] = 'no-store'
+
+            make_request(url=API_URL, token='auth token', cache=cache)
+
+            assert cache.size == 0
+
+        def it_does_not_cache_post_requests(cache):
+            make_request(url=API_URL, token='auth token', method='POST', cache=cache)
+
+            assert cache.size == 0
+
+        def it_caches_by_query(session, cache):
+            session.request.return_value.headers['Cache-Control'] = 'max-age=60'
+
+            make_request(url=API_URL, token='auth token', query={'offset': 0}, cache=cache)
+            make_request(url=API_URL, token='auth token', query={'offset': 100}, cache=cache)
+
+            assert session.request.call_count == 2
+
+    def describe_hedging():
+        @pytest.fixture(name='hedge')
+        def fixture_hedge(mocker):
+            hedge = RequestHedger()
+
+            mocker.patch.object(hedge, 'do', side_effect=lambda fn, discard: fn())
+
+            return hedge
+
+        def it_streams_hedged_get_requests(session, hedge):
+            make_request(url=API_URL, token='auth token', hedge=hedge)
+
+            assert hedge.do.call_count == 1
+
+            (_, kwargs) = session.request.call_args
+
+            assert kwargs.get('stream') is True
+
+        def it_does_not_hedge_post_requests(session, hedge):
+            make_request(url=API_URL, token='auth token', method='POST', hedge=hedge)
+
+            assert hedge.do.call_count == 0
+
+            (_, kwargs) = session.request.call_args
+
+            assert 'stream' not in kwargs
+
+
+def describe_get_session():
+    def it_returns_shared_pooled_session():
+        session = get_session()
+
+        assert session is get_session()
+        assert session.get_adapter('https://api.grndwork.com')._pool_maxsize == POOL_MAXSIZE
+
+
+def describe_open_connections():
+    def it_makes_concurrent_requests_to_open_connections(session):
+        open_connections(API_URL, 4)
+
+        assert session.head.call_count == 4
+
+    def it_ignores_failed_requests(session):
+        session.head.side_effect = _requests.ConnectionError('Failed')
+
+        open_connections(API_URL, 2)
+
+        assert session.head.call_count == 2
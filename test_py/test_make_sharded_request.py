@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta
+
+import pytest
+from src_py.grndwork_api_client.config import DATA_URL
+from src_py.grndwork_api_client.make_paginated_request import make_paginated_request as _make_paginated_request  # noqa: E501
+from src_py.grndwork_api_client.make_request import make_request as _make_request
+from src_py.grndwork_api_client.make_sharded_request import make_sharded_request
+
+
+def describe_make_sharded_request():
+    start = datetime(2020, 1, 1)
+
+    records = [
+        {
+            'timestamp': (start + timedelta(minutes=index)).strftime('%Y-%m-%d %H:%M:%S'),
+            'record_num': index + 1,
+            'data': {'SOME_KEY': index},
+        } for index in range(1440)
+    ]
+
+    @pytest.fixture(name='make_paginated_request', autouse=True)
+    def fixture_make_paginated_request(mocker):
+        def make_paginated_request_mock(*args, **kwargs):
+            return map(kwargs['transform'], [{
+                'source': 'station:uuid',
+                'filename': 'Test_OneMin.dat',
+                'is_stale': False,
+                'headers': {'columns': ['SOME_KEY'], 'units': ['']},
+            }])
+
+        return mocker.patch(
+            target='src_py.grndwork_api_client.make_sharded_request.make_paginated_request',
+            spec=_make_paginated_request,
+            side_effect=make_paginated_request_mock,
+        )
+
+    @pytest.fixture(name='make_request', autouse=True)
+    def fixture_make_request(mocker):
+        def make_request_mock(*args, **kwargs):
+            query = kwargs.get('query') or {}
+
+            results = [
+                record for record in reversed(records)
+                if query['records_after'] <= record['timestamp'] <= query['records_before']
+            ][:query['records_limit']]
+
+            return ([{'filename': query['filename'], 'records': results}], mocker.MagicMock())
+
+        return mocker.patch(
+            target='src_py.grndwork_api_client.make_sharded_request.make_request',
+            spec=_make_request,
+            side_effect=make_request_mock,
+        )
+
+    def it_requests_files_without_records(make_paginated_request):
+        list(make_sharded_request(
+            url=DATA_URL,
+            token='auth token',
+            query={
+                'filename': 'Test_*',
+                'records_after': '2020-01-01 00:00:00',
+                'records_before': '2020-01-01 23:59:00',
+            },
+            page_size=100,
+            max_workers=4,
+        ))
+
+        (_, kwargs) = make_paginated_request.call_args
+
+        assert kwargs.get('query') == {'filename': 'Test_*'}
+
+    def it_splits_window_into_shards(make_request):
+        results = list(make_sharded_request(
+            url=DATA_URL,
+            token='auth token',
+            query={
+                'records_after': '2020-01-01 00:00:00',
+                'records_before': '2020-01-01 23:59:00',
+            },
+            page_size=100,
+            max_workers=4,
+        ))
+
+        assert make_request.call_count == 4
+
+        windows = sorted(
+            (kwargs['query']['records_after'], kwargs['query']['records_before'])
+            for (_, kwargs) in make_request.call_args_list
+        )
+
+        assert windows[0][0] == '2020-01-01 00:00:00'
+        assert windows[-1][1] == '2020-01-01 23:59:00'
+
+        for (previous, current) in zip(windows, windows[1:]):
+            assert previous[1] == current[0]
+
+        assert len(results) == 1
+        assert results[0]['filename'] == 'Test_OneMin.dat'
+        assert results[0]['records'] == list(reversed(records))
+
+    def it_requests_remainder_of_truncated_shards(make_request):
+        results = list(make_sharded_request(
+            url=DATA_URL,
+            token='auth token',
+            query={
+                'records_after': '2020-01-01 00:00:00',
+                'records_before': '2020-01-01 23:59:00',
+            },
+            page_size=100,
+            max_workers=2,
+            shard_records_limit=100,
+        ))
+
+        assert make_request.call_count > 2
+
+        for (_, kwargs) in make_request.call_args_list:
+            assert kwargs['query']['records_limit'] == 100
+
+        assert results[0]['records'] == list(reversed(records))
+
+    def it_limits_records_to_most_recent(make_request):
+        results = list(make_sharded_request(
+            url=DATA_URL,
+            token='auth token',
+            query={
+                'records_after': '2020-01-01 00:00:00',
+                'records_before': '2020-01-01 23:59:00',
+                'records_limit': 150,
+            },
+            page_size=100,
+            max_workers=2,
+            shard_records_limit=100,
+        ))
+
+        assert results[0]['records'] == list(reversed(records))[:150]
+
+    def it_applies_transform_to_data_files():
+        results = list(make_sharded_request(
+            url=DATA_URL,
+            token='auth token',
+            query={
+                'records_after': '2020-01-01 00:00:00',
+                'records_before': '2020-01-01 00:09:00',
+            },
+            page_size=100,
+            max_workers=4,
+            transform=lambda data_file: {**data_file, 'records': data_file['records'][:1]},
+        ))
+
+        assert results[0]['records'] == [records[9]]
+
+    def it_raises_error_when_window_is_open():
+        with pytest.raises(ValueError, match='require records_after and records_before'):
+            make_sharded_request(
+                url=DATA_URL,
+                token='auth token',
+                query={
+                    'records_after': '2020-01-01 00:00:00',
+                },
+                page_size=100,
+                max_workers=4,
+            )
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import pytest
+from src_py.grndwork_api_client.config import DATA_URL
+from src_py.grndwork_api_client.make_request import make_request as _make_request
+from src_py.grndwork_api_client.make_windowed_request import make_windowed_request
+
+
+def describe_make_windowed_request():
+    start = datetime(2020, 1, 1)
+
+    records = [
+        {
+            'timestamp': (start + timedelta(minutes=index)).strftime('%Y-%m-%d %H:%M:%S'),
+            'record_num': index + 1,
+            'data': {'SOME_KEY': index},
+        } for index in range(250)
+    ]
+
+    @pytest.fixture(name='make_request', autouse=True)
+    def fixture_make_request(mocker):
+        def make_request_mock(*args, **kwargs):
+            query = kwargs.get('query') or {}
+            after = query.get('records_after', '')
+            before = query.get('records_before', '9999')
+
+            results = [
+                record for record in reversed(records)
+                if after <= record['timestamp'] <= before
+            ][:query['records_limit']]
+
+            return ([{'filename': query['filename'], 'records': results}], mocker.MagicMock())
+
+        return mocker.patch(
+            target='src_py.grndwork_api_client.make_windowed_request.make_request',
+            spec=_make_request,
+            side_effect=make_request_mock,
+        )
+
+    def it_pages_by_timestamp(make_request):
+        windows = list(make_windowed_request(
+            url=DATA_URL,
+            token='auth token',
+            filename='Test_OneMin.dat',
+            window_size=100,
+        ))
+
+        assert make_request.call_count == 3
+
+        assert make_request.call_args_list[0][1].get('query') == {
+            'filename': 'Test_OneMin.dat',
+            'limit': 1,
+            'records_limit': 100,
+        }
+
+        assert make_request.call_args_list[1][1].get('query') == {
+            'filename': 'Test_OneMin.dat',
+            'limit': 1,
+            'records_limit': 100,
+            'records_before': records[150]['timestamp'],
+        }
+
+        assert [len(window) for window in windows] == [100, 99, 51]
+        assert [record for window in windows for record in window] == list(reversed(records))
+
+    def it_pages_within_requested_window(make_request):
+        windows = list(make_windowed_request(
+            url=DATA_URL,
+            token='auth token',
+            filename='Test_OneMin.dat',
+            records_after=records[50]['timestamp'],
+            records_before=records[199]['timestamp'],
+            window_size=100,
+        ))
+
+        assert make_request.call_count == 2
+
+        for (_, kwargs) in make_request.call_args_list:
+            assert kwargs['query']['records_after'] == records[50]['timestamp']
+
+        assert [record for window in windows for record in window] == list(
+            reversed(records[50:200]),
+        )
+
+    def it_transforms_each_window(make_request):
+        windows = list(make_windowed_request(
+            url=DATA_URL,
+            token='auth token',
+            filename='Test_OneMin.dat',
+            window_size=100,
+            transform=lambda window: [{**record, 'qc_flags': {}} for record in window],
+        ))
+
+        assert all(record['qc_flags'] == {} for window in windows for record in window)
@@ -0,0 +1,148 @@
+import pytest
+from src_py.grndwork_api_client.checkpoints import Checkpoint, FileCheckpointStore
+from src_py.grndwork_api_client.config import STATIONS_URL
+from src_py.grndwork_api_client.make_request import make_request as _make_request
+from src_py.grndwork_api_client.paginated_iterator import PaginatedIterator
+
+
+def describe_paginated_iterator():
+    @pytest.fixture(name='make_request', autouse=True)
+    def fixture_make_request(mocker):
+        def make_request_mock(*args, **kwargs):
+            query = kwargs.get('query') or {}
+            limit = query.get('limit') or 100
+            offset = query.get('offset') or 0
+
+            first = offset + 1
+            last = min(offset + limit, 165)
+
+            return (
+                [{'id': item} for item in range(first, last + 1)],
+                mocker.MagicMock(**{
+                    'content': b'x' * (last - first + 1),
+                    'headers': {
+                        'Content-Range': f'items {first}-{last}/165',
+                    },
+                }),
+            )
+
+        return mocker.patch(
+            target='src_py.grndwork_api_client.paginated_iterator.make_request',
+            spec=_make_request,
+            side_effect=make_request_mock,
+        )
+
+    def it_exposes_count_once_known():
+        iterator = PaginatedIterator(STATIONS_URL, token='auth token', page_size=100)
+
+        assert iterator.count is None
+
+        next(iterator)
+
+        assert iterator.count == 165
+
+    def it_exposes_progress():
+        iterator = PaginatedIterator(STATIONS_URL, token='auth token', page_size=50)
+
+        for _ in range(60):
+            next(iterator)
+
+        assert iterator.offset == 60
+        assert iterator.items_fetched == 100
+        assert iterator.pages_fetched == 2
+        assert iterator.bytes_read == 100
+
+    def it_seeks_to_offset(make_request):
+        iterator = PaginatedIterator(STATIONS_URL, token='auth token', page_size=50)
+
+        iterator.seek(120)
+
+        assert [item['id'] for item in iterator] == list(range(121, 166))
+        assert make_request.call_count == 1
+        assert make_request.call_args[1].get('query') == {'limit': 50, 'offset': 120}
+
+    def it_seeks_within_limit(make_request):
+        iterator = PaginatedIterator(
+            STATIONS_URL,
+            token='auth token',
+            query={'limit': 100},
+            page_size=50,
+        )
+
+        iterator.seek(90)
+
+        assert [item['id'] for item in iterator] == list(range(91, 101))
+        assert make_request.call_args[1].get('query') == {'limit': 10, 'offset': 90}
+
+    def it_transforms_items():
+        iterator = PaginatedIterator(
+            STATIONS_URL,
+            token='auth token',
+            page_size=100,
+            transform=lambda item: item['id'],
+        )
+
+        assert list(iterator) == list(range(1, 166))
+
+    def it_prefetches_next_page(make_request):
+        iterator = PaginatedIterator(
+            STATIONS_URL,
+            token='auth token',
+            page_size=100,
+            prefetch=True,
+        )
+
+        next(iterator)
+        iterator._future.result()
+
+        assert make_request.call_count == 2
+        assert make_request.call_args[1].get('query') == {'limit': 100, 'offset': 100}
+
+        assert len(list(iterator)) == 164
+        assert make_request.call_count == 2
+
+    def it_cancels_prefetch_when_closed():
+        iterator = PaginatedIterator(
+            STATIONS_URL,
+            token='auth token',
+            page_size=100,
+            prefetch=True,
+        )
+
+        next(iterator)
+        iterator.close()
+
+        assert iterator._future is None
+        assert iterator._executor is None
+        assert list(iterator) == []
+
+    def it_closes_when_used_as_context_manager():
+        with PaginatedIterator(STATIONS_URL, token='auth token', page_size=100) as iterator:
+            next(iterator)
+
+        assert list(iterator) == []
+
+    def it_resumes_from_checkpoint(tmp_path, make_request):
+        store = FileCheckpointStore(str(tmp_path / 'checkpoints.json'))
+
+        iterator = PaginatedIterator(STATIONS_URL, token='auth token', page_size=50)
+        iterator.resume_from(Checkpoint(store, 'key', interval=10))
+
+        for _ in range(61):
+            next(iterator)
+
+        iterator.close()
+
+        assert store.load('key')['offset'] == 60
+
+        iterator = PaginatedIterator(STATIONS_URL, token='auth token', page_size=50)
+        iterator.resume_from(Checkpoint(store, 'key', interval=10))
+
+        assert [item['id'] for item in iterator] == list(range(61, 166))
+        assert make_request.call_args[1].get('query') == {'limit': 50, 'offset': 160}
+        assert store.load('key')['complete']
+
+        iterator = PaginatedIterator(STATIONS_URL, token='auth token', page_size=50)
+        iterator.resume_from(Checkpoint(store, 'key', interval=10))
+
+        assert list(iterator) == []
@@ -0,0 +1,256 @@
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from operator import itemgetter
+from threading import Lock, Thread
+from urllib.parse import parse_qs, urlparse
+
+import jwt
+import pytest
+from src_py.grndwork_api_client import access_tokens
+from src_py.grndwork_api_client.client import Client
+from src_py.grndwork_api_client.config import DATA_URL
+from src_py.grndwork_api_client.make_paginated_request import make_paginated_request as _make_paginated_request  # noqa: E501
+from src_py.grndwork_api_client.process_pool import get_data_in_processes
+
+
+def count_records(data_file):
+    return (data_file['filename'], len(data_file.get('records', [])))
+
+
+def describe_get_data_in_processes():
+    refresh_token = {
+        'subject': 'uuid',
+        'token': 'refresh_token',
+    }
+
+    data_files = [{
+        'source': f'station:{station}',
+        'filename': filename,
+        'is_stale': False,
+        'headers': {'columns': [], 'units': []},
+    } for (station, filename) in [
+        ('first', 'Test_First_OneMin.dat'),
+        ('first', 'Test_First_Hourly.dat'),
+        ('second', 'Test_Second_OneMin.dat'),
+    ]]
+
+    @pytest.fixture(autouse=True)
+    def _use_thread_executor(mocker):
+        # Run workers as threads so the mocks below apply to them
+        mocker.patch(
+            target='src_py.grndwork_api_client.process_pool.ProcessPoolExecutor',
+            new=ThreadPoolExecutor,
+        )
+
+    access_token = jwt.encode({'exp': 4102444800}, 'x' * 32, algorithm='HS256')
+
+    @pytest.fixture(name='create_access_token', autouse=True)
+    def fixture_create_access_token(mocker):
+        access_tokens.reset_access_token_cache()
+
+        return mocker.patch(
+            target='src_py.grndwork_api_client.access_tokens.create_access_token',
+            return_value=access_token,
+        )
+
+    @pytest.fixture(name='make_paginated_request', autouse=True)
+    def fixture_make_paginated_request(mocker):
+        def make_paginated_request_mock(*args, **kwargs):
+            query = kwargs.get('query') or {}
+            filename = query.get('filename', '*')
+
+            return [
+                {
+                    **data_file,
+                    'records': [{
+                        'timestamp': '2020-01-01 00:00:00',
+                        'record_num': 1,
+                        'data': {},
+                    }] if 'records_limit' in query else [],
+                } for data_file in data_files
+                if filename.endswith('*') or filename == data_file['filename']
+                if query.get('station', data_file['source'][8:]) == data_file['source'][8:]
+            ]
+
+        return mocker.patch(
+            target='src_py.grndwork_api_client.client.make_paginated_request',
+            spec=_make_paginated_request,
+            side_effect=make_paginated_request_mock,
+        )
+
+    def it_requests_data_per_file_with_shared_access_token(
+        create_access_token,
+        make_paginated_request,
+    ):
+        client = Client(refresh_token=refresh_token, platform='platform')
+
+        batches = list(get_data_in_processes(
+            client,
+            {'filename': 'Test_*', 'limit': 10, 'records_limit': 1},
+            processes=2,
+            include_qc_flags=False,
+            transform=count_records,
+        ))
+
+        assert batches == [
+            [('Test_First_OneMin.dat', 1)],
+            [('Test_First_Hourly.dat', 1)],
+            [('Test_Second_OneMin.dat', 1)],
+        ]
+
+        assert create_access_token.call_count == 1
+        assert access_tokens.access_token_cache == {'platform:read:data': access_token}
+
+        queries = [kwargs['query'] for (_, kwargs) in make_paginated_request.call_args_list]
+
+        assert queries[0] == {'filename': 'Test_*', 'limit': 10}
+        assert sorted(query['filename'] for query in queries[1:]) == [
+            'Test_First_Hourly.dat',
+            'Test_First_OneMin.dat',
+            'Test_Second_OneMin.dat',
+        ]
+
+        for (_, kwargs) in make_paginated_request.call_args_list:
+            assert kwargs.get('url') == DATA_URL
+            assert kwargs.get('token') == access_token
+
+    def it_partitions_by_station():
+        client = Client(refresh_token=refresh_token, platform='platform')
+
+        batches = list(get_data_in_processes(
+            client,
+            {'records_limit': 1},
+            partition='station',
+            include_qc_flags=False,
+            transform=count_records,
+        ))
+
+        assert batches == [
+            [('Test_First_OneMin.dat', 1), ('Test_First_Hourly.dat', 1)],
+            [('Test_Second_OneMin.dat', 1)],
+        ]
+
+    def it_drops_empty_transform_results():
+        client = Client(refresh_token=refresh_token, platform='platform')
+
+        batches = list(get_data_in_processes(
+            client,
+            transform=lambda data_file: None,
+        ))
+
+        assert batches == [[], [], []]
+
+    def it_raises_error_for_unknown_partition():
+        client = Client(refresh_token=refresh_token, platform='platform')
+
+        with pytest.raises(ValueError, match='Partition must be filename or station'):
+            get_data_in_processes(client, partition='site')
+
+
+class _ApiHandler(BaseHTTPRequestHandler):
+    data_files = ['Test_First_OneMin.dat', 'Test_First_Hourly.dat', 'Test_Second_OneMin.dat']
+
+    def do_POST(self):  # noqa: N802
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.server.record(self.path, self.headers)
+        self._send_json({'token': self.server.access_token})
+
+    def do_GET(self):  # noqa: N802
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        filename = query.get('filename', '*')
+
+        self.server.record(url.path, self.headers)
+
+        data_files = [{
+            'source': 'station:uuid',
+            'filename': data_file,
+            'is_stale': False,
+            'headers': {'columns': [], 'units': []},
+            'records': [],
+        } for data_file in self.data_files if filename.endswith('*') or filename == data_file]
+
+        self._send_json(data_files, content_range=f'items 1-{len(data_files)}/{len(data_files)}')
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, payload, *, content_range=None):
+        body = json.dumps(payload).encode()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+
+        if content_range:
+            self.send_header('Content-Range', content_range)
+
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _ApiServer(ThreadingHTTPServer):
+    def __init__(self, access_token):
+        super().__init__(('127.0.0.1', 0), _ApiHandler)
+        self.access_token = access_token
+        self.requests = []
+        self._lock = Lock()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def record(self, path, headers):
+        with self._lock:
+            self.requests.append((path, headers.get('Authorization')))
+
+
+def describe_get_data_in_worker_processes():
+    access_token = jwt.encode({'exp': 4102444800}, 'x' * 32, algorithm='HS256')
+
+    @pytest.fixture(name='server')
+    def fixture_server():
+        access_tokens.reset_access_token_cache()
+
+        server = _ApiServer(access_token)
+        thread = Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        yield server
+
+        server.shutdown()
+        server.server_close()
+        access_tokens.reset_access_token_cache()
+
+    def it_runs_workers_in_processes_with_seeded_access_tokens(server):
+        client = Client(
+            refresh_token={'subject': 'uuid', 'token': 'refresh_token'},
+            platform='platform',
+            api_url=server.url,
+        )
+
+        # Workers are separate processes, so the query, options and transform are pickled
+        # and workers only reach the api through the local server
+        batches = list(get_data_in_processes(
+            client,
+            {'filename': 'Test_*', 'records_limit': 1},
+            processes=2,
+            include_qc_flags=False,
+            transform=itemgetter('filename'),
+        ))
+
+        assert batches == [
+            ['Test_First_OneMin.dat'],
+            ['Test_First_Hourly.dat'],
+            ['Test_Second_OneMin.dat'],
+        ]
+
+        paths = [path for (path, _) in server.requests]
+
+        assert paths.count('/v1/tokens') == 1
+        assert paths.count('/v1/data') == 4
+
+        for (path, authorization) in server.requests:
+            if path == '/v1/data':
+                assert authorization == f'Bearer {access_token}'
@@ -0,0 +1,146 @@
+import os
+import time
+
+import jwt
+import pytest
+from src_py.grndwork_api_client.response_cache import CacheControl, CachedResponse, ResponseCache
+
+
+def create_entry(content=b'[]', headers=None, expires=0):
+    return CachedResponse(
+        url='https://api.grndwork.com/v1/stations',
+        headers=headers or {'ETag': '"etag"'},
+        content=content,
+        payload=[],
+        expires=expires,
+    )
+
+
+def describe_cache_control():
+    @pytest.mark.parametrize('header, expected', [
+        ('', CacheControl()),
+        ('max-age=60', CacheControl(max_age=60)),
+        ('private, max-age=60', CacheControl(max_age=60)),
+        ('no-cache', CacheControl(no_cache=True)),
+        ('No-Store', CacheControl(no_store=True)),
+    ])
+    def it_parses_cache_control(header, expected):
+        assert CacheControl.parse(header) == expected
+
+
+def describe_cached_response():
+    def it_is_fresh_until_expired():
+        assert create_entry(expires=time.time() + 60).is_fresh
+        assert not create_entry(expires=time.time() - 60).is_fresh
+
+    def it_reads_validators_from_headers():
+        entry = create_entry(headers={
+            'etag': '"etag"',
+            'last-modified': 'Wed, 01 Jan 2020 00:00:00 GMT',
+        })
+
+        assert entry.etag == '"etag"'
+        assert entry.last_modified == 'Wed, 01 Jan 2020 00:00:00 GMT'
+
+    def it_updates_headers_when_revalidated():
+        entry = create_entry().revalidated({
+            'ETag': '"new etag"',
+            'Cache-Control': 'max-age=60',
+        })
+
+        assert entry.etag == '"new etag"'
+        assert entry.is_fresh
+
+    def it_creates_response():
+        resp = create_entry(
+            content=b'[{"id": 1}]',
+            headers={'Content-Range': 'items 1-1/1'},
+        ).to_response()
+
+        assert resp.status_code == 200
+        assert resp.headers.get('content-range') == 'items 1-1/1'
+        assert resp.json() == [{'id': 1}]
+
+
+def describe_response_cache():
+    def _make_token(subject, exp):
+        return jwt.encode({'sub': subject, 'scope': 'read:data', 'exp': exp}, 'secret' * 8)
+
+    def it_keys_entries_by_token_identity():
+        url = 'https://api.grndwork.com/v1/stations'
+
+        assert ResponseCache.get_key(url, {}, _make_token('first', 1)) == (
+            ResponseCache.get_key(url, {}, _make_token('first', 2))
+        )
+        assert ResponseCache.get_key(url, {}, _make_token('first', 1)) != (
+            ResponseCache.get_key(url, {}, _make_token('second', 1))
+        )
+        assert ResponseCache.get_key(url, {}, 'token') != ResponseCache.get_key(url, {}, 'other')
+
+    def it_returns_cached_entries():
+        cache = ResponseCache()
+        entry = create_entry()
+
+        cache.set('key', entry)
+
+        assert cache.get('key') is entry
+        assert cache.get('other') is None
+
+    def it_evicts_least_recently_used_entries_by_size():
+        cache = ResponseCache(max_bytes=10)
+
+        cache.set('first', create_entry(content=b'1234'))
+        cache.set('second', create_entry(content=b'1234'))
+        cache.get('first')
+        cache.set('third', create_entry(content=b'1234'))
+
+        assert cache.get('first') is not None
+        assert cache.get('second') is None
+        assert cache.get('third') is not None
+        assert cache.size == 8
+
+    def it_does_not_keep_entries_larger_than_cache():
+        cache = ResponseCache(max_bytes=2)
+
+        cache.set('key', create_entry(content=b'1234'))
+
+        assert cache.get('key') is None
+        assert cache.size == 0
+
+    def it_reads_entries_from_directory(tmp_path):
+        ResponseCache(directory=str(tmp_path)).set('key', create_entry(content=b'[{"id": 1}]'))
+
+        entry = ResponseCache(directory=str(tmp_path)).get('key')
+
+        assert entry is not None
+        assert entry.etag == '"etag"'
+        assert entry.payload == [{'id': 1}]
+
+    def it_clears_entries(tmp_path):
+        cache = ResponseCache(directory=str(tmp_path))
+
+        cache.set('key', create_entry())
+        cache.clear()
+
+        assert cache.get('key') is None
+        assert list(tmp_path.iterdir()) == []
+
+    def it_trims_least_recently_used_entries_from_directory(tmp_path):
+        cache = ResponseCache(directory=str(tmp_path), max_bytes=0)
+
+        for (index, key) in enumerate(['first', 'second', 'third']):
+            cache.set(key, create_entry(content=b'"' + b'0' * 300 + b'"'))
+
+            for extension in ['.json', '.body']:
+                os.utime(cache._get_path(key) + extension, (index, index))
+
+        cache.max_disk_bytes = cache.disk_size
+
+        cache.get('first')
+        cache.set('fourth', create_entry(content=b'"' + b'0' * 300 + b'"'))
+
+        assert cache.disk_size <= cache.max_disk_bytes
+        assert cache.get('first') is not None
+        assert cache.get('second') is None
+        assert cache.get('fourth') is not None
+        assert ResponseCache(directory=str(tmp_path)).disk_size == cache.disk_size
@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+import pytest
+from src_py.grndwork_api_client.single_flight import SingleFlight
+
+
+def describe_single_flight():
+    def it_returns_result_of_call():
+        group = SingleFlight()
+
+        assert group.do('key', lambda: 'result') == 'result'
+        assert group.hits == 0
+        assert group.misses == 1
+
+    def it_shares_result_between_concurrent_callers():
+        group = SingleFlight()
+        started = Event()
+        release = Event()
+        calls = []
+
+        def call():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return object()
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            leader = executor.submit(group.do, 'key', call)
+            started.wait(5)
+
+            followers = [executor.submit(group.do, 'key', call) for _ in range(4)]
+
+            while group.hits < 4:
+                pass
+
+            release.set()
+
+            results = [leader.result(), *(future.result() for future in followers)]
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert group.hits == 4
+        assert group.misses == 1
+
+    def it_shares_copies_of_result_with_waiting_callers():
+        group = SingleFlight()
+        started = Event()
+        release = Event()
+
+        def call():
+            started.set()
+            release.wait(5)
+            return {'records': [1, 2, 3]}
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(group.do, 'key', call, share=lambda result: dict(result))
+            started.wait(5)
+
+            follower = executor.submit(group.do, 'key', call, share=lambda result: dict(result))
+
+            while group.hits < 1:
+                pass
+
+            release.set()
+
+        assert follower.result() == leader.result()
+        assert follower.result() is not leader.result()
+
+    def it_does_not_share_results_between_keys():
+        group = SingleFlight()
+
+        assert group.do('first', lambda: 1) == 1
+        assert group.do('second', lambda: 2) == 2
+        assert group.misses == 2
+
+    def it_does_not_share_completed_calls():
+        group = SingleFlight()
+        calls = []
+
+        group.do('key', lambda: calls.append(1))
+        group.do('key', lambda: calls.append(1))
+
+        assert len(calls) == 2
+        assert group.hits == 0
+
+    def it_raises_error_for_failed_calls():
+        group = SingleFlight()
+
+        def call():
+            raise ValueError('Failed')
+
+        with pytest.raises(ValueError, match='Failed'):
+            group.do('key', call)
+
+        assert group.do('key', lambda: 'result') == 'result'
+
+    def it_resets_stats():
+        group = SingleFlight()
+
+        group.do('key', lambda: None)
+        group.reset_stats()
+
+        assert group.hits == 0
+        assert group.misses == 0
@@ -0,0 +1,162 @@
+import pytest
+from src_py.grndwork_api_client.checkpoints import FileCheckpointStore, MemoryCheckpointStore
+from src_py.grndwork_api_client.client import Client
+from src_py.grndwork_api_client.sync_planner import SyncPlanner, SyncTask
+
+
+def _make_data_file(filename, *, is_stale=False, columns=None):
+    return {
+        'filename': filename,
+        'is_stale': is_stale,
+        'headers': {'columns': columns or ['Ambient_Temp'], 'units': ['Deg_C']},
+    }
+
+
+def describe_sync_planner():
+    @pytest.fixture(name='client')
+    def fixture_client(mocker):
+        client = mocker.MagicMock(spec=Client)
+        client.get_stations.return_value = iter([])
+
+        return client
+
+    def _set_data_files(client, data_files):
+        client.get_stations.return_value = iter([{
+            'station_uuid': 'uuid',
+            'data_files': data_files,
+        }])
+
+    def it_plans_new_files(client):
+        _set_data_files(client, [
+            _make_data_file('Test_OneMin.dat'),
+            _make_data_file('Test_Hourly.dat', is_stale=True),
+        ])
+
+        tasks = SyncPlanner(client, MemoryCheckpointStore()).plan({'site': 'uuid'}, page_size=50)
+
+        assert tasks == [
+            SyncTask(
+                source='station:uuid',
+                filename='Test_OneMin.dat',
+                is_stale=False,
+                headers={'columns': ['Ambient_Temp'], 'units': ['Deg_C']},
+                reason='new',
+            ),
+            SyncTask(
+                source='station:uuid',
+                filename='Test_Hourly.dat',
+                is_stale=True,
+                headers={'columns': ['Ambient_Temp'], 'units': ['Deg_C']},
+                reason='new',
+            ),
+        ]
+
+        (args, kwargs) = client.get_stations.call_args
+
+        assert args[0] == {'site': 'uuid'}
+        assert kwargs == {'page_size': 50}
+
+    def it_skips_unchanged_stale_files(client):
+        planner = SyncPlanner(client, MemoryCheckpointStore())
+
+        _set_data_files(client, [
+            _make_data_file('Test_OneMin.dat'),
+            _make_data_file('Test_Hourly.dat', is_stale=True),
+            _make_data_file('Test_Daily.dat', is_stale=True),
+        ])
+
+        for task in planner.plan():
+            planner.complete(task)
+
+        _set_data_files(client, [
+            _make_data_file('Test_OneMin.dat'),
+            _make_data_file('Test_Hourly.dat', is_stale=True),
+            _make_data_file('Test_Daily.dat', is_stale=True, columns=['Battery_Voltage']),
+            _make_data_file('Test_Status.dat', is_stale=True),
+        ])
+
+        assert [(task.filename, task.reason) for task in planner.plan()] == [
+            ('Test_OneMin.dat', 'active'),
+            ('Test_Daily.dat', 'changed'),
+            ('Test_Status.dat', 'new'),
+        ]
+
+    def it_plans_files_that_became_stale(client):
+        planner = SyncPlanner(client, MemoryCheckpointStore())
+
+        _set_data_files(client, [_make_data_file('Test_OneMin.dat')])
+
+        for task in planner.plan():
+            planner.complete(task)
+
+        _set_data_files(client, [_make_data_file('Test_OneMin.dat', is_stale=True)])
+
+        (task,) = planner.plan()
+
+        assert task.reason == 'changed'
+
+        planner.complete(task)
+
+        _set_data_files(client, [_make_data_file('Test_OneMin.dat', is_stale=True)])
+
+        assert planner.plan() == []
+
+    def it_plans_files_again_until_completed(client):
+        planner = SyncPlanner(client, MemoryCheckpointStore())
+
+        _set_data_files(client, [_make_data_file('Test_OneMin.dat', is_stale=True)])
+        planner.plan()
+
+        _set_data_files(client, [_make_data_file('Test_OneMin.dat', is_stale=True)])
+
+        assert [task.reason for task in planner.plan()] == ['new']
+
+    def it_reads_snapshots_once_per_plan(mocker, client, tmp_path):
+        store = FileCheckpointStore(str(tmp_path / 'snapshots.json'))
+        planner = SyncPlanner(client, store)
+
+        data_files = [_make_data_file(f'Test_{index}.dat', is_stale=True) for index in range(50)]
+
+        _set_data_files(client, data_files)
+
+        for task in planner.plan()[:25]:
+            planner.complete(task)
+
+        read = mocker.spy(store, '_read')
+        _set_data_files(client, data_files)
+
+        assert len(planner.plan()) == 25
+        assert read.call_count == 1
+
+    def it_loads_snapshots_from_stores_without_bulk_reads(client):
+        class _Store():
+            def __init__(self):
+                self.store = MemoryCheckpointStore()
+                self.load = self.store.load
+                self.save = self.store.save
+                self.delete = self.store.delete
+
+        planner = SyncPlanner(client, _Store())
+
+        _set_data_files(client, [_make_data_file('Test_OneMin.dat', is_stale=True)])
+        planner.complete(planner.plan()[0])
+
+        _set_data_files(client, [_make_data_file('Test_OneMin.dat', is_stale=True)])
+
+        assert planner.plan() == []
+
+    def it_converts_task_to_data_file():
+        task = SyncTask(
+            source='station:uuid',
+            filename='Test_OneMin.dat',
+            is_stale=False,
+            headers={'columns': ['Ambient_Temp']},
+            reason='new',
+        )
+
+        assert task.to_data_file() == {
+            'source': 'station:uuid',
+            'filename': 'Test_OneMin.dat',
+            'is_stale': False,
+            'headers': {'columns': ['Ambient_Temp']},
+        }
@@ -0,0 +1,205 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+from threading import Lock
+import time
+
+import jwt
+import pytest
+import requests
+from src_py.grndwork_api_client import make_request as make_request_module
+from src_py.grndwork_api_client.access_tokens import get_access_token, reset_access_token_cache
+from src_py.grndwork_api_client.checkpoints import MemoryCheckpointStore
+from src_py.grndwork_api_client.client import Client
+from src_py.grndwork_api_client.config import DATA_URL
+from src_py.grndwork_api_client.make_request import make_request, mount_adapter
+from src_py.grndwork_api_client.single_flight import SingleFlight
+from src_py.grndwork_api_client.transports import ReplayAdapter
+
+THREADS = 64
+
+
+def _run_concurrently(fn, count=THREADS):
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        return list(executor.map(fn, range(count)))
+
+
+def describe_thread_safety():
+    refresh_token = {'subject': 'uuid', 'token': 'refresh_token'}
+
+    @pytest.fixture(autouse=True)
+    def _reset_access_token_cache():
+        reset_access_token_cache()
+        yield
+        reset_access_token_cache()
+
+    @pytest.fixture(name='decode', autouse=True)
+    def fixture_decode(mocker):
+        return mocker.patch(
+            target='jwt.decode',
+            spec=jwt.decode,
+            return_value={'exp': int(time.time()) + 1000},
+        )
+
+    def describe_access_tokens():
+        def it_creates_each_token_once(mocker):
+            def make_request_mock(*, body, **kwargs):
+                time.sleep(0.01)
+                return {'token': f'token:{body["scope"]}'}, mocker.MagicMock()
+
+            create = mocker.patch(
+                target='src_py.grndwork_api_client.access_tokens.make_request',
+                side_effect=make_request_mock,
+            )
+
+            scopes = ['read:data', 'write:data']
+
+            tokens = _run_concurrently(lambda index: get_access_token(
+                refresh_token,
+                'platform',
+                scopes[index % 2],
+            ), count=THREADS * 4)
+
+            assert create.call_count == 2
+            assert tokens == [f'token:{scopes[index % 2]}' for index in range(THREADS * 4)]
+
+        def it_decodes_each_token_once(mocker, decode):
+            mocker.patch(
+                target='src_py.grndwork_api_client.access_tokens.make_request',
+                return_value=({'token': 'access_token'}, mocker.MagicMock()),
+            )
+
+            _run_concurrently(lambda _: get_access_token(refresh_token, 'platform', 'read:data'))
+
+            assert decode.call_count <= 2
+
+    def describe_make_request():
+        def it_does_not_modify_shared_headers(mocker):
+            sent = []
+
+            def send_request_mock(*, headers, **kwargs):
+                sent.append(dict(headers))
+                return [], mocker.MagicMock()
+
+            mocker.patch.object(make_request_module, '_send_request', side_effect=send_request_mock)
+
+            headers = {'Accept': 'application/json'}
+
+            _run_concurrently(lambda index: make_request(
+                url=DATA_URL,
+                token=f'token{index}',
+                headers=headers,
+                body={'index': index},
+            ))
+
+            assert headers == {'Accept': 'application/json'}
+            assert sorted(headers['Authorization'] for headers in sent) == sorted(
+                f'Bearer token{index}' for index in range(THREADS)
+            )
+
+    def describe_single_flight():
+        def it_counts_every_call():
+            group = SingleFlight()
+
+            _run_concurrently(lambda index: [
+                group.do((index, call), lambda call=call: call) for call in range(100)
+            ])
+
+            assert group.hits + group.misses == THREADS * 100
+
+    def describe_client():
+        @pytest.fixture(name='client')
+        def fixture_client(mocker):
+            mocker.patch(
+                target='src_py.grndwork_api_client.client.get_access_token',
+                return_value='access_token',
+            )
+
+            return Client(refresh_token=refresh_token, platform='platform')
+
+        def it_scales_requests_across_threads(mocker, client, tmp_path):
+            path = tmp_path / 'capture.ndjson'
+
+            path.write_text(''.join(json.dumps({
+                'method': 'GET',
+                'url': f'{DATA_URL}?filename=Test_{index}.dat&limit=1&offset=0',
+                'status': 200,
+                'headers': {'Content-Type': 'application/json', 'Content-Range': 'items 1-1/1'},
+                'body': json.dumps([{'filename': f'Test_{index}.dat'}]),
+                'elapsed': 0.05,
+            }) + '\n' for index in range(THREADS)))
+
+            mocker.patch.object(make_request_module, '_session', requests.Session())
+
+            adapter = ReplayAdapter(str(path))
+            mount_adapter(adapter)
+
+            lock = Lock()
+            active = [0]
+            peak = [0]
+            send = adapter.send
+
+            def send_mock(*args, **kwargs):
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+
+                try:
+                    return send(*args, **kwargs)
+                finally:
+                    with lock:
+                        active[0] -= 1
+
+            mocker.patch.object(adapter, 'send', side_effect=send_mock)
+
+            filenames = _run_concurrently(lambda index: [
+                data_file['filename']
+                for data_file in client.get_data({'filename': f'Test_{index}.dat'}, page_size=1)
+            ])
+
+            assert filenames == [[f'Test_{index}.dat'] for index in range(THREADS)]
+            assert adapter.misses == 0
+
+            # Requests are not serialised by the client, many wait on responses at once
+            assert peak[0] >= 8
+
+        def it_never_posts_records_twice_from_concurrent_delta_posts(mocker, client):
+            posted = []
+
+            def make_request_mock(*, body, **kwargs):
+                # Posts of a file are sent one at a time, a slow response holds back the others
+                time.sleep(0.001)
+                posted.extend(record['record_num'] for record in body['files'][0]['records'])
+
+            mocker.patch(
+                target='src_py.grndwork_api_client.client.make_request',
+                side_effect=make_request_mock,
+            )
+
+            client.watermarks = MemoryCheckpointStore()
+            client.watermarks.save('watermark:Test_OneMin.dat', {
+                'timestamp': '2020-01-01 00:00:00',
+                'record_num': 0,
+            })
+
+            def post_window(index):
+                # Windows overlap the records of the windows before them
+                client.post_data({
+                    'source': 'station:uuid',
+                    'files': [{
+                        'filename': 'Test_OneMin.dat',
+                        'records': [{
+                            'timestamp': f'2020-01-01 00:00:{record_num:02}',
+                            'record_num': record_num,
+                            'data': {'Ambient_Temp': record_num},
+                        } for record_num in range(index + 1, index + 11)],
+                    }],
+                }, delta=True)
+
+            _run_concurrently(post_window, count=40)
+
+            assert posted == sorted(set(posted))
+            assert posted[-1] == 49
+            assert client.watermarks.load('watermark:Test_OneMin.dat') == {
+                'timestamp': '2020-01-01 00:00:49',
+                'record_num': 49,
+            }
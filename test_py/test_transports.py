@@ -0,0 +1,204 @@
+from datetime import timedelta
+import json
+from threading import Lock
+
+import jwt
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from src_py.grndwork_api_client import make_request as make_request_module
+from src_py.grndwork_api_client.access_tokens import has_expired
+from src_py.grndwork_api_client.client import Client
+from src_py.grndwork_api_client.config import DATA_URL, TOKENS_URL
+from src_py.grndwork_api_client.make_request import make_request, mount_adapter
+from src_py.grndwork_api_client.transports import (
+    get_exchange_url,
+    RecordingAdapter,
+    ReplayAdapter,
+)
+
+
+def _make_exchange(url, body, *, elapsed=0.5, headers=None):
+    return {
+        'method': 'GET',
+        'url': url,
+        'status': 200,
+        'headers': {'Content-Type': 'application/json', **(headers or {})},
+        'body': json.dumps(body),
+        'elapsed': elapsed,
+    }
+
+
+@pytest.fixture(name='capture_file')
+def fixture_capture_file(tmp_path):
+    path = tmp_path / 'capture.ndjson'
+
+    path.write_text('\n'.join(json.dumps(exchange) for exchange in [
+        _make_exchange(
+            f'{DATA_URL}?limit=1&offset=0',
+            [{'filename': 'Test_OneMin.dat'}],
+            headers={'Content-Range': 'items 1-1/2'},
+        ),
+        _make_exchange(
+            f'{DATA_URL}?limit=1&offset=1',
+            [{'filename': 'Test_Hourly.dat'}],
+            headers={'Content-Range': 'items 2-2/2'},
+        ),
+    ]) + '\n')
+
+    return str(path)
+
+
+@pytest.fixture(name='sleep', autouse=True)
+def fixture_sleep(mocker):
+    return mocker.patch('src_py.grndwork_api_client.transports.time.sleep')
+
+
+def _make_session(adapter):
+    session = requests.Session()
+    session.mount('https://', adapter)
+
+    return session
+
+
+def describe_get_exchange_url():
+    def it_sorts_query_params():
+        assert get_exchange_url(
+            'https://api.grndwork.com/v1/data?offset=0&limit=1',
+        ) == 'https://api.grndwork.com/v1/data?limit=1&offset=0'
+
+
+def describe_recording_adapter():
+    def it_records_exchanges(mocker, tmp_path):
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.headers = requests.structures.CaseInsensitiveDict({
+            'Content-Type': 'application/json',
+            'Content-Range': 'items 1-1/2',
+            'Content-Encoding': 'gzip',
+        })
+        resp._content = b'[]'
+        resp.elapsed = timedelta(seconds=0.25)
+
+        mocker.patch.object(HTTPAdapter, 'send', return_value=resp)
+
+        path = tmp_path / 'capture.ndjson'
+        session = _make_session(RecordingAdapter(str(path)))
+
+        session.get(DATA_URL, params={'offset': 0, 'limit': 1}, headers={'Authorization': 'x'})
+
+        assert [json.loads(line) for line in path.read_text().splitlines()] == [{
+            'method': 'GET',
+            'url': f'{DATA_URL}?limit=1&offset=0',
+            'status': 200,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Content-Range': 'items 1-1/2',
+            },
+            'body': '[]',
+            'elapsed': 0.25,
+        }]
+
+    def it_removes_signature_of_access_tokens(mocker, tmp_path):
+        access_token = jwt.encode({'exp': 4102444800}, 'x' * 32, algorithm='HS256')
+
+        resp = requests.Response()
+        resp.status_code = 201
+        resp.headers = requests.structures.CaseInsensitiveDict({'Content-Type': 'application/json'})
+        resp._content = json.dumps({'token': access_token}).encode('utf-8')
+        resp.elapsed = timedelta(seconds=0.25)
+
+        mocker.patch.object(HTTPAdapter, 'send', return_value=resp)
+
+        path = tmp_path / 'capture.ndjson'
+        session = _make_session(RecordingAdapter(str(path)))
+
+        session.post(TOKENS_URL, json={'subject': 'uuid', 'token': 'refresh_token'})
+
+        [exchange] = [json.loads(line) for line in path.read_text().splitlines()]
+        token = json.loads(exchange['body'])['token']
+
+        assert access_token not in exchange['body']
+        assert token == access_token.rsplit('.', 1)[0] + '.'
+        assert not has_expired(token)
+
+
+def describe_replay_adapter():
+    def it_replays_recorded_responses(capture_file, sleep):
+        session = _make_session(ReplayAdapter(capture_file))
+
+        resp = session.get(DATA_URL, params={'offset': 1, 'limit': 1})
+
+        assert resp.status_code == 200
+        assert resp.json() == [{'filename': 'Test_Hourly.dat'}]
+        assert resp.headers['Content-Range'] == 'items 2-2/2'
+        sleep.assert_called_once_with(0.5)
+
+    def it_returns_not_found_for_unknown_requests(capture_file):
+        adapter = ReplayAdapter(capture_file)
+        session = _make_session(adapter)
+
+        resp = session.get(DATA_URL, params={'offset': 2, 'limit': 1})
+
+        assert resp.status_code == 404
+        assert resp.json() == {'message': 'No recorded response'}
+        assert adapter.misses == 1
+
+    def it_replays_at_speed_with_latency(capture_file, sleep):
+        session = _make_session(ReplayAdapter(capture_file, speed=10, latency=lambda: 0.1))
+
+        session.get(DATA_URL, params={'offset': 0, 'limit': 1})
+
+        (delay,), _ = sleep.call_args
+
+        assert delay == pytest.approx(0.15)
+
+    def it_limits_concurrent_responses(capture_file, sleep):
+        adapter = ReplayAdapter(capture_file, concurrency=1)
+        lock = Lock()
+        active = []
+
+        def sleep_mock(delay):
+            assert lock.acquire(blocking=False)
+            active.append(delay)
+            lock.release()
+
+        sleep.side_effect = sleep_mock
+
+        session = _make_session(adapter)
+
+        for offset in range(2):
+            session.get(DATA_URL, params={'offset': offset, 'limit': 1})
+
+        assert adapter.requests == 2
+        assert active == [0.5, 0.5]
+
+    def it_raises_error_for_invalid_speed(capture_file):
+        with pytest.raises(ValueError, match='Speed must be greater than 0'):
+            ReplayAdapter(capture_file, speed=0)
+
+    def it_replays_client_requests(mocker, capture_file):
+        session = requests.Session()
+
+        mocker.patch.object(make_request_module, '_session', session)
+        mocker.patch(
+            target='src_py.grndwork_api_client.client.get_access_token',
+            return_value='access_token',
+        )
+
+        mount_adapter(ReplayAdapter(capture_file))
+
+        client = Client(refresh_token={'subject': 'uuid', 'token': 'token'}, platform='platform')
+
+        data_files = client.get_data({'limit': 2}, page_size=1)
+
+        assert [data_file['filename'] for data_file in data_files] == [
+            'Test_OneMin.dat',
+            'Test_Hourly.dat',
+        ]
+
+        assert data_files.count == 2
+
+        payload, _ = make_request(url=DATA_URL, token='', query={'limit': 1, 'offset': 0})
+
+        assert payload == [{'filename': 'Test_OneMin.dat'}]
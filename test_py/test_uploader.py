@@ -0,0 +1,227 @@
+from threading import Event
+
+import pytest
+from src_py.grndwork_api_client.client import Client
+from src_py.grndwork_api_client.make_request import RequestError
+from src_py.grndwork_api_client.uploader import DataUploader
+
+
+def describe_data_uploader():
+    def _make_record(record_num):
+        return {
+            'timestamp': f'2020-01-01 00:{record_num // 60:02d}:{record_num % 60:02d}',
+            'record_num': record_num,
+            'data': {'SOME_KEY': record_num},
+        }
+
+    @pytest.fixture(name='client')
+    def fixture_client(mocker):
+        client = mocker.MagicMock(spec=Client)
+        client.post_data.side_effect = lambda payload, **kwargs: sum(
+            len(data_file['records']) for data_file in payload['files']
+        )
+
+        return client
+
+    def it_batches_records_by_count(client):
+        with DataUploader(client, source='station:uuid', max_records=10, linger=60) as uploader:
+            for record_num in range(25):
+                uploader.add('Test_OneMin.dat', _make_record(record_num))
+
+        assert client.post_data.call_count == 3
+
+        sizes = sorted(
+            len(args[0]['files'][0]['records'])
+            for (args, _) in client.post_data.call_args_list
+        )
+
+        assert sizes == [5, 10, 10]
+        assert uploader.records_sent == 25
+        assert uploader.batches_sent == 3
+
+    def it_batches_records_by_bytes(client):
+        with DataUploader(client, source='station:uuid', max_bytes=200, linger=60) as uploader:
+            for record_num in range(10):
+                uploader.add('Test_OneMin.dat', _make_record(record_num))
+
+        assert client.post_data.call_count > 1
+        assert uploader.records_sent == 10
+
+    def it_groups_records_by_file(client):
+        with DataUploader(client, source='station:uuid', overwrite=True, linger=60) as uploader:
+            uploader.add('Test_OneMin.dat', _make_record(1), headers={'columns': ['SOME_KEY']})
+            uploader.add('Test_Hourly.dat', _make_record(2))
+            uploader.add('Test_OneMin.dat', _make_record(3))
+
+        (args, kwargs) = client.post_data.call_args
+
+        assert args[0] == {
+            'source': 'station:uuid',
+            'files': [{
+                'filename': 'Test_OneMin.dat',
+                'records': [_make_record(1), _make_record(3)],
+                'headers': {'columns': ['SOME_KEY']},
+            }, {
+                'filename': 'Test_Hourly.dat',
+                'records': [_make_record(2)],
+            }],
+            'overwrite': True,
+        }
+
+        assert kwargs.get('delta') is None
+
+    def it_limits_files_per_batch(client):
+        with DataUploader(client, source='station:uuid', linger=60) as uploader:
+            for index in range(25):
+                uploader.add(f'Test_{index}.dat', _make_record(index))
+
+        assert client.post_data.call_count == 2
+        assert len(client.post_data.call_args_list[0][0][0]['files']) == 20
+
+    def it_sends_batches_after_linger(client):
+        delivered = Event()
+
+        uploader = DataUploader(
+            client,
+            source='station:uuid',
+            linger=0.01,
+            on_delivery=lambda payload, error: delivered.set(),
+        )
+
+        uploader.add('Test_OneMin.dat', _make_record(1))
+
+        assert delivered.wait(5)
+        assert client.post_data.call_count == 1
+
+        uploader.close()
+
+    def it_waits_for_delivery_on_flush(client):
+        uploader = DataUploader(client, source='station:uuid', linger=60)
+
+        uploader.add('Test_OneMin.dat', _make_record(1))
+        uploader.flush()
+
+        assert client.post_data.call_count == 1
+
+        uploader.close()
+
+    def it_reports_failed_deliveries(mocker, client):
+        error = RequestError('Bad request')
+        client.post_data.side_effect = error
+        on_delivery = mocker.MagicMock()
+
+        with DataUploader(
+            client,
+            source='station:uuid',
+            linger=60,
+            on_delivery=on_delivery,
+        ) as uploader:
+            uploader.add('Test_OneMin.dat', _make_record(1))
+
+        assert uploader.records_failed == 1
+        assert uploader.batches_failed == 1
+        assert uploader.records_sent == 0
+
+        (args, _) = on_delivery.call_args
+
+        assert args[1] is error
+
+    def it_retries_failed_deliveries(mocker, client):
+        sleep = mocker.patch('src_py.grndwork_api_client.uploader.time.sleep')
+        error = RequestError('Bad gateway')
+        client.post_data.side_effect = [error, error, 1]
+
+        with DataUploader(
+            client,
+            source='station:uuid',
+            linger=60,
+            retries=2,
+            retry_delay=0.5,
+        ) as uploader:
+            uploader.add('Test_OneMin.dat', _make_record(1))
+
+        assert client.post_data.call_count == 3
+        assert [args[0] for (args, _) in sleep.call_args_list] == [0.5, 1.0]
+        assert uploader.records_sent == 1
+        assert uploader.records_failed == 0
+
+    def it_reports_failed_delivery_callbacks(client):
+        error = ValueError('Callback failed')
+
+        def on_delivery(payload, err):
+            raise error
+
+        with DataUploader(
+            client,
+            source='station:uuid',
+            linger=60,
+            on_delivery=on_delivery,
+        ) as uploader:
+            uploader.add('Test_OneMin.dat', _make_record(1))
+            uploader.flush()
+            uploader.add('Test_OneMin.dat', _make_record(2))
+
+        assert uploader.records_sent == 2
+        assert uploader.callbacks_failed == 2
+        assert uploader.last_callback_error is error
+
+    def it_posts_delta_batches_of_a_file_in_order(mocker):
+        mocker.patch(
+            target='src_py.grndwork_api_client.client.get_access_token',
+            return_value='access_token',
+        )
+
+        mocker.patch(
+            target='src_py.grndwork_api_client.client.make_paginated_request',
+            return_value=[],
+        )
+
+        first_batch = Event()
+        posted = []
+
+        def make_request_mock(*, body, **kwargs):
+            records = body['files'][0]['records']
+
+            # The first batch is slow, later batches would otherwise finish first
+            if records[0]['record_num'] == 0:
+                first_batch.wait(0.2)
+
+            posted.extend(record['record_num'] for record in records)
+
+        mocker.patch(
+            target='src_py.grndwork_api_client.client.make_request',
+            side_effect=make_request_mock,
+        )
+
+        client = Client(refresh_token={'subject': 'uuid', 'token': 'token'}, platform='platform')
+
+        with DataUploader(
+            client,
+            source='station:uuid',
+            linger=60,
+            max_workers=4,
+            delta=True,
+        ) as uploader:
+            for record_num in range(200):
+                uploader.add('Test_OneMin.dat', _make_record(record_num))
+
+        assert posted == list(range(200))
+        assert uploader.records_sent == 200
+        assert uploader.records_skipped == 0
+
+    def it_counts_records_skipped_by_delta_uploads(client):
+        client.post_data.side_effect = lambda payload, **kwargs: 3
+
+        with DataUploader(client, source='station:uuid', linger=60, delta=True) as uploader:
+            for record_num in range(5):
+                uploader.add('Test_OneMin.dat', _make_record(record_num))
+
+        assert uploader.records_sent == 3
+        assert uploader.records_skipped == 2
+
+    def it_raises_error_when_closed(client):
+        uploader = DataUploader(client, source='station:uuid')
+        uploader.close()
+
+        with pytest.raises(ValueError, match='Uploader is closed'):
+            uploader.add('Test_OneMin.dat', _make_record(1))
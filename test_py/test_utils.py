@@ -1,4 +1,29 @@
-from src_py.grndwork_api_client.utils import combine_data_and_qc_records
+from datetime import datetime
+
+import pytest
+from src_py.grndwork_api_client.utils import (
+    combine_data_and_qc_records,
+    map_concurrently,
+    parse_timestamp,
+    select_columns,
+    timestamp_to_epoch,
+)
+
+
+def describe_parse_timestamp():
+    def it_parses_api_timestamps():
+        assert parse_timestamp('2020-01-02 03:04:05') == datetime(2020, 1, 2, 3, 4, 5)
+        assert timestamp_to_epoch('2020-01-02 03:04:05') == 1577934245
+
+    def it_falls_back_to_strptime():
+        assert parse_timestamp('2020-1-2 3:04:05') == datetime(2020, 1, 2, 3, 4, 5)
+
+    def it_raises_error_for_invalid_timestamps():
+        with pytest.raises(ValueError, match='month must be in 1..12'):
+            parse_timestamp('2020-13-02 03:04:05')
+
+        with pytest.raises(ValueError, match='does not match format'):
+            timestamp_to_epoch('not a timestamp')
 
 
 def describe_make_paginated_request():
@@ -59,3 +84,98 @@ def describe_make_paginated_request():
                 'qc_flags': {},
             },
         ]
+
+    def it_selects_qc_flag_columns():
+        assert combine_data_and_qc_records([
+            {
+                'timestamp': '2020-01-01 00:00:00',
+                'record_num': 1,
+                'data': {'SOME_KEY': 'VALUE'},
+            },
+        ], [
+            {
+                'timestamp': '2020-01-01 00:00:00',
+                'qc_flags': {'SOME_KEY': 'FLAG', 'OTHER_KEY': 'FLAG'},
+            },
+        ], ['SOME_KEY']) == [
+            {
+                'timestamp': '2020-01-01 00:00:00',
+                'record_num': 1,
+                'data': {'SOME_KEY': 'VALUE'},
+                'qc_flags': {'SOME_KEY': 'FLAG'},
+            },
+        ]
+
+
+def describe_select_columns():
+    def it_selects_headers_and_data_columns():
+        assert select_columns({
+            'source': 'station:uuid',
+            'filename': 'Test_OneMin.dat',
+            'is_stale': False,
+            'headers': {
+                'meta': {'KEY': 'VALUE'},
+                'columns': ['FIRST', 'SECOND'],
+                'units': ['m', 's'],
+            },
+            'records': [{
+                'timestamp': '2020-01-01 00:00:00',
+                'record_num': 1,
+                'data': {'FIRST': 1, 'SECOND': 2},
+            }],
+        }, ['SECOND', 'MISSING']) == {
+            'source': 'station:uuid',
+            'filename': 'Test_OneMin.dat',
+            'is_stale': False,
+            'headers': {
+                'meta': {'KEY': 'VALUE'},
+                'columns': ['SECOND'],
+                'units': ['s'],
+            },
+            'records': [{
+                'timestamp': '2020-01-01 00:00:00',
+                'record_num': 1,
+                'data': {'SECOND': 2},
+            }],
+        }
+
+    def it_selects_columns_without_records():
+        assert select_columns({
+            'source': 'station:uuid',
+            'filename': 'Test_OneMin.dat',
+            'is_stale': False,
+            'headers': {
+                'columns': ['FIRST', 'SECOND'],
+                'units': ['m', 's'],
+            },
+        }, ['FIRST']) == {
+            'source': 'station:uuid',
+            'filename': 'Test_OneMin.dat',
+            'is_stale': False,
+            'headers': {
+                'columns': ['FIRST'],
+                'units': ['m'],
+            },
+        }
+
+
+def describe_map_concurrently():
+    def it_returns_results_in_order():
+        assert list(map_concurrently(lambda item: item * 2, range(20), max_workers=3)) == [
+            item * 2 for item in range(20)
+        ]
+
+    def it_consumes_items_lazily():
+        consumed = []
+
+        def items():
+            for item in range(100):
+                consumed.append(item)
+                yield item
+
+        results = map_concurrently(lambda item: item, items(), max_workers=2)
+
+        assert next(results) == 0
+        assert len(consumed) <= 5
+
+        results.close()
@@ -0,0 +1,109 @@
+import pytest
+from src_py.grndwork_api_client.validation import validate_payload, ValidationError
+
+
+def _make_records(count, *, start=0):
+    return [{
+        'timestamp': f'2020-01-01 {index // 3600:02}:{index // 60 % 60:02}:{index % 60:02}',
+        'record_num': index + 1,
+        'data': {'Ambient_Temp': index / 2},
+    } for index in range(start, start + count)]
+
+
+def _make_payload(records, *, headers=None):
+    data_file = {'filename': 'Test_OneMin.dat', 'records': records}
+
+    if headers is not None:
+        data_file['headers'] = headers
+
+    return {'source': 'station:uuid', 'files': [data_file]}
+
+
+def _get_errors(payload, **kwargs):
+    with pytest.raises(ValidationError) as exc_info:
+        validate_payload(payload, **kwargs)
+
+    return exc_info.value.errors
+
+
+def describe_validate_payload():
+    headers = {'columns': ['Ambient_Temp'], 'units': ['Deg_C'], 'processing': ['Avg']}
+
+    def it_accepts_valid_payload():
+        validate_payload(_make_payload(_make_records(100), headers=headers))
+
+    def it_accepts_records_in_reverse_order():
+        validate_payload(_make_payload(list(reversed(_make_records(100))), headers=headers))
+
+    def it_rejects_payload_without_files():
+        assert _get_errors({'source': '', 'files': []}) == [
+            'source is required',
+            'files must not be empty',
+        ]
+
+    def it_rejects_too_many_records():
+        assert _get_errors(_make_payload(_make_records(101))) == [
+            'files must not have more than 100 records combined',
+        ]
+
+    def it_rejects_mismatched_headers():
+        assert _get_errors(_make_payload([], headers={
+            'columns': ['Ambient_Temp', 'Ambient_Temp'],
+            'units': ['Deg_C'],
+        })) == [
+            'files[0].headers.columns must not have duplicate columns',
+            'files[0].headers.units must have one item for each column',
+        ]
+
+    def it_rejects_records_not_matching_columns():
+        records = _make_records(3)
+        records[1]['data'] = {}
+        records[2]['data'] = {'Ambient_Temp': 1, 'Battery_Voltage': 12}
+
+        assert _get_errors(_make_payload(records, headers=headers)) == [
+            'files[0].records[1].data has 0 values for 1 columns',
+            'files[0].records[2].data has unknown columns Battery_Voltage',
+        ]
+
+    def it_rejects_invalid_records():
+        records = _make_records(3)
+        records[0]['timestamp'] = '2020-01-01T00:00:00Z'
+        records[1]['record_num'] = 0
+        records[2]['record_num'] = 'two'
+
+        assert _get_errors(_make_payload(records)) == [
+            'files[0].records[0].timestamp must use the format yyyy-mm-dd hh:mm:ss',
+            'files[0].records[1].record_num must be a positive integer',
+            'files[0].records[2].record_num must be a positive integer',
+        ]
+
+    def it_rejects_unordered_and_duplicate_records():
+        records = _make_records(4)
+        records[2]['timestamp'] = records[1]['timestamp']
+        records[3]['timestamp'] = records[0]['timestamp']
+        records[3]['record_num'] = 1
+
+        assert _get_errors(_make_payload(records)) == [
+            'files[0].records[2].timestamp 2020-01-01 00:00:01 is duplicated',
+            'files[0].records[3].record_num 1 is duplicated',
+            'files[0].records[3].timestamp 2020-01-01 00:00:00 is out of order',
+        ]
+
+    def it_uses_headers_of_station_data_files():
+        records = _make_records(1)
+        records[0]['data'] = {'Battery_Voltage': 12}
+
+        assert _get_errors(_make_payload(records), data_files=[{
+            'filename': 'Test_OneMin.dat',
+            'is_stale': False,
+            'headers': headers,
+        }]) == [
+            'files[0].records[0].data has unknown columns Battery_Voltage',
+        ]
+
+    def it_stops_after_max_errors():
+        records = [{**record, 'record_num': 1} for record in _make_records(100)]
+
+        errors = _get_errors(_make_payload(records), max_errors=10)
+
+        assert len(errors) == 10